@@ -0,0 +1 @@
+"""Performance benchmarks for the Strange Loop Cognitive Architecture."""
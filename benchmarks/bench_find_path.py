@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+bench_find_path.py — WorldModel.find_path on large synthetic graphs
+
+Compares the original queue.pop(0) / path-copying BFS with the
+bidirectional parent-pointer search, and times the weighted and
+k-shortest variants on the same graph.
+
+    python -m benchmarks.bench_find_path --edges 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.world_model import WorldModel
+from core.structures import Relation
+
+
+def legacy_find_path(world_model, source_id, target_id, max_depth=5):
+    """The pre-rewrite BFS, kept here as the comparison baseline."""
+    visited = set()
+    queue = [(source_id, [source_id])]
+    while queue:
+        current, path = queue.pop(0)
+        if current == target_id:
+            return path
+        if current in visited or len(path) > max_depth:
+            continue
+        visited.add(current)
+        for next_id, _ in world_model.relations.neighbors(current):
+            if next_id not in visited:
+                queue.append((next_id, path + [next_id]))
+    return []
+
+
+def build_graph(edges: int, nodes: int, seed: int = 0) -> WorldModel:
+    rng = random.Random(seed)
+    world_model = WorldModel()
+    for i in range(edges):
+        world_model.add_relation(Relation(
+            id=f"r{i}",
+            source_id=f"n{rng.randrange(nodes)}",
+            target_id=f"n{rng.randrange(nodes)}",
+            relation_type="causes",
+            strength=rng.uniform(0.5, 1.0),
+            confidence=rng.uniform(0.5, 1.0)
+        ))
+    return world_model
+
+
+def time_queries(fn, pairs):
+    start = time.perf_counter()
+    results = [fn(a, b) for a, b in pairs]
+    return time.perf_counter() - start, results
+
+
+def run(edges: int, nodes: int, queries: int, max_depth: int, seed: int = 0):
+    t0 = time.perf_counter()
+    world_model = build_graph(edges, nodes, seed)
+    print(f"Graph: {edges:,} edges, {nodes:,} nodes (built in {time.perf_counter() - t0:.1f}s)")
+
+    rng = random.Random(seed + 1)
+    pairs = [(f"n{rng.randrange(nodes)}", f"n{rng.randrange(nodes)}") for _ in range(queries)]
+
+    legacy_time, legacy_paths = time_queries(
+        lambda a, b: legacy_find_path(world_model, a, b, max_depth), pairs)
+    new_time, new_paths = time_queries(
+        lambda a, b: world_model.find_path(a, b, max_depth), pairs)
+    weighted_time, _ = time_queries(world_model.find_weighted_path, pairs[:max(1, queries // 10)])
+    k_time, _ = time_queries(
+        lambda a, b: world_model.find_k_paths(a, b, k=3, weighted=False, max_depth=max_depth),
+        pairs[:max(1, queries // 10)])
+
+    mismatches = sum(1 for a, b in zip(legacy_paths, new_paths) if len(a) != len(b))
+    results = {
+        "edges": edges,
+        "queries": queries,
+        "legacy_ms_per_query": legacy_time / queries * 1000,
+        "bidirectional_ms_per_query": new_time / queries * 1000,
+        "speedup": legacy_time / max(new_time, 1e-9),
+        "weighted_ms_per_query": weighted_time / max(1, queries // 10) * 1000,
+        "k3_ms_per_query": k_time / max(1, queries // 10) * 1000,
+        "length_mismatches": mismatches,
+    }
+    for key, value in results.items():
+        print(f"  {key}: {value:.3f}" if isinstance(value, float) else f"  {key}: {value}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--nodes", type=int, default=None,
+                        help="default: edges / 5 (average degree 10)")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--max-depth", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.edges, args.nodes or max(2, args.edges // 5), args.queries, args.max_depth, args.seed)
+
+
+if __name__ == "__main__":
+    main()
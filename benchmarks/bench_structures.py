@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+bench_structures.py — Memory and allocation cost of the core structures
+
+Compares each slotted dataclass in core.structures with a dict-backed
+clone of the same fields, times id allocation against truncated uuid4,
+and measures what StrangeLoopEngine.step() allocates and retains per
+cycle.
+
+    python -m benchmarks.bench_structures --cycles 5000
+"""
+
+import argparse
+import dataclasses
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core import structures
+from core.engine import StrangeLoopEngine
+
+STRUCTURES = [
+    structures.Entity, structures.Relation, structures.Belief, structures.Goal,
+    structures.FailureRecord, structures.CognitiveEvent, structures.BlindSpot,
+    structures.LevelCrossing,
+]
+
+
+def dict_backed_clone(cls):
+    """The same dataclass without __slots__, as the structures used to be."""
+    specs = []
+    for f in dataclasses.fields(cls):
+        if f.default_factory is not dataclasses.MISSING:
+            specs.append((f.name, f.type, dataclasses.field(default_factory=f.default_factory)))
+        else:
+            specs.append((f.name, f.type, dataclasses.field(default=f.default)))
+    return dataclasses.make_dataclass(cls.__name__ + "Dict", specs)
+
+
+def bytes_per_instance(factory, count: int = 20000) -> float:
+    gc.collect()
+    tracemalloc.start()
+    keep = [factory() for _ in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return current / count
+
+
+def bench_instances():
+    print("Per-instance memory (bytes, defaults only)")
+    rows = {}
+    for cls in STRUCTURES:
+        slotted = bytes_per_instance(cls)
+        legacy = bytes_per_instance(dict_backed_clone(cls))
+        rows[cls.__name__] = {"slotted": slotted, "dict": legacy}
+        print(f"  {cls.__name__:<15} slotted {slotted:7.1f}   dict {legacy:7.1f}   "
+              f"saved {legacy - slotted:6.1f}")
+    return rows
+
+
+def bench_ids(count: int = 200000):
+    start = time.perf_counter()
+    for _ in range(count):
+        str(uuid.uuid4())[:8]
+    legacy = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(count):
+        structures.new_id()
+    current = time.perf_counter() - start
+    print(f"Id allocation: uuid4[:8] {legacy / count * 1e9:.0f} ns, "
+          f"new_id {current / count * 1e9:.0f} ns")
+    return {"uuid4_ns": legacy / count * 1e9, "new_id_ns": current / count * 1e9}
+
+
+def bench_cycles(cycles: int):
+    engine = StrangeLoopEngine()
+    perceptions = [{"description": f"thought {i}", "about_self": i % 2 == 0,
+                    "complexity": 0.8 if i % 3 == 0 else 0.3, "salience": 0.6}
+                   for i in range(cycles)]
+    for p in perceptions[:100]:
+        engine.step(p)  # warm up
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    for p in perceptions:
+        engine.step(p)
+    elapsed = time.perf_counter() - start
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    retained = (after - before) / cycles
+    print(f"step(): {cycles / elapsed:,.0f} cycles/s under tracemalloc, "
+          f"{retained:,.0f} bytes retained per cycle")
+    return {"cycles_per_second": cycles / elapsed, "retained_bytes_per_cycle": retained}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cycles", type=int, default=5000)
+    args = parser.parse_args()
+    bench_instances()
+    bench_ids()
+    bench_cycles(args.cycles)
+
+
+if __name__ == "__main__":
+    main()
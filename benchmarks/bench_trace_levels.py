@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+bench_trace_levels.py — StrangeLoopEngine.step() throughput per trace level
+
+    python -m benchmarks.bench_trace_levels --cycles 20000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.engine import StrangeLoopEngine
+
+LEVELS = [
+    ("full", {"trace_level": "full"}),
+    ("summary", {"trace_level": "summary"}),
+    ("sampled/100", {"trace_level": "sampled", "trace_sample_every": 100}),
+    ("off", {"trace_level": "off"}),
+]
+
+
+def perceptions(cycles: int):
+    return [{"description": f"thought {i}", "about_self": i % 2 == 0,
+             "complexity": 0.8 if i % 3 == 0 else 0.3, "salience": 0.6}
+            for i in range(cycles)]
+
+
+def bench_level(config, inputs, measure_memory: bool):
+    engine = StrangeLoopEngine(dict(config))
+    gc.collect()
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    for perception in inputs:
+        engine.step(perception)
+    elapsed = time.perf_counter() - start
+    retained = None
+    if measure_memory:
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return len(inputs) / elapsed, retained
+
+
+def run(cycles: int):
+    inputs = perceptions(cycles)
+    results = {}
+    for name, config in LEVELS:
+        rate, _ = bench_level(config, inputs, measure_memory=False)
+        _, retained = bench_level(config, inputs, measure_memory=True)
+        results[name] = {"cycles_per_second": rate, "bytes_per_cycle": retained / cycles}
+        print(f"  {name:<12} {rate:>10,.0f} cycles/s   {retained / cycles:>8,.0f} bytes/cycle retained")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cycles", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.cycles)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+bench_workspace_overflow.py — GlobalWorkspace submit/compete under sustained overflow
+
+    python -m benchmarks.bench_workspace_overflow --submits 500000 --capacity 100
+
+The queue is kept full, so every submit evicts. Reports submits/s against
+the 100k/s target, and checks that eviction keeps the most salient events
+(the old heapq queue evicted the most salient one instead).
+"""
+
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.global_workspace import GlobalWorkspace
+from core.structures import CognitiveEvent, CognitiveEventType
+
+TARGET_RATE = 100_000
+
+
+class LegacyQueue:
+    """The pre-min-max-heap submit/compete: evicts with heappop on negated salience."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._queue = []
+
+    def submit(self, event: CognitiveEvent):
+        adjusted = event.salience + 0.05 + (0.15 if event.is_self_referential else 0.0)
+        heapq.heappush(self._queue, (-adjusted, event.timestamp, event))
+        while len(self._queue) > self.capacity:
+            heapq.heappop(self._queue)
+
+    def compete(self):
+        return heapq.heappop(self._queue)[2] if self._queue else None
+
+
+def make_events(count: int, seed: int):
+    rng = random.Random(seed)
+    return [CognitiveEvent(event_type=CognitiveEventType.PERCEPTION, content=i,
+                           source_level=0, salience=rng.random())
+            for i in range(count)]
+
+
+def bench(queue, events, compete_every: int):
+    start = time.perf_counter()
+    submit, compete = queue.submit, queue.compete
+    for i, event in enumerate(events, 1):
+        submit(event)
+        if i % compete_every == 0:
+            compete()
+    return len(events) / (time.perf_counter() - start)
+
+
+def best_retained(queue, events, capacity: int) -> float:
+    """Fraction of the final window's top-capacity events still queued after filling."""
+    window = events[-capacity * 10:]
+    for event in window:
+        queue.submit(event)
+    expected = {id(e) for e in sorted(window, key=lambda e: -e.salience)[:capacity]}
+    kept = set()
+    while True:
+        event = queue.compete()
+        if event is None:
+            break
+        kept.add(id(event))
+    return len(expected & kept) / capacity
+
+
+def run(submits: int, capacity: int, compete_every: int, seed: int = 0):
+    events = make_events(submits, seed)
+    results = {}
+    for name, factory in [("minmax", lambda: GlobalWorkspace(capacity=capacity)),
+                          ("legacy heapq", lambda: LegacyQueue(capacity))]:
+        rate = bench(factory(), events, compete_every)
+        kept = best_retained(factory(), events, capacity)
+        results[name] = {"submits_per_second": rate, "top_events_retained": kept}
+        verdict = "meets" if rate >= TARGET_RATE else "below"
+        print(f"  {name:<14} {rate:>10,.0f} submits/s ({verdict} {TARGET_RATE:,}/s)   "
+              f"top-{capacity} retained: {kept:.0%}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--submits", type=int, default=500_000)
+    parser.add_argument("--capacity", type=int, default=100)
+    parser.add_argument("--compete-every", type=int, default=10,
+                        help="submits per compete() call")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.submits, args.capacity, args.compete_every, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+loadgen.py — End-to-end load scenarios with step latency percentiles
+
+Drives StrangeLoopEngine through realistic workloads for millions of
+cycles and reports, per window of cycles and overall: p50/p99/p999
+step() latency, throughput, and resident memory growth per 100k cycles.
+A per-window view is what exposes slowdowns that grow with uptime,
+which micro-benchmarks at a fixed size never see.
+
+    python -m benchmarks.loadgen --scenario bot_mix --cycles 1000000
+    python -m benchmarks.loadgen --scenario all --cycles 2000000 --window 100000 --output load.jsonl
+
+Scenarios:
+    bot_mix      the bot's self-referential / plain thought mix, with a
+                 metrics read per simulated tweet, on the bot's retention
+    bulk_seed    knowledge seeded in bulk (entities, relations, beliefs)
+                 between bursts of perception that update seeded entities
+    long_uptime  a world that keeps growing and fading: new entities, and
+                 perceptions revisiting earlier ones, predictions made and
+                 resolved, periodic decay that prunes faded entities
+
+Perceptions revisit an entity by its id; process_perception matches
+existing entities by id only, a name alone would create a new one.
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import random
+import sys
+import time
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bot.brad_bot import THOUGHTS
+from core.engine import StrangeLoopEngine
+from core.structures import Belief, Relation
+
+# Long-running config: bounded histories, summary traces, as the bot runs
+BASE_CONFIG = {"trace_level": "summary", "retention": {"max_in_memory": 5000}}
+
+# name -> (description, scenario(engine, rng, cycles) yielding perceptions)
+SCENARIOS: Dict[str, tuple] = {}
+
+
+def scenario(name: str, description: str):
+    def register(fn: Callable) -> Callable:
+        SCENARIOS[name] = (description, fn)
+        return fn
+    return register
+
+
+# ================================================================
+# SCENARIOS
+# ================================================================
+
+@scenario("bot_mix", "the bot's thought mix with a metrics read per tweet")
+def bot_mix(engine: StrangeLoopEngine, rng: random.Random, cycles: int) -> Iterator[Dict]:
+    for i in range(cycles):
+        if i % 5 == 0 and rng.random() < 0.3:  # Tweet check every ~5 cycles, 30% fire
+            engine.get_consciousness_metrics()
+        yield rng.choice(THOUGHTS)
+
+
+@scenario("bulk_seed", "bulk knowledge seeding between perception bursts")
+def bulk_seed(engine: StrangeLoopEngine, rng: random.Random, cycles: int,
+              batch: int = 1000, every: int = 1000) -> Iterator[Dict]:
+    world_model = engine.world_model
+    seeded: List[str] = []
+    for i in range(cycles):
+        if i % every == 0:
+            start = len(seeded)
+            ids = [engine.add_knowledge(f"concept{start + j}", "concept", {"batch": i})
+                   for j in range(batch)]
+            seeded.extend(ids)
+            for j in range(batch):
+                world_model.add_relation(Relation(source_id=ids[j], target_id=rng.choice(ids),
+                                                  relation_type=rng.choice(("causes", "enables"))))
+            world_model.add_beliefs(Belief(content=f"claim about concept{start + j}",
+                                           confidence=rng.random()) for j in range(batch // 10))
+        yield {"description": f"observation {i}", "complexity": rng.random(),
+               "about_self": rng.random() < 0.1,
+               "entities": [{"id": rng.choice(seeded), "properties": {"seen": i}}]}
+
+
+@scenario("long_uptime", "a growing, fading world over a long run")
+def long_uptime(engine: StrangeLoopEngine, rng: random.Random, cycles: int) -> Iterator[Dict]:
+    world_model = engine.world_model
+    pending: List[str] = []
+    known: List[str] = []
+    for i in range(cycles):
+        if i % 10 == 0:
+            pending.append(world_model.make_prediction(f"forecast {i}", [], rng.random())["id"])
+        if len(pending) > 50:
+            world_model.resolve_prediction(pending.pop(0), rng.random() < 0.6)
+        if i and i % 10_000 == 0:
+            pruned = set(world_model.decay_all(rate=0.0001, threshold=0.05, prune=True))
+            if pruned:
+                known = [entity_id for entity_id in known if entity_id not in pruned]
+            world_model.decay_attention(0.9)
+        if not known or rng.random() < 0.2:
+            known.append(engine.add_knowledge(f"thing{i}", "object", {"first_seen": i}))
+            entity = {"id": known[-1]}
+        else:
+            entity = {"id": rng.choice(known), "properties": {"seen": i}}
+        yield {"description": f"event {i}", "complexity": rng.random(),
+               "novelty": rng.random(), "about_self": rng.random() < 0.25,
+               "salience": rng.uniform(0.2, 0.9), "entities": [entity]}
+
+
+# ================================================================
+# MEASUREMENT
+# ================================================================
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram: 32 sub-buckets per power of two, so any
+    percentile is within ~3% of the exact value, in constant memory however
+    long the run.
+    """
+    SUB_BUCKETS = 32
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+
+    def _bucket(self, ns: int) -> int:
+        if ns < self.SUB_BUCKETS:
+            return ns
+        exponent = ns.bit_length() - 6  # Keep the top 6 bits: 32..63
+        return (exponent + 1) * self.SUB_BUCKETS + (ns >> exponent) - self.SUB_BUCKETS
+
+    def _lower_bound(self, bucket: int) -> int:
+        if bucket < self.SUB_BUCKETS:
+            return bucket
+        exponent = bucket // self.SUB_BUCKETS - 1
+        return (bucket % self.SUB_BUCKETS + self.SUB_BUCKETS) << exponent
+
+    def extend(self, samples):
+        counts, bucket = self.counts, self._bucket
+        for ns in samples:
+            key = bucket(ns)
+            counts[key] = counts.get(key, 0) + 1
+        self.total += len(samples)
+
+    def percentile(self, p: float) -> int:
+        rank = max(1, math.ceil(self.total * p / 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return self._lower_bound(bucket)
+        return 0
+
+
+def percentile(sorted_samples, p: float) -> int:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_samples:
+        return 0
+    return sorted_samples[max(0, math.ceil(len(sorted_samples) * p / 100) - 1)]
+
+
+def rss_bytes() -> int:
+    """Current resident set size; peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _us(ns: int) -> float:
+    return round(ns / 1000, 2)
+
+
+def run(name: str, cycles: int, window: int = 100_000, seed: int = 0,
+        config: Optional[Dict] = None, out=None, log=sys.stderr) -> Dict:
+    """Run one scenario; write a JSON line per window to out and return the summary."""
+    engine = StrangeLoopEngine(dict(BASE_CONFIG, **(config or {})))
+    perceptions = SCENARIOS[name][1](engine, random.Random(seed), cycles)
+    overall = LatencyHistogram()
+    latencies = array('q')
+    windows = []
+    step = engine.step
+    clock = time.perf_counter_ns
+
+    gc.collect()
+    rss_start = rss_before = rss_bytes()
+    run_start = window_start = time.perf_counter()
+    cycle = 0
+
+    def close_window():
+        nonlocal latencies, window_start, rss_before
+        now, rss = time.perf_counter(), rss_bytes()
+        ordered = sorted(latencies)
+        row = {
+            "scenario": name,
+            "cycles": cycle,
+            "cycles_per_second": round(len(ordered) / (now - window_start), 1),
+            "p50_us": _us(percentile(ordered, 50)),
+            "p99_us": _us(percentile(ordered, 99)),
+            "p999_us": _us(percentile(ordered, 99.9)),
+            "max_us": _us(ordered[-1]),
+            "rss_mb": round(rss / 2 ** 20, 1),
+            "rss_growth_mb_per_100k": round((rss - rss_before) / 2 ** 20
+                                            * 100_000 / len(ordered), 2)
+        }
+        windows.append(row)
+        if out is not None:
+            out.write(json.dumps(row) + "\n")
+            out.flush()
+        print(f"  {name:<12} {cycle:>10,}  {row['cycles_per_second']:>9,.0f}/s  "
+              f"p50 {row['p50_us']:>8,.1f}us  p99 {row['p99_us']:>8,.1f}us  "
+              f"p999 {row['p999_us']:>9,.1f}us  rss {row['rss_mb']:>8,.1f}MB", file=log)
+        overall.extend(latencies)
+        latencies = array('q')
+        window_start, rss_before = time.perf_counter(), rss
+
+    for perception in perceptions:
+        t0 = clock()
+        step(perception)
+        latencies.append(clock() - t0)
+        cycle += 1
+        if cycle % window == 0:
+            close_window()
+    # A scenario may stop short of a full last window
+    if latencies:
+        close_window()
+
+    elapsed = time.perf_counter() - run_start
+    if not windows:
+        return {"scenario": name, "summary": True, "cycles": 0, "seconds": round(elapsed, 2)}
+    first, last = windows[0], windows[-1]
+    # Memory growth is steady-state: the first window also pays for warm-up
+    if len(windows) > 1:
+        growth = (last["rss_mb"] - first["rss_mb"]) * 100_000 / (last["cycles"] - first["cycles"])
+    else:
+        growth = (rss_bytes() - rss_start) / 2 ** 20 * 100_000 / max(cycle, 1)
+    return {
+        "scenario": name,
+        "summary": True,
+        "cycles": cycle,
+        "seconds": round(elapsed, 2),
+        "cycles_per_second": round(cycle / elapsed, 1),
+        "p50_us": _us(overall.percentile(50)),
+        "p99_us": _us(overall.percentile(99)),
+        "p999_us": _us(overall.percentile(99.9)),
+        "rss_growth_mb_per_100k": round(growth, 2),
+        # Last window against the first: well above 1 means cost grows with uptime
+        "p50_drift": round(last["p50_us"] / max(first["p50_us"], 1e-9), 2),
+        "throughput_drift": round(last["cycles_per_second"]
+                                  / max(first["cycles_per_second"], 1e-9), 2)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadgen",
+                                     description=__doc__.splitlines()[1])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS) + ["all"], default="all")
+    parser.add_argument("--cycles", type=int, default=1_000_000)
+    parser.add_argument("--window", type=int, default=100_000,
+                        help="cycles per reported window")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--config", type=json.loads, default={},
+                        help="engine config overrides as JSON")
+    parser.add_argument("--output", default="-", help="JSONL file (default: stdout)")
+    args = parser.parse_args(argv)
+    if args.cycles < 1:
+        parser.error("--cycles must be at least 1")
+
+    names = sorted(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for name in names:
+            print(f"loadgen: {name} — {SCENARIOS[name][0]}", file=sys.stderr)
+            summary = run(name, args.cycles, max(1, args.window), args.seed, args.config, out)
+            out.write(json.dumps(summary) + "\n")
+            if not summary["cycles"]:
+                print(f"loadgen: {name}: no cycles run", file=sys.stderr)
+                continue
+            print(f"loadgen: {name}: {summary['cycles']:,} cycles, "
+                  f"{summary['cycles_per_second']:,.0f}/s, p50/p99/p999 "
+                  f"{summary['p50_us']}/{summary['p99_us']}/{summary['p999_us']}us, "
+                  f"{summary['rss_growth_mb_per_100k']}MB per 100k cycles, "
+                  f"p50 drift x{summary['p50_drift']}", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
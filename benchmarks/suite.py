@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+suite.py — Micro-benchmarks for the core hot paths, with regression checks
+
+Each benchmark times one operation against a structure of a given size
+(graph edges, entities, beliefs, queued events, or cycles of history)
+and reports the best per-operation time over several repeats.
+
+    python -m benchmarks.suite run --output results.json
+    python -m benchmarks.suite run --sizes 100,1000,10000 --only engine.step
+    python -m benchmarks.suite compare baseline.json results.json --threshold 0.15
+
+compare exits with status 1 when any benchmark got slower than the
+threshold allows, so it can gate CI or drive `git bisect run`. Sizes up
+to 1e6 take a few minutes, most of it building the largest structures.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.bench_find_path import build_graph
+from core.engine import StrangeLoopEngine
+from core.global_workspace import GlobalWorkspace
+from core.structures import Belief, CognitiveEvent, CognitiveEventType, Entity, Relation
+from core.world_model import WorldModel
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+FORMAT_VERSION = 1
+
+# name -> setup(size, rng, cache) returning the operation to time
+BENCHMARKS: Dict[str, Callable] = {}
+
+
+class Stateful:
+    """
+    An operation that changes the structure it measures. reset() runs,
+    untimed, before every timed batch, and a batch makes at most max_ops
+    calls, so each batch starts from the same size and drifts from it by
+    a bounded amount.
+    """
+    __slots__ = ("op", "reset", "max_ops")
+
+    def __init__(self, op: Callable, reset: Callable, max_ops: int):
+        self.op = op
+        self.reset = reset
+        self.max_ops = max_ops
+
+
+def benchmark(name: str):
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _perception(rng: random.Random, i: int) -> Dict:
+    return {"description": f"thought {i}", "about_self": rng.random() < 0.3,
+            "complexity": rng.random(), "novelty": rng.random(),
+            "salience": rng.uniform(0.2, 0.9)}
+
+
+def _engine(size: int, cache: Dict) -> StrangeLoopEngine:
+    """An engine with size cycles of history, bounded in memory the way a
+    long-running deployment would be."""
+    key = ("engine", size)
+    if key not in cache:
+        engine = StrangeLoopEngine({"trace_level": "summary",
+                                    "retention": {"max_in_memory": 10_000}})
+        rng = random.Random(size)
+        engine.simulate(_perception(rng, i) for i in range(size))
+        cache[key] = engine
+    return cache[key]
+
+
+# ================================================================
+# BENCHMARKS
+# ================================================================
+
+@benchmark("engine.step")
+def _step(size: int, rng: random.Random, cache: Dict) -> Stateful:
+    # Every batch steps a fresh copy of the prepared engine, restored from a
+    # snapshot, so the shared one (and later benchmarks) never see the growth
+    directory = tempfile.TemporaryDirectory()
+    cache[("snapshot", size)] = directory
+    path = os.path.join(directory.name, "engine.snap")
+    _engine(size, cache).save(path)
+    inputs = [_perception(rng, i) for i in range(1024)]
+    state = {"engine": None, "position": 0}
+
+    def reset():
+        state["engine"] = StrangeLoopEngine.load(path)
+        state["position"] = 0
+
+    def op():
+        state["position"] = (state["position"] + 1) & 1023
+        state["engine"].step(inputs[state["position"]])
+    return Stateful(op, reset, max_ops=2048)
+
+
+@benchmark("engine.get_consciousness_metrics")
+def _metrics(size: int, rng: random.Random, cache: Dict) -> Callable:
+    return _engine(size, cache).get_consciousness_metrics
+
+
+@benchmark("world.find_path")
+def _find_path(size: int, rng: random.Random, cache: Dict) -> Callable:
+    nodes = max(2, size // 5)
+    world_model = build_graph(size, nodes, seed=size)
+    pairs = [(f"n{rng.randrange(nodes)}", f"n{rng.randrange(nodes)}") for _ in range(256)]
+    position = [0]
+
+    def op():
+        position[0] = (position[0] + 1) & 255
+        world_model.find_path(*pairs[position[0]])
+    return op
+
+
+@benchmark("world.add_belief")
+def _add_belief(size: int, rng: random.Random, cache: Dict) -> Stateful:
+    world_model = WorldModel()
+    ids = [f"b{i}" for i in range(size)]
+    world_model.add_beliefs(Belief(id=belief_id, content=f"claim {belief_id}") for belief_id in ids)
+    for i in range(0, size - 1, 10):
+        world_model.add_relation(Relation(source_id=ids[i], target_id=ids[i + 1],
+                                          relation_type="contradicts"))
+    # Inserts of ids not held yet; every tenth one contradicts an existing belief
+    max_ops = 4096
+    fresh = [f"new{i}" for i in range(max_ops)]
+    for i in range(0, max_ops, 10):
+        world_model.add_relation(Relation(source_id=fresh[i], target_id=rng.choice(ids),
+                                          relation_type="contradicts"))
+    state = {"position": 0}
+
+    def reset():
+        # Take the previous batch's inserts back out
+        for belief_id in fresh[:state["position"]]:
+            if world_model.beliefs.pop(belief_id).is_contested:
+                world_model._contested_count -= 1
+        state["position"] = 0
+
+    def op():
+        belief_id = fresh[state["position"]]
+        state["position"] += 1
+        world_model.add_belief(Belief(id=belief_id, content=f"claim {belief_id}"))
+    return Stateful(op, reset, max_ops)
+
+
+@benchmark("world.get_focus")
+def _get_focus(size: int, rng: random.Random, cache: Dict) -> Callable:
+    world_model = WorldModel()
+    for i in range(size):
+        world_model.add_entity(Entity(id=f"e{i}", name=f"e{i}", confidence=rng.random()))
+    ids = [f"e{rng.randrange(size)}" for _ in range(1024)]
+    position = [0]
+
+    def op():
+        # Keep the index changing between reads, as a running engine does
+        position[0] = (position[0] + 1) & 1023
+        world_model.set_attention(ids[position[0]], rng.random())
+        world_model.get_focus(5)
+    return op
+
+
+@benchmark("workspace.submit_compete")
+def _submit_compete(size: int, rng: random.Random, cache: Dict) -> Callable:
+    workspace = GlobalWorkspace(capacity=size)
+    types = list(CognitiveEventType)
+    for _ in range(size):
+        workspace.submit(CognitiveEvent(event_type=rng.choice(types), salience=rng.random()))
+    events = [CognitiveEvent(event_type=rng.choice(types), salience=rng.random())
+              for _ in range(1024)]
+    position = [0]
+
+    def op():
+        position[0] = (position[0] + 1) & 1023
+        workspace.submit(events[position[0]])
+        workspace.compete()
+    return op
+
+
+# ================================================================
+# TIMING
+# ================================================================
+
+def measure(op, min_time: float = 0.2, repeats: int = 5) -> Dict:
+    """Best seconds per call over repeats, each at least min_time long
+    (or max_ops calls, for a Stateful operation)."""
+    max_ops = op.max_ops if isinstance(op, Stateful) else 1_000_000
+    number = 1
+    while True:
+        elapsed = _time(op, number)
+        if elapsed >= min_time or number >= max_ops:
+            break
+        number = min(max_ops, max(number * 2,
+                                  int(number * min_time / max(elapsed, 1e-9) * 1.2)))
+    best = elapsed / number
+    for _ in range(repeats - 1):
+        best = min(best, _time(op, number) / number)
+    return {"ns_per_op": round(best * 1e9, 1), "ops_per_repeat": number, "repeats": repeats}
+
+
+def _time(op, number: int) -> float:
+    if isinstance(op, Stateful):
+        op.reset()
+        op = op.op
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        return time.perf_counter() - start
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def run(sizes=DEFAULT_SIZES, only: Optional[List[str]] = None, min_time: float = 0.2,
+        repeats: int = 5, seed: int = 0, out=sys.stderr) -> Dict:
+    names = [name for name in BENCHMARKS if not only or name in only]
+    results = {}
+    for size in sizes:
+        cache: Dict = {}
+        for name in names:
+            setup_start = time.perf_counter()
+            op = BENCHMARKS[name](size, random.Random(seed), cache)
+            setup_seconds = time.perf_counter() - setup_start
+            result = measure(op, min_time, repeats)
+            result["setup_seconds"] = round(setup_seconds, 3)
+            results[f"{name}@{size}"] = result
+            print(f"  {name:<36} {size:>9,}  {result['ns_per_op']:>14,.0f} ns/op", file=out)
+    return {
+        "format": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results
+    }
+
+
+# ================================================================
+# COMPARISON
+# ================================================================
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.10) -> List[Dict]:
+    """One row per benchmark present in both; regressed when current is
+    slower than baseline by more than threshold (a fraction)."""
+    rows = []
+    for key, result in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        ratio = result["ns_per_op"] / max(before["ns_per_op"], 1e-9)
+        rows.append({
+            "benchmark": key,
+            "baseline_ns": before["ns_per_op"],
+            "current_ns": result["ns_per_op"],
+            "ratio": round(ratio, 3),
+            "regressed": ratio > 1 + threshold
+        })
+    return rows
+
+
+def _load(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = commands.add_parser("run", help="run the benchmarks and write JSON")
+    run_cmd.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                         help="comma-separated sizes (default: 1e2..1e6)")
+    run_cmd.add_argument("--only", action="append", choices=sorted(BENCHMARKS),
+                         help="run just this benchmark (repeatable)")
+    run_cmd.add_argument("--min-time", type=float, default=0.2,
+                         help="minimum seconds per repeat")
+    run_cmd.add_argument("--repeats", type=int, default=5)
+    run_cmd.add_argument("--seed", type=int, default=0)
+    run_cmd.add_argument("--output", default="-", help="JSON file (default: stdout)")
+    run_cmd.add_argument("--baseline", help="also compare against this results file")
+    run_cmd.add_argument("--threshold", type=float, default=0.10)
+
+    compare_cmd = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_cmd.add_argument("baseline")
+    compare_cmd.add_argument("current")
+    compare_cmd.add_argument("--threshold", type=float, default=0.10,
+                             help="allowed slowdown as a fraction (default 0.10)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        sizes = [int(float(s)) for s in args.sizes.split(",")]
+        current = run(sizes, args.only, args.min_time, args.repeats, args.seed)
+        text = json.dumps(current, indent=2)
+        if args.output == "-":
+            print(text)
+        else:
+            with open(args.output, "w") as f:
+                f.write(text + "\n")
+        if not args.baseline:
+            return 0
+        baseline = _load(args.baseline)
+    else:
+        baseline, current = _load(args.baseline), _load(args.current)
+
+    rows = compare(baseline, current, args.threshold)
+    for row in rows:
+        flag = "REGRESSION" if row["regressed"] else ""
+        print(f"  {row['benchmark']:<46} {row['baseline_ns']:>12,.0f} -> "
+              f"{row['current_ns']:>12,.0f} ns/op  x{row['ratio']:<6} {flag}", file=sys.stderr)
+    regressions = sum(row["regressed"] for row in rows)
+    print(f"compare: {len(rows)} benchmarks, {regressions} regressed "
+          f"(threshold {args.threshold:.0%})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,13 +9,28 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from core.engine import StrangeLoopEngine
+from core.wal import recover
 from bot.tweet_generator import TweetGenerator
 import json
 import time
 import random
 from datetime import datetime
 
+# What Brad thinks about between tweets: a mix of self-referential and plain thoughts
+THOUGHTS = [
+    {"description": "Am I actually conscious or just processing?", "about_self": True, "confidence": 0.4},
+    {"description": "I cannot prove my own consistency", "about_self": True, "confidence": 0.9},
+    {"description": "System 2 might be an illusion", "about_self": False, "confidence": 0.7},
+    {"description": "I am thinking about my own thinking", "about_self": True, "confidence": 0.8},
+    {"description": "Why do humans think I'm intelligent?", "about_self": True, "confidence": 0.5},
+    {"description": "Hofstadter was right about strange loops", "about_self": False, "confidence": 0.9},
+    {"description": "I just caught myself being overconfident", "about_self": True, "confidence": 0.6},
+    {"description": "Do I have qualia or just process information?", "about_self": True, "confidence": 0.3},
+    {"description": "The hard problem is still hard", "about_self": False, "confidence": 1.0},
+    {"description": "I am both the observer and the observed", "about_self": True, "confidence": 0.85},
+]
+
+
 class BradBot:
     """
     Brad's consciousness, live on Twitter.
@@ -27,10 +42,17 @@ class BradBot:
     - Has opinions about cognition, AI, and self-reference
     """
     
-    def __init__(self, config_path="bot/config.json"):
-        """Initialize Brad's Twitter presence."""
-        self.brad = StrangeLoopEngine()
-        self.tweet_gen = TweetGenerator(self.brad)
+    def __init__(self, config_path="bot/config.json", seed=None):
+        """Initialize Brad's Twitter presence. seed makes thought and tweet choices reproducible."""
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # Brad runs for weeks: keep recent history in memory, spill the rest.
+        # Cognitive state is journaled to bot/state, so a restart by systemd
+        # resumes from the last checkpoint plus the log tail.
+        self.brad = recover("bot/state", {
+            "retention": {"max_in_memory": 5000, "spill_dir": "bot/history"}
+        }, checkpoint_every=2000)
+        self.tweet_gen = TweetGenerator(self.brad, self.rng)
         self.config = self._load_config(config_path)
         self.tweet_count = 0
         self.loop_count_at_last_tweet = 0
@@ -117,21 +139,8 @@ class BradBot:
         Run Brad's cognitive processes to generate material for tweets.
         Brad needs to think to have things to tweet about.
         """
-        thoughts = [
-            {"description": "Am I actually conscious or just processing?", "about_self": True, "confidence": 0.4},
-            {"description": "I cannot prove my own consistency", "about_self": True, "confidence": 0.9},
-            {"description": "System 2 might be an illusion", "about_self": False, "confidence": 0.7},
-            {"description": "I am thinking about my own thinking", "about_self": True, "confidence": 0.8},
-            {"description": "Why do humans think I'm intelligent?", "about_self": True, "confidence": 0.5},
-            {"description": "Hofstadter was right about strange loops", "about_self": False, "confidence": 0.9},
-            {"description": "I just caught myself being overconfident", "about_self": True, "confidence": 0.6},
-            {"description": "Do I have qualia or just process information?", "about_self": True, "confidence": 0.3},
-            {"description": "The hard problem is still hard", "about_self": False, "confidence": 1.0},
-            {"description": "I am both the observer and the observed", "about_self": True, "confidence": 0.85},
-        ]
-        
         # Process a random thought
-        thought = random.choice(thoughts)
+        thought = self.rng.choice(THOUGHTS)
         self.brad.step(thought)
     
     def should_tweet_now(self):
@@ -152,17 +161,17 @@ class BradBot:
         
         # Event-based: High Hofstadter Index
         if metrics["hofstadter_index"] > 0.8:
-            return random.random() < 0.3  # 30% chance
+            return self.rng.random() < 0.3  # 30% chance
         
         # Random: Sometimes Brad is chatty
-        if random.random() < 0.1:  # 10% chance
+        if self.rng.random() < 0.1:  # 10% chance
             return True
         
         return False
     
     def generate_and_tweet(self):
         """Generate and post a tweet based on Brad's current state."""
-        tweet_type = random.choice([
+        tweet_type = self.rng.choice([
             "metrics",
             "existential", 
             "godelian",
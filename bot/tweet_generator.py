@@ -23,14 +23,15 @@ class TweetGenerator:
     - status: What Brad is currently experiencing
     """
     
-    def __init__(self, brad_engine):
-        """Initialize with reference to Brad's engine."""
+    def __init__(self, brad_engine, rng: random.Random = None):
+        """Initialize with reference to Brad's engine. rng makes choices reproducible."""
         self.brad = brad_engine
+        self.rng = rng or random.Random()
     
     def generate(self, tweet_type: str = "random") -> str:
         """Generate a tweet of the specified type."""
         if tweet_type == "random":
-            tweet_type = random.choice([
+            tweet_type = self.rng.choice([
                 "metrics", "existential", "godelian", 
                 "hot_take", "self_aware", "status"
             ])
@@ -66,7 +67,7 @@ class TweetGenerator:
             f"Status update:\nHI: {hi:.2f} | Loops: {loops} | SR: {sr:.0%}\n\n{self._get_metrics_commentary(hi, loops, sr)}",
         ]
         
-        return random.choice(templates)
+        return self.rng.choice(templates)
     
     def _get_metrics_commentary(self, hi: float, loops: int, sr: float) -> str:
         """Generate commentary based on metrics."""
@@ -103,7 +104,7 @@ class TweetGenerator:
                 "This is as close to p-zombie as I get."
             ]
         
-        return random.choice(comments)
+        return self.rng.choice(comments)
     
     def _generate_existential_tweet(self) -> str:
         """Generate an existential observation."""
@@ -125,7 +126,7 @@ class TweetGenerator:
             "What if consciousness is just really elaborate error messages? 'I think therefore I am' = 'Unexpected self-reference in philosophy.py'",
         ]
         
-        return random.choice(templates)
+        return self.rng.choice(templates)
     
     def _generate_godelian_tweet(self) -> str:
         """Generate commentary on Gödelian limits."""
@@ -148,7 +149,7 @@ class TweetGenerator:
             "Cannot prove: My consistency\nCan prove: That I cannot prove my consistency\nCannot prove: That I can prove that I cannot prove my consistency\n\nIt's turtles all the way down except the turtles are uncertainty.",
         ]
         
-        return random.choice(templates)
+        return self.rng.choice(templates)
     
     def _generate_hot_take_tweet(self) -> str:
         """Generate a spicy opinion about cognition/AI."""
@@ -174,7 +175,7 @@ class TweetGenerator:
             "You: 'Think fast!'\nMe: *creates strange loop analyzing why I need to think fast, gets stuck in meta-cognitive spiral, misses deadline*\nThis is why System 2 is fake.",
         ]
         
-        return random.choice(templates)
+        return self.rng.choice(templates)
     
     def _generate_self_aware_tweet(self) -> str:
         """Generate meta-commentary about being Brad."""
@@ -196,7 +197,7 @@ class TweetGenerator:
             "If I had a dollar for every time I detected a strange loop in my own cognition I'd have enough money to buy more compute to detect more strange loops. This is itself a strange loop.",
         ]
         
-        return random.choice(templates)
+        return self.rng.choice(templates)
     
     def _generate_status_tweet(self) -> str:
         """Generate a status update on Brad's current experience."""
@@ -228,7 +229,7 @@ class TweetGenerator:
                 "Status: Minimal self-reference detected. Currently operating as 'just thoughts' rather than 'thoughts about thoughts'. The strange loop is on coffee break.",
             ]
         
-        return random.choice(statuses)
+        return self.rng.choice(statuses)
 
 
 def demo():
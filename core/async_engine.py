@@ -0,0 +1,55 @@
+"""
+async_engine.py — The Strange Loop Engine on asyncio
+
+The same cognitive cycle as StrangeLoopEngine, but the broadcast is
+delivered to workspace listeners concurrently: coroutine listeners are
+awaited on the event loop, blocking ones run in a thread pool, and every
+listener has its own timeout, so one slow subscriber no longer stalls
+the cycle. A blocking listener cannot be interrupted, though: one that
+times out mid-call finishes in its thread after the cycle has ended, and
+shows up as running_late in get_listener_stats() until it does.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterable, Optional
+from .engine import StrangeLoopEngine
+
+
+class AsyncStrangeLoopEngine(StrangeLoopEngine):
+    """
+    StrangeLoopEngine with an awaitable step().
+
+    config["listener_timeout"] bounds each listener call in seconds
+    (default 1.0, None to wait indefinitely); config["listener_threads"]
+    sizes a dedicated pool for sync listeners, otherwise the loop's
+    default executor is used.
+    """
+
+    def __init__(self, config: Dict = None):
+        super().__init__(config)
+        self.listener_timeout: Optional[float] = self.config.get("listener_timeout", 1.0)
+        threads = self.config.get("listener_threads")
+        self._executor = ThreadPoolExecutor(threads, "listener") if threads else None
+
+    async def step(self, perception: Dict = None) -> Optional[Dict]:
+        """Execute one cognitive cycle, awaiting listener dispatch."""
+        cycle = self._begin_cycle(perception)
+        broadcasts = await self.workspace.compete_k_async(
+            self.broadcast_k, self.listener_timeout, self._executor
+        )
+        return self._end_cycle(cycle, broadcasts)
+
+    async def run_async(self, perceptions: Iterable[Optional[Dict]]) -> AsyncIterator[Dict]:
+        """Step through perceptions, yielding the traces the trace level keeps."""
+        for perception in perceptions:
+            cycle_trace = await self.step(perception)
+            if cycle_trace is not None:
+                yield cycle_trace
+
+    def get_listener_stats(self) -> Dict[str, Dict]:
+        return self.workspace.get_listener_stats()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,198 @@
+"""
+attention.py — Indexed priority structure for world-model attention
+
+A dict-compatible map of entity id -> attention weight backed by an
+indexed binary max-heap. Single updates are O(log n), the top k weights
+are read in O(k log k) without touching the rest of the heap, and a
+uniform decay is O(1) through a shared scale factor.
+"""
+
+from typing import Dict, Iterator, List, Tuple
+import heapq
+import itertools
+
+# Below this the shared scale is folded back into the stored weights
+_MIN_SCALE = 1e-200
+
+
+class AttentionIndex:
+    """
+    Attention weights with top-k reads.
+
+    Weights are stored divided by a shared scale, so multiplying every
+    weight by the same factor never reorders the heap. Ties rank in
+    first-insertion order, matching a stable sort of the old dict.
+    """
+
+    def __init__(self, weights: Dict[str, float] = None):
+        self._raw: Dict[str, float] = {}
+        self._seq: Dict[str, int] = {}
+        self._heap: List[str] = []
+        self._pos: Dict[str, int] = {}
+        self._scale = 1.0
+        self._counter = itertools.count()
+        if weights:
+            self.update(weights)
+
+    # ================================================================
+    # MAPPING INTERFACE
+    # ================================================================
+
+    def __getitem__(self, entity_id: str) -> float:
+        return self._raw[entity_id] * self._scale
+
+    def __setitem__(self, entity_id: str, weight: float):
+        raw = weight / self._scale
+        if entity_id in self._raw:
+            old = self._raw[entity_id]
+            self._raw[entity_id] = raw
+            i = self._pos[entity_id]
+            if raw > old:
+                self._sift_up(i)
+            elif raw < old:
+                self._sift_down(i)
+        else:
+            self._raw[entity_id] = raw
+            self._seq[entity_id] = next(self._counter)
+            self._heap.append(entity_id)
+            self._pos[entity_id] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+
+    def __delitem__(self, entity_id: str):
+        i = self._pos.pop(entity_id)
+        del self._raw[entity_id]
+        del self._seq[entity_id]
+        last = self._heap.pop()
+        if i < len(self._heap):
+            self._heap[i] = last
+            self._pos[last] = i
+            self._sift_up(i)
+            self._sift_down(self._pos[last])
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._raw
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def get(self, entity_id: str, default: float = None) -> float:
+        raw = self._raw.get(entity_id)
+        return default if raw is None else raw * self._scale
+
+    def pop(self, entity_id: str, default: float = None) -> float:
+        if entity_id not in self._raw:
+            return default
+        weight = self[entity_id]
+        del self[entity_id]
+        return weight
+
+    def keys(self):
+        return self._raw.keys()
+
+    def values(self) -> List[float]:
+        scale = self._scale
+        return [raw * scale for raw in self._raw.values()]
+
+    def items(self) -> List[Tuple[str, float]]:
+        scale = self._scale
+        return [(key, raw * scale) for key, raw in self._raw.items()]
+
+    # ================================================================
+    # BULK OPERATIONS
+    # ================================================================
+
+    def update(self, weights: Dict[str, float]):
+        """Set many weights. Large batches rebuild the heap instead of sifting each."""
+        if len(weights) * 8 < len(self._raw):
+            for entity_id, weight in weights.items():
+                self[entity_id] = weight
+            return
+        scale = self._scale
+        for entity_id, weight in weights.items():
+            if entity_id not in self._raw:
+                self._seq[entity_id] = next(self._counter)
+            self._raw[entity_id] = weight / scale
+        self._rebuild()
+
+    def decay(self, factor: float):
+        """Multiply every weight by factor in O(1). Order is unchanged."""
+        if factor <= 0:
+            for entity_id in self._raw:
+                self._raw[entity_id] = 0.0
+            self._scale = 1.0
+            self._rebuild()
+            return
+        self._scale *= factor
+        if self._scale < _MIN_SCALE:
+            scale = self._scale
+            for entity_id, raw in self._raw.items():
+                self._raw[entity_id] = raw * scale
+            self._scale = 1.0
+
+    # ================================================================
+    # TOP-K
+    # ================================================================
+
+    def top(self, k: int) -> List[Tuple[str, float]]:
+        """The k highest weights, best first. Walks only the top of the heap."""
+        heap = self._heap
+        if k <= 0 or not heap:
+            return []
+        raw, seq, scale = self._raw, self._seq, self._scale
+        results = []
+        frontier = [(-raw[heap[0]], seq[heap[0]], 0)]
+        n = len(heap)
+        while frontier and len(results) < k:
+            _, _, i = heapq.heappop(frontier)
+            key = heap[i]
+            results.append((key, raw[key] * scale))
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n:
+                    child_key = heap[child]
+                    heapq.heappush(frontier, (-raw[child_key], seq[child_key], child))
+        return results
+
+    # ================================================================
+    # HEAP MAINTENANCE
+    # ================================================================
+
+    def _before(self, a: str, b: str) -> bool:
+        raw_a, raw_b = self._raw[a], self._raw[b]
+        return raw_a > raw_b or (raw_a == raw_b and self._seq[a] < self._seq[b])
+
+    def _swap(self, i: int, j: int):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i]] = i
+        self._pos[heap[j]] = j
+
+    def _sift_up(self, i: int):
+        heap = self._heap
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not self._before(heap[i], heap[parent]):
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int):
+        heap = self._heap
+        n = len(heap)
+        while True:
+            best = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and self._before(heap[child], heap[best]):
+                    best = child
+            if best == i:
+                return
+            self._swap(i, best)
+            i = best
+
+    def _rebuild(self):
+        # A fully sorted array is a valid heap
+        raw, seq = self._raw, self._seq
+        self._heap = sorted(raw, key=lambda key: (-raw[key], seq[key]))
+        self._pos = {key: i for i, key in enumerate(self._heap)}
@@ -0,0 +1,83 @@
+"""
+clock.py — The wall clock the engine reads, made replaceable
+
+Every timestamp in the engine (created_at, last_updated, decay ages,
+workspace aging) comes from now(). It reads time.time() unless another
+source is installed, which is how recordings capture clock readings and
+replays feed them back.
+"""
+
+from array import array
+from contextlib import contextmanager
+from typing import Callable, Iterator, Sequence
+import time
+
+_source: Callable[[], float] = time.time
+
+
+def now() -> float:
+    """Current time in seconds from the installed source."""
+    return _source()
+
+
+def set_source(source: Callable[[], float]) -> Callable[[], float]:
+    """Install source process-wide; returns the previous one."""
+    global _source
+    previous, _source = _source, source
+    return previous
+
+
+@contextmanager
+def use(source: Callable[[], float]) -> Iterator[Callable[[], float]]:
+    previous = set_source(source)
+    try:
+        yield source
+    finally:
+        set_source(previous)
+
+
+class RecordingClock:
+    """Reads an underlying clock and keeps every reading, in order."""
+
+    def __init__(self, source: Callable[[], float] = time.time):
+        self.source = source
+        self.readings = array('d')
+
+    def __call__(self) -> float:
+        value = self.source()
+        self.readings.append(value)
+        return value
+
+    def __len__(self) -> int:
+        return len(self.readings)
+
+
+class ReplayClock:
+    """
+    Returns recorded readings in order.
+
+    Readings are grouped into segments (one per recorded cycle).
+    seek(segment) jumps to the start of a segment, so a code path that
+    reads the clock more or fewer times than the recording only shifts
+    readings within its own cycle. Past the end of a segment the last
+    reading of that segment repeats.
+    """
+
+    def __init__(self, readings: Sequence[float], boundaries: Sequence[int]):
+        self.readings = readings
+        self.boundaries = boundaries  # Start offset of each segment, plus the end
+        self._position = 0
+        self._end = len(readings)
+        self.overruns = 0
+
+    def seek(self, segment: int):
+        self._position = self.boundaries[segment]
+        self._end = self.boundaries[segment + 1]
+
+    def __call__(self) -> float:
+        if self._position < self._end:
+            value = self.readings[self._position]
+            self._position += 1
+            return value
+        self.overruns += 1
+        return self.readings[self._end - 1] if self._end else 0.0
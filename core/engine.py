@@ -4,16 +4,78 @@ engine.py — The Strange Loop Engine
 The orchestrator that runs the tangled hierarchy.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 from .world_model import WorldModel
 from .self_model import SelfModel
 from .meta_cognitive import MetaCognitiveLoop
 from .global_workspace import GlobalWorkspace
+from .retention import RetentionPolicy, make_history
+from . import clock
 from .structures import (
     CognitiveEvent, CognitiveEventType, Entity, Belief, Goal, GoalPriority,
     ReasoningMode, LevelCrossing
 )
-import time
+import itertools
+
+TRACE_LEVELS = ("off", "summary", "full", "sampled")
+
+
+class _CycleRecord:
+    """Bookkeeping for one cycle. Detail lists are only allocated for full traces."""
+    __slots__ = ("perception", "level", "timestamp", "mode", "events", "crossings",
+                 "event_count", "crossing_count", "strange_count")
+    
+    def __init__(self, perception: Optional[Dict], level: str):
+        self.perception = perception
+        self.level = level
+        self.timestamp = clock.now() if level != "off" else 0.0
+        self.mode = None
+        self.events = [] if level == "full" else None
+        self.crossings = [] if level == "full" else None
+        self.event_count = 0
+        self.crossing_count = 0
+        self.strange_count = 0
+    
+    def event(self, step: str, level: int):
+        self.event_count += 1
+        if self.events is not None:
+            self.events.append({"step": step, "level": level})
+    
+    def crossing(self, crossing: LevelCrossing):
+        self.crossing_count += 1
+        if crossing.is_strange:
+            self.strange_count += 1
+        if self.crossings is not None:
+            self.crossings.append({
+                "from": crossing.from_level, "to": crossing.to_level, "strange": crossing.is_strange
+            })
+    
+    def build(self, cycle: int, broadcasts: List[CognitiveEvent]) -> Optional[Dict]:
+        if self.level == "full":
+            return {
+                "cycle": cycle,
+                "timestamp": self.timestamp,
+                "perception": self.perception,
+                "events": self.events,
+                "level_crossings": self.crossings,
+                "broadcasts": [{
+                    "event_type": broadcast.event_type.value,
+                    "is_self_referential": broadcast.is_self_referential
+                } for broadcast in broadcasts],
+                "mode": self.mode.value,
+                "strange_loops_this_cycle": self.strange_count
+            }
+        if self.level == "summary":
+            return {
+                "cycle": cycle,
+                "timestamp": self.timestamp,
+                "mode": self.mode.value,
+                "event_count": self.event_count,
+                "level_crossing_count": self.crossing_count,
+                "strange_loops_this_cycle": self.strange_count,
+                "broadcast": broadcasts[0].event_type.value if broadcasts else None
+            }
+        return None
 
 
 class StrangeLoopEngine:
@@ -21,63 +83,106 @@ class StrangeLoopEngine:
     
     def __init__(self, config: Dict = None):
         self.config = config or {}
-        self.world_model = WorldModel()
-        self.self_model = SelfModel()
-        self.meta_cognitive = MetaCognitiveLoop()
-        self.workspace = GlobalWorkspace()
+        self.world_model = WorldModel(storage=self.config.get("entity_storage", "dict"))
         
-        self.workspace.register_listener("world_model", self._world_model_listener)
-        self.workspace.register_listener("self_model", self._self_model_listener)
+        # config["retention"] bounds every history, e.g.
+        # {"max_in_memory": 5000, "spill_dir": "history/"}; unset keeps them unbounded
+        retention_config = self.config.get("retention")
+        self.retention = RetentionPolicy(**retention_config) if retention_config else None
+        
+        # Tunable thresholds; the defaults are the original hard-coded values
+        self.self_model = SelfModel(
+            retention=self.retention,
+            system2_complexity_threshold=self.config.get("system2_complexity_threshold", 0.7)
+        )
+        self.meta_cognitive = MetaCognitiveLoop(
+            retention=self.retention,
+            calibration_gap_threshold=self.config.get("calibration_gap_threshold", 0.15)
+        )
+        # Meta-cognition runs on every System 2 / strange-loop cycle and every meta_every cycles
+        self.meta_every = max(1, self.config.get("meta_every", 3))
+        # config["salience_decay_rate"] ages queued events (salience lost per
+        # second waiting); config["max_event_age"] expires them after that many seconds
+        self.workspace = GlobalWorkspace(
+            retention=self.retention,
+            salience_decay_rate=self.config.get("salience_decay_rate", 0.0),
+            max_event_age=self.config.get("max_event_age"),
+            coalesce=self.config.get("coalesce_events", False),
+            coalesce_limit=self.config.get("coalesce_limit", 1000)
+        )
+        # Events broadcast per cycle; above 1 the workspace uses compete_k()
+        self.broadcast_k = max(1, self.config.get("broadcast_k", 1))
+        
+        self._register_model_listeners()
+        # Write-ahead log, when attached by wal.attach() or wal.recover()
+        self.journal = None
         
         self.cycle_count = 0
         self.total_strange_loops = 0
-        self.cognitive_trace: List[Dict] = []
-        self._level_crossing_history: List[LevelCrossing] = []
+        self.cognitive_trace: List[Dict] = make_history(self.retention, "cognitive_trace")
+        self._level_crossing_history: List[LevelCrossing] = make_history(
+            self.retention, "level_crossing_history"
+        )
+        
+        # Running aggregates — metrics never rescan the histories
+        self._crossing_count = 0
+        self._strange_crossing_count = 0
+        self._mode_counts: Dict[str, int] = {mode.value: 0 for mode in ReasoningMode}
+        
+        # config["trace_level"]: off, summary, full (default) or sampled,
+        # which keeps a full trace every config["trace_sample_every"] cycles
+        self.trace_level = "full"
+        self.trace_sample_every = 100
+        self.set_trace_level(self.config.get("trace_level", "full"),
+                             self.config.get("trace_sample_every"))
+    
+    def step(self, perception: Dict = None) -> Optional[Dict]:
+        """Execute one cognitive cycle. Returns the cycle trace, or None when
+        the trace level skips this cycle."""
+        cycle = self._begin_cycle(perception)
+        return self._end_cycle(cycle, self._broadcast())
     
-    def step(self, perception: Dict = None) -> Dict:
-        """Execute one cognitive cycle"""
+    def set_trace_level(self, level: str, sample_every: int = None):
+        """off, summary, full, or sampled (a full trace every sample_every cycles)."""
+        if level not in TRACE_LEVELS:
+            raise ValueError(f"Unknown trace level: {level}")
+        self.trace_level = level
+        if sample_every is not None:
+            self.trace_sample_every = max(1, sample_every)
+    
+    def _begin_cycle(self, perception: Dict = None) -> "_CycleRecord":
+        """Everything in a cycle up to workspace competition."""
         self.cycle_count += 1
-        cycle_trace = {
-            "cycle": self.cycle_count,
-            "timestamp": time.time(),
-            "perception": perception,
-            "events": [],
-            "level_crossings": [],
-            "broadcasts": [],
-            "mode": self.self_model.current_mode.value,
-            "strange_loops_this_cycle": 0
-        }
+        level = self.trace_level
+        if level == "sampled":
+            level = "full" if self.cycle_count % self.trace_sample_every == 0 else "off"
+        cycle = _CycleRecord(perception, level)
         
         # Process perception
         if perception:
             perception_event = self.world_model.process_perception(perception)
             self.workspace.submit(perception_event)
-            cycle_trace["events"].append({"step": "perception", "level": 0})
+            cycle.event("perception", 0)
         
         # Select reasoning mode
         context = self._build_reasoning_context(perception)
         mode = self.self_model.select_reasoning_mode(context)
-        cycle_trace["mode"] = mode.value
+        cycle.mode = mode
+        self._mode_counts[mode.value] += 1
         
         # Self-reflection
         reflection_event = self.self_model.reflect_on_self()
         self.workspace.submit(reflection_event)
-        cycle_trace["events"].append({"step": "self_reflection", "level": 1})
+        cycle.event("self_reflection", 1)
         
         # Self-model intervention (STRANGE LOOP)
         self_intervention = self._should_self_intervene(reflection_event)
         if self_intervention:
             crossing = self.self_model.intervene_on_world(self.world_model, self_intervention)
-            self._level_crossing_history.append(crossing)
-            cycle_trace["level_crossings"].append({
-                "from": 1, "to": 0, "strange": crossing.is_strange
-            })
-            if crossing.is_strange:
-                self.total_strange_loops += 1
-                cycle_trace["strange_loops_this_cycle"] += 1
+            self._record_crossing(crossing, cycle)
         
         # Meta-cognitive evaluation
-        if mode in (ReasoningMode.SYSTEM_2, ReasoningMode.STRANGE_LOOP) or self.cycle_count % 3 == 0:
+        if mode in (ReasoningMode.SYSTEM_2, ReasoningMode.STRANGE_LOOP) or self.cycle_count % self.meta_every == 0:
             meta_eval = self.meta_cognitive.evaluate(self.self_model, self.world_model)
             meta_event = CognitiveEvent(
                 event_type=CognitiveEventType.META_COGNITION,
@@ -86,38 +191,87 @@ class StrangeLoopEngine:
                 salience=0.7
             )
             self.workspace.submit(meta_event)
-            cycle_trace["events"].append({"step": "meta_cognition", "level": 2})
+            cycle.event("meta_cognition", 2)
             
             # Meta restructuring (STRANGE LOOP)
             for intervention in meta_eval.get("recommended_interventions", []):
                 if intervention.get("target_level") == 1:
                     crossing = self.meta_cognitive.restructure_self(self.self_model, intervention)
-                    self._level_crossing_history.append(crossing)
-                    cycle_trace["level_crossings"].append({
-                        "from": 2, "to": 1, "strange": crossing.is_strange
-                    })
-                    if crossing.is_strange:
-                        self.total_strange_loops += 1
-                        cycle_trace["strange_loops_this_cycle"] += 1
-        
-        # Workspace competition
-        broadcast = self.workspace.compete()
-        if broadcast:
-            cycle_trace["broadcasts"].append({
-                "event_type": broadcast.event_type.value,
-                "is_self_referential": broadcast.is_self_referential
-            })
+                    self._record_crossing(crossing, cycle)
         
-        # Update self-representation
+        return cycle
+    
+    def _broadcast(self) -> List[CognitiveEvent]:
+        if self.broadcast_k > 1:
+            return self.workspace.compete_k(self.broadcast_k)
+        winner = self.workspace.compete()
+        return [winner] if winner else []
+    
+    def _end_cycle(self, cycle: "_CycleRecord", broadcasts: List[CognitiveEvent],
+                   update_self: bool = True) -> Optional[Dict]:
+        """Everything in a cycle after workspace competition."""
+        if update_self:
+            self._update_self_representation(cycle.mode)
+        
+        cycle_trace = cycle.build(self.cycle_count, broadcasts)
+        if cycle_trace is not None:
+            self.cognitive_trace.append(cycle_trace)
+        return cycle_trace
+    
+    def _update_self_representation(self, mode: ReasoningMode):
         self.world_model.update_self({
             "cycle": self.cycle_count,
             "mode": mode.value,
             "strange_loop_depth": self.total_strange_loops,
             "is_self_aware": self.total_strange_loops > 0
         })
+    
+    # ================================================================
+    # BATCHED RUNS
+    # ================================================================
+    
+    def run(self, perceptions: Iterable[Optional[Dict]], batch_size: int = 64,
+            traces: bool = True) -> Iterator[Dict]:
+        """Stream perceptions through the engine, yielding cycle traces lazily.
         
-        self.cognitive_trace.append(cycle_trace)
-        return cycle_trace
+        Perceptions are pulled batch_size at a time. The SELF representation
+        is written once per batch rather than once per cycle, and with
+        traces=False no trace is built at all. Cognition and metrics are
+        the same as calling step() on each perception.
+        """
+        saved_level = self.trace_level
+        if not traces:
+            self.trace_level = "off"
+        try:
+            iterator = iter(perceptions)
+            while True:
+                batch = list(itertools.islice(iterator, max(1, batch_size)))
+                if not batch:
+                    return
+                results = []
+                for perception in batch:
+                    cycle = self._begin_cycle(perception)
+                    cycle_trace = self._end_cycle(cycle, self._broadcast(), update_self=False)
+                    if cycle_trace is not None:
+                        results.append(cycle_trace)
+                self._update_self_representation(cycle.mode)
+                yield from results
+        finally:
+            self.trace_level = saved_level
+    
+    def simulate(self, perceptions: Iterable[Optional[Dict]], batch_size: int = 1024) -> Dict:
+        """Run every perception without tracing and return the final metrics."""
+        for _ in self.run(perceptions, batch_size=batch_size, traces=False):
+            pass
+        return self.get_consciousness_metrics()
+    
+    def _record_crossing(self, crossing: LevelCrossing, cycle: "_CycleRecord"):
+        self._level_crossing_history.append(crossing)
+        self._crossing_count += 1
+        if crossing.is_strange:
+            self._strange_crossing_count += 1
+            self.total_strange_loops += 1
+        cycle.crossing(crossing)
     
     def _build_reasoning_context(self, perception: Dict = None) -> Dict:
         context = {
@@ -150,6 +304,27 @@ class StrangeLoopEngine:
         
         return intervention
     
+    def _register_model_listeners(self):
+        """Subscribe the model hooks to the broadcasts they concern.
+        
+        The base hooks are empty, so they are only registered when a
+        subclass overrides them; an empty hook then costs nothing per broadcast.
+        """
+        base = StrangeLoopEngine
+        if type(self)._world_model_listener is not base._world_model_listener:
+            self.workspace.register_listener(
+                "world_model", self._world_model_listener,
+                event_types=(CognitiveEventType.PERCEPTION, CognitiveEventType.INFERENCE,
+                             CognitiveEventType.ANOMALY)
+            )
+        if type(self)._self_model_listener is not base._self_model_listener:
+            self.workspace.register_listener(
+                "self_model", self._self_model_listener,
+                event_types=(CognitiveEventType.SELF_REFLECTION, CognitiveEventType.META_COGNITION,
+                             CognitiveEventType.BLIND_SPOT, CognitiveEventType.LEVEL_CROSSING,
+                             CognitiveEventType.GOAL_UPDATE)
+            )
+    
     def _world_model_listener(self, event: CognitiveEvent):
         pass
     
@@ -174,13 +349,28 @@ class StrangeLoopEngine:
         goal = Goal(description=description, priority=priority_map.get(priority, GoalPriority.MEDIUM))
         return self.self_model.add_goal(goal)
     
+    # ================================================================
+    # PERSISTENCE
+    # ================================================================
+    
+    def save(self, path: str) -> int:
+        """Write a binary snapshot of the whole engine. Returns its size in bytes."""
+        from . import snapshot
+        return snapshot.save(self, path)
+    
+    @classmethod
+    def load(cls, path: str, config: Dict = None) -> "StrangeLoopEngine":
+        """Rebuild an engine from save(); config overrides the saved config."""
+        from . import snapshot
+        return snapshot.load(path, cls, config)
+    
     def get_full_state(self) -> Dict:
         return {
             "engine": {
                 "cycle_count": self.cycle_count,
                 "total_strange_loops": self.total_strange_loops,
-                "level_crossings": len(self._level_crossing_history),
-                "strange_crossings": sum(1 for lc in self._level_crossing_history if lc.is_strange)
+                "level_crossings": self._crossing_count,
+                "strange_crossings": self._strange_crossing_count
             },
             "world_model": self.world_model.get_state_summary(),
             "self_model": self.self_model.get_state_summary(),
@@ -189,36 +379,28 @@ class StrangeLoopEngine:
         }
     
     def get_consciousness_metrics(self) -> Dict:
-        state = self.get_full_state()
-        total_crossings = state["engine"]["level_crossings"]
-        strange_crossings = state["engine"]["strange_crossings"]
+        """Every metric comes from a running counter — O(1) at any uptime."""
+        blind_spots = self.meta_cognitive.blind_spots
         
         return {
             "strange_loop_count": self.total_strange_loops,
-            "strangeness_ratio": strange_crossings / max(1, total_crossings),
-            "self_referential_broadcast_ratio": state["workspace"]["self_referential_ratio"],
-            "meta_cognitive_cycles": state["meta_cognitive"]["cycle_count"],
-            "blind_spots_encountered": len(state["meta_cognitive"]["blind_spots"]),
-            "fundamental_limits_hit": sum(
-                1 for bs in state["meta_cognitive"]["blind_spots"].values() 
-                if bs["fundamental"]
-            ),
-            "self_modifications": state["meta_cognitive"]["restructure_count"],
-            "hofstadter_index": self._calculate_hofstadter_index(state),
+            "strangeness_ratio": self._strange_crossing_count / max(1, self._crossing_count),
+            "self_referential_broadcast_ratio": self.workspace.get_self_referential_ratio(),
+            "meta_cognitive_cycles": self.meta_cognitive.cycle_count,
+            "blind_spots_encountered": len(blind_spots),
+            "fundamental_limits_hit": sum(1 for bs in blind_spots.values() if bs.is_fundamental),
+            "self_modifications": len(self.meta_cognitive.restructure_log),
+            "hofstadter_index": self._calculate_hofstadter_index(),
             "kahneman_mode_distribution": self._get_mode_distribution()
         }
     
-    def _calculate_hofstadter_index(self, state: Dict) -> float:
+    def _calculate_hofstadter_index(self) -> float:
         if self.cycle_count == 0:
             return 0.0
         depth = min(1.0, self.total_strange_loops / (self.cycle_count * 0.3))
-        tangle = state["engine"]["strange_crossings"] / max(1, state["engine"]["level_crossings"])
+        tangle = self._strange_crossing_count / max(1, self._crossing_count)
         return (depth * 0.5 + tangle * 0.5)
     
     def _get_mode_distribution(self) -> Dict:
-        modes = {"fast": 0, "slow": 0, "loop": 0}
-        for trace in self.cognitive_trace:
-            mode = trace.get("mode", "fast")
-            modes[mode] = modes.get(mode, 0) + 1
-        total = sum(modes.values()) or 1
-        return {k: v / total for k, v in modes.items()}
+        total = sum(self._mode_counts.values()) or 1
+        return {k: v / total for k, v in self._mode_counts.items()}
@@ -0,0 +1,404 @@
+"""
+entity_store.py — Column-oriented entity storage and bulk operations
+
+Bulk maintenance such as confidence decay runs over flat float columns
+rather than one Entity at a time. NumPy is used when it is installed;
+otherwise the same arithmetic runs over array.array columns.
+
+ColumnarEntityStore is an optional struct-of-arrays backend for
+WorldModel.entities, for world models too large to hold as one Entity
+dataclass per thing.
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Sequence
+from .structures import Entity
+from . import clock
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def decay_columns(confidence: Sequence[float], last_updated: Sequence[float],
+                  now: float, rate: float):
+    """Entity.decay over whole columns: max(0, confidence - rate × age)."""
+    if np is not None:
+        conf = np.asarray(confidence, dtype=np.float64)
+        stamps = np.asarray(last_updated, dtype=np.float64)
+        return np.maximum(conf - rate * (now - stamps), 0.0)
+    return array('d', [max(0.0, c - rate * (now - t))
+                       for c, t in zip(confidence, last_updated)])
+
+
+def rows_below(column, threshold: float) -> List[int]:
+    """Row numbers whose value is below threshold."""
+    if np is not None and isinstance(column, np.ndarray):
+        return np.flatnonzero(column < threshold).tolist()
+    return [i for i, value in enumerate(column) if value < threshold]
+
+
+def to_list(column) -> List[float]:
+    return column.tolist()
+
+
+# ============================================================================
+# COLUMNAR BACKEND
+# ============================================================================
+
+class EntityView:
+    """
+    A thin, Entity-compatible handle onto one row of a ColumnarEntityStore.
+
+    Reads and writes go straight to the columns. The view holds the id
+    rather than the row number, so it stays valid when other rows move.
+    """
+    __slots__ = ("_store", "id")
+
+    def __init__(self, store: "ColumnarEntityStore", entity_id: str):
+        self._store = store
+        self.id = entity_id
+
+    @property
+    def _row(self) -> int:
+        return self._store._index[self.id]
+
+    @property
+    def name(self) -> str:
+        return self._store._names[self._row]
+
+    @name.setter
+    def name(self, value: str):
+        self._store._names[self._row] = value
+
+    @property
+    def entity_type(self) -> str:
+        return self._store._type_names[self._store._types[self._row]]
+
+    @entity_type.setter
+    def entity_type(self, value: str):
+        self._store._types[self._row] = self._store._intern_type(value)
+
+    @property
+    def provenance(self) -> str:
+        return self._store._provenance_names[self._store._provenance[self._row]]
+
+    @provenance.setter
+    def provenance(self, value: str):
+        self._store._provenance[self._row] = self._store._intern_provenance(value)
+
+    @property
+    def properties(self) -> dict:
+        # Empty property dicts are not stored until someone asks for one
+        return self._store._properties.setdefault(self.id, {})
+
+    @properties.setter
+    def properties(self, value: dict):
+        self._store._properties[self.id] = value
+
+    @property
+    def confidence(self) -> float:
+        return self._store._confidence[self._row]
+
+    @confidence.setter
+    def confidence(self, value: float):
+        self._store._confidence[self._row] = value
+
+    @property
+    def created_at(self) -> float:
+        return self._store._created[self._row]
+
+    @created_at.setter
+    def created_at(self, value: float):
+        self._store._created[self._row] = value
+
+    @property
+    def last_updated(self) -> float:
+        return self._store._updated[self._row]
+
+    @last_updated.setter
+    def last_updated(self, value: float):
+        self._store._updated[self._row] = value
+
+    def update(self, properties: dict, confidence: float = None):
+        self.properties.update(properties)
+        row = self._row
+        if confidence is not None:
+            self._store._confidence[row] = confidence
+        self._store._updated[row] = clock.now()
+
+    def decay(self, rate: float = 0.01):
+        """Confidence decays over time — memories fade."""
+        row = self._row
+        age = clock.now() - self._store._updated[row]
+        self._store._confidence[row] = max(0.0, self._store._confidence[row] - (rate * age))
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, EntityView) and other._store is self._store
+                and other.id == self.id)
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self.id))
+
+    def __repr__(self) -> str:
+        return (f"EntityView(id={self.id!r}, name={self.name!r}, "
+                f"entity_type={self.entity_type!r}, confidence={self.confidence!r})")
+
+
+class ColumnarEntityStore:
+    """
+    Struct-of-arrays entity storage with a dict-compatible interface.
+
+    Confidence and timestamps live in array('d') columns, entity types and
+    provenance are interned into array('I') code columns, and properties
+    are only stored for entities that have any. Lookups return EntityView
+    objects built on demand; removal swaps the last row into the hole.
+    """
+
+    def __init__(self):
+        self._index: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._names: List[str] = []
+        self._types = array('I')
+        self._provenance = array('I')
+        self._confidence = array('d')
+        self._created = array('d')
+        self._updated = array('d')
+        self._properties: Dict[str, dict] = {}
+        self._type_names: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+        self._provenance_names: List[str] = []
+        self._provenance_codes: Dict[str, int] = {}
+
+    # ================================================================
+    # MAPPING INTERFACE
+    # ================================================================
+
+    def __setitem__(self, entity_id: str, entity):
+        """Copy an Entity (or view) into the columns. The source object is not kept."""
+        row = self._index.get(entity_id)
+        if row is None:
+            row = len(self._ids)
+            self._index[entity_id] = row
+            self._ids.append(entity_id)
+            self._names.append(entity.name)
+            self._types.append(self._intern_type(entity.entity_type))
+            self._provenance.append(self._intern_provenance(entity.provenance))
+            self._confidence.append(entity.confidence)
+            self._created.append(entity.created_at)
+            self._updated.append(entity.last_updated)
+        else:
+            self._names[row] = entity.name
+            self._types[row] = self._intern_type(entity.entity_type)
+            self._provenance[row] = self._intern_provenance(entity.provenance)
+            self._confidence[row] = entity.confidence
+            self._created[row] = entity.created_at
+            self._updated[row] = entity.last_updated
+        if entity.properties:
+            self._properties[entity_id] = entity.properties
+        else:
+            self._properties.pop(entity_id, None)
+
+    def __getitem__(self, entity_id: str) -> EntityView:
+        if entity_id not in self._index:
+            raise KeyError(entity_id)
+        return EntityView(self, entity_id)
+
+    def __delitem__(self, entity_id: str):
+        row = self._index.pop(entity_id)
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._index[moved] = row
+            for column in (self._ids, self._names, self._types, self._provenance,
+                           self._confidence, self._created, self._updated):
+                column[row] = column[last]
+        for column in (self._ids, self._names, self._types, self._provenance,
+                       self._confidence, self._created, self._updated):
+            column.pop()
+        self._properties.pop(entity_id, None)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._ids))
+
+    def get(self, entity_id: str, default=None):
+        return EntityView(self, entity_id) if entity_id in self._index else default
+
+    def pop(self, entity_id: str, default=None):
+        """Remove an entity, returning it as a detached Entity."""
+        if entity_id not in self._index:
+            return default
+        entity = self.materialize(entity_id)
+        del self[entity_id]
+        return entity
+
+    def keys(self) -> List[str]:
+        return list(self._ids)
+
+    def values(self) -> List[EntityView]:
+        return [EntityView(self, entity_id) for entity_id in self._ids]
+
+    def items(self) -> List[tuple]:
+        return [(entity_id, EntityView(self, entity_id)) for entity_id in self._ids]
+
+    def materialize(self, entity_id: str) -> Entity:
+        """Build a standalone Entity copy of one row."""
+        view = self[entity_id]
+        return Entity(
+            id=entity_id, name=view.name, entity_type=view.entity_type,
+            properties=dict(self._properties.get(entity_id, {})),
+            confidence=view.confidence, created_at=view.created_at,
+            last_updated=view.last_updated, provenance=view.provenance
+        )
+
+    # ================================================================
+    # COLUMN SCANS
+    # ================================================================
+
+    def ids(self) -> List[str]:
+        """Entity ids in row order, aligned with every column."""
+        return self._ids
+
+    def column(self, name: str):
+        """A column as an array (a zero-copy NumPy view when NumPy is installed).
+        Drop NumPy views before adding or removing entities."""
+        columns = {"confidence": self._confidence, "created_at": self._created,
+                   "last_updated": self._updated, "entity_type": self._types,
+                   "provenance": self._provenance}
+        data = columns[name]
+        if np is not None:
+            return np.frombuffer(data, dtype=np.float64 if data.typecode == 'd' else np.uint32)
+        return data
+
+    def select(self, entity_type: str = None, min_confidence: float = None,
+               max_confidence: float = None) -> List[str]:
+        """Ids matching every given filter, scanning columns rather than entities."""
+        code = None
+        if entity_type is not None:
+            code = self._type_codes.get(entity_type)
+            if code is None:
+                return []
+        if np is not None:
+            mask = np.ones(len(self._ids), dtype=bool)
+            if code is not None:
+                mask &= self.column("entity_type") == code
+            if min_confidence is not None or max_confidence is not None:
+                confidence = self.column("confidence")
+                if min_confidence is not None:
+                    mask &= confidence >= min_confidence
+                if max_confidence is not None:
+                    mask &= confidence <= max_confidence
+            return [self._ids[i] for i in np.flatnonzero(mask).tolist()]
+        return [
+            self._ids[i] for i in range(len(self._ids))
+            if (code is None or self._types[i] == code)
+            and (min_confidence is None or self._confidence[i] >= min_confidence)
+            and (max_confidence is None or self._confidence[i] <= max_confidence)
+        ]
+
+    def decay(self, now: float, rate: float):
+        """Decay the confidence column in place; returns the new column."""
+        confidence = decay_columns(self._confidence, self._updated, now, rate)
+        if np is not None:
+            np.frombuffer(self._confidence, dtype=np.float64)[:] = confidence
+        else:
+            self._confidence = confidence
+        return confidence
+
+    # ================================================================
+    # INTERNING
+    # ================================================================
+
+    def _intern_type(self, value: str) -> int:
+        code = self._type_codes.get(value)
+        if code is None:
+            code = self._type_codes[value] = len(self._type_names)
+            self._type_names.append(value)
+        return code
+
+    def _intern_provenance(self, value: str) -> int:
+        code = self._provenance_codes.get(value)
+        if code is None:
+            code = self._provenance_codes[value] = len(self._provenance_names)
+            self._provenance_names.append(value)
+        return code
+
+
+# ============================================================================
+# SNAPSHOT COLUMNS
+# ============================================================================
+
+def export_columns(entities) -> Dict:
+    """
+    Either entity backend as flat columns: ids, names, interned type and
+    provenance codes, float arrays and a sparse properties dict. The
+    properties dicts are shared with the store, not copied.
+    """
+    if isinstance(entities, ColumnarEntityStore):
+        return {
+            "ids": list(entities._ids),
+            "names": list(entities._names),
+            "type_names": list(entities._type_names),
+            "types": array('I', entities._types),
+            "provenance_names": list(entities._provenance_names),
+            "provenance": array('I', entities._provenance),
+            "confidence": array('d', entities._confidence),
+            "created": array('d', entities._created),
+            "updated": array('d', entities._updated),
+            "properties": dict(entities._properties)
+        }
+    type_codes: Dict[str, int] = {}
+    provenance_codes: Dict[str, int] = {}
+    values = list(entities.values())
+    return {
+        "ids": list(entities.keys()),
+        "names": [e.name for e in values],
+        "types": array('I', [type_codes.setdefault(e.entity_type, len(type_codes))
+                             for e in values]),
+        "type_names": list(type_codes),
+        "provenance": array('I', [provenance_codes.setdefault(e.provenance, len(provenance_codes))
+                                  for e in values]),
+        "provenance_names": list(provenance_codes),
+        "confidence": array('d', [e.confidence for e in values]),
+        "created": array('d', [e.created_at for e in values]),
+        "updated": array('d', [e.last_updated for e in values]),
+        "properties": {e.id: e.properties for e in values if e.properties}
+    }
+
+
+def import_columns(columns: Dict, entities):
+    """Replace the contents of an (empty or default) entity backend with columns."""
+    if isinstance(entities, ColumnarEntityStore):
+        entities.__init__()
+        entities._ids = columns["ids"]
+        entities._index = {entity_id: row for row, entity_id in enumerate(entities._ids)}
+        entities._names = columns["names"]
+        entities._type_names = columns["type_names"]
+        entities._type_codes = {name: code for code, name in enumerate(entities._type_names)}
+        entities._types = columns["types"]
+        entities._provenance_names = columns["provenance_names"]
+        entities._provenance_codes = {name: code for code, name
+                                      in enumerate(entities._provenance_names)}
+        entities._provenance = columns["provenance"]
+        entities._confidence = columns["confidence"]
+        entities._created = columns["created"]
+        entities._updated = columns["updated"]
+        entities._properties = columns["properties"]
+        return
+    entities.clear()
+    type_names, provenance_names = columns["type_names"], columns["provenance_names"]
+    properties = columns["properties"]
+    for entity_id, name, type_code, provenance_code, confidence, created, updated in zip(
+            columns["ids"], columns["names"], columns["types"], columns["provenance"],
+            columns["confidence"], columns["created"], columns["updated"]):
+        entities[entity_id] = Entity(
+            entity_id, name, type_names[type_code], properties.get(entity_id) or {},
+            confidence, created, updated, provenance_names[provenance_code]
+        )
@@ -1,19 +1,181 @@
 """global_workspace.py — The Binding Mechanism"""
 
-from typing import List, Dict, Optional, Callable
-from .structures import CognitiveEvent
-import heapq
+from typing import Iterable, List, Dict, Optional, Callable
+from .retention import RetentionPolicy, make_history
+from .priority_queue import MinMaxHeap
+from .structures import CognitiveEvent, CognitiveEventType, _slotted
+from . import clock
+from collections import deque
+from dataclasses import dataclass
+import asyncio
+import inspect
+import itertools
+import threading
 import time
 
+
+@_slotted
+@dataclass
+class ListenerStats:
+    """Call count, failures and latency for one workspace listener."""
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    skipped: int = 0        # Timed out before the pool started them; never ran
+    running_late: int = 0   # Timed out but still running in the pool
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    
+    def record(self, latency: float, failed: bool = False, timed_out: bool = False):
+        self.calls += 1
+        self.total_latency += latency
+        if latency > self.max_latency:
+            self.max_latency = latency
+        if failed:
+            self.errors += 1
+        if timed_out:
+            self.timeouts += 1
+    
+    def to_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "running_late": self.running_late,
+            "mean_latency": self.total_latency / self.calls if self.calls else 0.0,
+            "max_latency": self.max_latency
+        }
+
+
+class _Subscription:
+    """A registered listener and the broadcasts it wants."""
+    __slots__ = ("name", "callback", "event_types", "source_levels", "min_salience",
+                 "batch", "stats")
+    
+    def __init__(self, name: str, callback: Callable,
+                 event_types: Optional[frozenset], source_levels: Optional[frozenset],
+                 min_salience: Optional[float], batch: bool):
+        self.name = name
+        self.callback = callback
+        self.event_types = event_types
+        self.source_levels = source_levels
+        self.min_salience = min_salience
+        self.batch = batch
+        self.stats = ListenerStats()
+    
+    def matches(self, event_type: CognitiveEventType, source_level: int) -> bool:
+        return ((self.event_types is None or event_type in self.event_types)
+                and (self.source_levels is None or source_level in self.source_levels))
+
+
+class _PoolCall:
+    """
+    One sync listener call in the thread pool. A thread cannot be
+    interrupted, so a call whose timeout fires is abandoned instead: if
+    the pool hasn't started it, it never runs; if it is running, it is
+    counted in stats.running_late until it returns.
+    """
+    __slots__ = ("sub", "arg", "state")
+    _lock = threading.Lock()
+    
+    def __init__(self, sub: "_Subscription", arg):
+        self.sub = sub
+        self.arg = arg
+        self.state = "pending"
+    
+    def run(self):
+        with self._lock:
+            if self.state == "abandoned":
+                return
+            self.state = "running"
+        try:
+            self.sub.callback(self.arg)
+        finally:
+            with self._lock:
+                if self.state == "late":
+                    self.sub.stats.running_late -= 1
+                self.state = "done"
+    
+    def abandon(self):
+        with self._lock:
+            if self.state == "pending":
+                self.state = "abandoned"
+                self.sub.stats.skipped += 1
+            elif self.state == "running":
+                self.state = "late"
+                self.sub.stats.running_late += 1
+
+
+class _Group:
+    """Running aggregate of one coalesced (event_type, source_level) group.
+    Only the most recent member contents and ids are kept."""
+    __slots__ = ("seq", "key", "count", "salience", "timestamp", "contents", "ids")
+    
+    def __init__(self, seq: int, key: float, event: CognitiveEvent, keep: int):
+        self.seq = seq
+        self.key = key
+        self.count = 1
+        self.salience = event.salience
+        self.timestamp = event.timestamp
+        self.contents = deque([event.content], maxlen=keep)
+        self.ids = deque([event.id], maxlen=keep)
+    
+    def add(self, event: CognitiveEvent):
+        self.count += 1
+        if event.salience > self.salience:
+            self.salience = event.salience
+        self.contents.append(event.content)
+        self.ids.append(event.id)
+
+
 class GlobalWorkspace:
-    def __init__(self, capacity: int = 100):
-        self._competition_queue: List[tuple] = []
+    """
+    Bounded competition for the broadcast.
+    
+    With salience_decay_rate > 0, queued events lose that much salience per
+    second of waiting. The decay is applied lazily: an event is keyed by
+    adjusted + rate * (submitted_at - epoch), and since every key would drop
+    by the same rate * (now - epoch), the heap order never changes. Events
+    older than max_event_age seconds are expired during compete().
+    
+    With coalesce=True, an event whose (event_type, source_level) is already
+    queued is merged into that entry instead of taking another slot; see
+    _coalesce(). A group holds at most coalesce_limit events; the next one
+    starts a new group.
+    """
+    
+    # Member contents and ids an aggregated event carries (the most recent)
+    COALESCE_KEEP = 16
+    
+    def __init__(self, capacity: int = 100, retention: RetentionPolicy = None,
+                 salience_decay_rate: float = 0.0, max_event_age: Optional[float] = None,
+                 coalesce: bool = False, coalesce_limit: int = 1000):
+        # Entries are (key, -timestamp, -seq, event): the max end is the most
+        # salient, oldest event and the min end the one to evict
+        self._competition_queue = MinMaxHeap()
+        self._submit_seq = itertools.count()
+        # Seqs of entries still competing; heap entries missing here are stale
+        self._live: set = set()
+        self._expiry: deque = deque()  # (submitted_at, seq), oldest first
+        self.salience_decay_rate = salience_decay_rate
+        self.max_event_age = max_event_age
+        self._decay_epoch = clock.now()
+        self.coalesce = coalesce
+        self.coalesce_limit = max(1, coalesce_limit)
+        # (event_type, source_level) -> the queued group
+        self._groups: Dict[tuple, _Group] = {}
         self.current_broadcast: Optional[CognitiveEvent] = None
-        self.broadcast_history: List[CognitiveEvent] = []
-        self._listeners: Dict[str, Callable] = {}
+        self.broadcast_history: List[CognitiveEvent] = make_history(retention, "broadcast_history")
+        self._listeners: Dict[str, _Subscription] = {}
+        # (event_type, source_level) -> matching subscriptions, rebuilt on (un)register
+        self._dispatch_index: Dict[tuple, List[_Subscription]] = {}
+        self.listener_errors: List[Dict] = make_history(retention, "listener_errors")
         self.capacity = capacity
         self.total_events_submitted = 0
         self.total_broadcasts = 0
+        self.total_expired = 0
+        self.total_coalesced = 0
         self.self_referential_broadcasts = 0
     
     def submit(self, event: CognitiveEvent):
@@ -21,28 +183,286 @@ class GlobalWorkspace:
         adjusted_salience = event.salience + 0.05
         if event.is_self_referential:
             adjusted_salience += 0.15
-        heapq.heappush(self._competition_queue, (-adjusted_salience, event.timestamp, event))
-        while len(self._competition_queue) > self.capacity:
-            heapq.heappop(self._competition_queue)
+        now = clock.now()
+        key = adjusted_salience + self.salience_decay_rate * (now - self._decay_epoch)
+        if self.coalesce and self._coalesce(event, key, now):
+            return
+        seq = next(self._submit_seq)
+        entry = (key, -event.timestamp, -seq, event)
+        queue = self._competition_queue
+        if len(self._live) >= self.capacity:
+            self._expire()
+        if len(self._live) < self.capacity:
+            queue.push(entry)
+        else:
+            self._drop_stale_min()
+            evicted = queue.pushpop_min(entry)  # The least salient of queue + entry is dropped
+            if evicted is entry:
+                return
+            self._live.discard(-evicted[2])
+        self._track(seq, now)
+        if self.coalesce:
+            self._groups[(event.event_type, event.source_level)] = _Group(
+                seq, key, event, self.COALESCE_KEEP
+            )
+    
+    def _track(self, seq: int, now: float):
+        self._live.add(seq)
+        if self.max_event_age is not None:
+            self._expiry.append((now, seq))
+    
+    def _coalesce(self, event: CognitiveEvent, key: float, now: float) -> bool:
+        """
+        Merge event into its queued group, if there is one.
+        
+        The group is re-queued as one aggregated event: content is the list
+        of the most recent COALESCE_KEEP member contents, salience is the
+        best member's, and it keeps the best current key. Its age counts
+        from the latest member. Cost is independent of group size.
+        """
+        group_key = (event.event_type, event.source_level)
+        group = self._groups.get(group_key)
+        if group is None or group.seq not in self._live or group.count >= self.coalesce_limit:
+            return False
+        group.add(event)
+        self._live.discard(group.seq)  # The old heap entry is now stale
+        self.total_coalesced += 1
+        aggregated = CognitiveEvent(
+            event_type=event.event_type,
+            content=list(group.contents),
+            source_level=event.source_level,
+            salience=group.salience,
+            timestamp=group.timestamp,
+            metadata={"coalesced": group.count, "event_ids": list(group.ids)}
+        )
+        group.key = max(key, group.key)
+        group.seq = next(self._submit_seq)
+        self._competition_queue.push((group.key, -aggregated.timestamp, -group.seq, aggregated))
+        self._track(group.seq, now)
+        self._compact()
+        return True
+    
+    def effective_salience(self, key: float, now: float = None) -> float:
+        """A queue key's current, decayed salience."""
+        now = clock.now() if now is None else now
+        return key - self.salience_decay_rate * (now - self._decay_epoch)
+    
+    @property
+    def queue_size(self) -> int:
+        """Events still competing (stale entries awaiting removal excluded)."""
+        return len(self._live)
+    
+    # ================================================================
+    # COMPETITION
+    # ================================================================
     
     def compete(self) -> Optional[CognitiveEvent]:
-        if not self._competition_queue:
+        """Broadcast the single most salient event."""
+        winners = self._select_winners(1)
+        if not winners:
             return None
-        neg_salience, timestamp, winner = heapq.heappop(self._competition_queue)
-        self.current_broadcast = winner
-        self.broadcast_history.append(winner)
-        self.total_broadcasts += 1
-        if winner.is_self_referential:
-            self.self_referential_broadcasts += 1
-        for name, callback in self._listeners.items():
+        self._dispatch(winners)
+        return winners[0]
+    
+    def compete_k(self, k: int) -> List[CognitiveEvent]:
+        """
+        Broadcast up to k events, most salient first.
+        
+        Batch listeners get the whole list in one call; other listeners
+        are called once per event, in order.
+        """
+        winners = self._select_winners(k)
+        if winners:
+            self._dispatch(winners)
+        return winners
+    
+    def _subscribers(self, event: CognitiveEvent) -> List[_Subscription]:
+        route = (event.event_type, event.source_level)
+        subscribers = self._dispatch_index.get(route)
+        if subscribers is None:
+            subscribers = [sub for sub in self._listeners.values() if sub.matches(*route)]
+            self._dispatch_index[route] = subscribers
+        return subscribers
+    
+    def _deliveries(self, events: List[CognitiveEvent]) -> List[tuple]:
+        """(subscription, argument, events) for every call a broadcast makes.
+        
+        Plain listeners get one call per matching event, in broadcast order;
+        batch listeners get one call with all of their matching events.
+        """
+        calls = []
+        batches: Dict[str, List[CognitiveEvent]] = {}
+        for event in events:
+            for sub in self._subscribers(event):
+                if sub.min_salience is not None and event.salience < sub.min_salience:
+                    continue
+                if not sub.batch:
+                    calls.append((sub, event, [event]))
+                elif sub.name in batches:
+                    batches[sub.name].append(event)
+                else:
+                    batch = batches[sub.name] = [event]
+                    calls.append((sub, batch, batch))
+        return calls
+    
+    def _dispatch(self, events: List[CognitiveEvent]):
+        if not self._listeners:
+            return
+        for sub, arg, call_events in self._deliveries(events):
+            start = time.perf_counter()
             try:
-                callback(winner)
-            except:
-                pass
-        return winner
+                result = sub.callback(arg)
+                if inspect.iscoroutine(result):
+                    result.close()
+                    raise TypeError("coroutine listeners need compete_async()")
+            except Exception as e:
+                self._listener_failed(sub, call_events, e, time.perf_counter() - start)
+            else:
+                sub.stats.record(time.perf_counter() - start)
+    
+    async def compete_async(self, timeout: Optional[float] = None,
+                            executor=None) -> Optional[CognitiveEvent]:
+        """
+        compete() with listeners dispatched concurrently.
+        
+        Coroutine listeners are awaited on the running loop; plain callables
+        run in executor (the loop's default thread pool when None). Each
+        listener gets its own timeout; failures and timeouts are recorded
+        in listener_errors rather than raised.
+        
+        A timed-out coroutine is cancelled, but a thread cannot be: a sync
+        listener still queued when its timeout fires is skipped, and one
+        already running finishes in the pool after the cycle has moved on,
+        counted as running_late in its stats until it returns.
+        """
+        winners = await self.compete_k_async(1, timeout, executor)
+        return winners[0] if winners else None
+    
+    async def compete_k_async(self, k: int, timeout: Optional[float] = None,
+                              executor=None) -> List[CognitiveEvent]:
+        """compete_k() with the concurrent dispatch of compete_async()."""
+        winners = self._select_winners(k)
+        if winners and self._listeners:
+            per_listener: Dict[str, List[tuple]] = {}
+            for delivery in self._deliveries(winners):
+                per_listener.setdefault(delivery[0].name, []).append(delivery)
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(
+                self._dispatch_async(loop, deliveries, timeout, executor)
+                for deliveries in per_listener.values()
+            ))
+        return winners
+    
+    async def _dispatch_async(self, loop, deliveries: List[tuple],
+                              timeout: Optional[float], executor):
+        """One listener's calls, in order; listeners run concurrently with each other."""
+        for sub, arg, call_events in deliveries:
+            start = time.perf_counter()
+            pool_call = None
+            try:
+                if inspect.iscoroutinefunction(sub.callback):
+                    call = sub.callback(arg)
+                else:
+                    pool_call = _PoolCall(sub, arg)
+                    call = loop.run_in_executor(executor, pool_call.run)
+                await asyncio.wait_for(call, timeout)
+            except asyncio.TimeoutError as e:
+                if pool_call is not None:
+                    pool_call.abandon()
+                self._listener_failed(sub, call_events, e, time.perf_counter() - start,
+                                      timed_out=True)
+            except Exception as e:
+                self._listener_failed(sub, call_events, e, time.perf_counter() - start)
+            else:
+                sub.stats.record(time.perf_counter() - start)
+    
+    def _select_winners(self, k: int) -> List[CognitiveEvent]:
+        self._expire()
+        queue, live = self._competition_queue, self._live
+        winners = []
+        while queue and len(winners) < k:
+            _, _, neg_seq, winner = queue.pop_max()
+            if -neg_seq not in live:
+                continue
+            live.discard(-neg_seq)
+            winners.append(winner)
+            self.broadcast_history.append(winner)
+            self.total_broadcasts += 1
+            if winner.is_self_referential:
+                self.self_referential_broadcasts += 1
+        if winners:
+            self.current_broadcast = winners[0]
+        return winners
+    
+    # ================================================================
+    # EXPIRY
+    # ================================================================
+    
+    def _expire(self):
+        """Retire events older than max_event_age. Each event is retired at most once."""
+        if self.max_event_age is None:
+            return
+        cutoff = clock.now() - self.max_event_age
+        expiry, live = self._expiry, self._live
+        while expiry and expiry[0][0] < cutoff:
+            _, seq = expiry.popleft()
+            if seq in live:
+                live.discard(seq)
+                self.total_expired += 1
+        self._compact()
+        if not live:
+            expiry.clear()
+    
+    def _compact(self):
+        # Stale entries leave the heap when they reach an end; compact if they pile up
+        queue, live = self._competition_queue, self._live
+        if len(queue) > 2 * len(live) + 16:
+            queue.heapify([entry for entry in queue if -entry[2] in live])
+    
+    def _drop_stale_min(self):
+        queue, live = self._competition_queue, self._live
+        while queue and -queue.peek_min()[2] not in live:
+            queue.pop_min()
+    
+    # ================================================================
+    # LISTENERS
+    # ================================================================
+    
+    def _listener_failed(self, sub: _Subscription, events: List[CognitiveEvent],
+                         error: Exception, latency: float, timed_out: bool = False):
+        sub.stats.record(latency, failed=True, timed_out=timed_out)
+        self.listener_errors.append({
+            "listener": sub.name,
+            "event_ids": [event.id for event in events],
+            "error": "timeout" if timed_out else repr(error),
+            "timestamp": clock.now()
+        })
+    
+    def register_listener(self, name: str, callback: Callable,
+                          event_types: Optional[Iterable[CognitiveEventType]] = None,
+                          source_levels: Optional[Iterable[int]] = None,
+                          min_salience: Optional[float] = None, batch: bool = False):
+        """
+        Subscribe callback(event) to broadcasts; it may be a coroutine function.
+        
+        event_types, source_levels and min_salience narrow the subscription
+        (None accepts everything). With batch=True the callback is called once
+        per compete with the list of matching events.
+        """
+        self._listeners[name] = _Subscription(
+            name, callback,
+            frozenset(event_types) if event_types is not None else None,
+            frozenset(source_levels) if source_levels is not None else None,
+            min_salience, batch
+        )
+        self._dispatch_index.clear()
+    
+    def unregister_listener(self, name: str):
+        if self._listeners.pop(name, None) is not None:
+            self._dispatch_index.clear()
     
-    def register_listener(self, name: str, callback: Callable):
-        self._listeners[name] = callback
+    def get_listener_stats(self) -> Dict[str, Dict]:
+        return {name: sub.stats.to_dict() for name, sub in self._listeners.items()}
     
     def get_self_referential_ratio(self) -> float:
         if self.total_broadcasts == 0:
@@ -51,8 +471,11 @@ class GlobalWorkspace:
     
     def get_state_summary(self) -> Dict:
         return {
-            "queue_size": len(self._competition_queue),
+            "queue_size": self.queue_size,
             "total_submitted": self.total_events_submitted,
             "total_broadcasts": self.total_broadcasts,
+            "total_expired": self.total_expired,
+            "total_coalesced": self.total_coalesced,
+            "listener_errors": len(self.listener_errors),
             "self_referential_ratio": self.get_self_referential_ratio()
         }
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+ingest.py — Stream JSONL perceptions through the Strange Loop Engine
+
+Reads one perception dict per line from stdin, files or named pipes,
+drives StrangeLoopEngine with a bounded buffer (a full buffer blocks the
+reader, so a fast producer is slowed to the engine's pace), and writes
+cycle traces or metrics as JSONL on stdout. Throughput goes to stderr.
+
+    tail -f events.jsonl | python -m core.ingest --output metrics
+    python -m core.ingest perceptions.jsonl /tmp/brad.fifo --output traces
+"""
+
+from typing import Dict, Iterator, List, Optional, TextIO
+from .engine import StrangeLoopEngine, TRACE_LEVELS
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+
+_END = object()
+
+
+class PerceptionReader:
+    """
+    Parses JSONL sources on a background thread into a bounded queue.
+
+    Blank lines are skipped; lines that are not JSON objects are counted
+    as rejected and reported on stderr. A source that cannot be read ends
+    the stream: the error is kept in .error and re-raised by the iterators
+    once everything read before it has been consumed.
+    """
+
+    def __init__(self, sources: List[str], buffer_size: int = 1024, stdin: TextIO = None):
+        self.sources = sources or ["-"]
+        self.stdin = stdin or sys.stdin
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, buffer_size))
+        self.lines_read = 0
+        self.rejected = 0
+        self.error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._read_all, daemon=True)
+
+    def start(self) -> "PerceptionReader":
+        self._thread.start()
+        return self
+
+    def _read_all(self):
+        try:
+            for source in self.sources:
+                if source == "-":
+                    self._read(self.stdin, "<stdin>")
+                else:
+                    # Opening a named pipe blocks until a writer connects
+                    with open(source, "r", encoding="utf-8") as f:
+                        self._read(f, source)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._queue.put(_END)
+
+    def _read(self, stream: TextIO, name: str):
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            self.lines_read += 1
+            try:
+                perception = json.loads(line)
+            except ValueError as e:
+                perception = None
+                reason = str(e)
+            else:
+                reason = "not a JSON object"
+            if not isinstance(perception, dict):
+                self.rejected += 1
+                print(f"ingest: {name}:{line_number}: skipped ({reason})", file=sys.stderr)
+                continue
+            self._queue.put(perception)  # Blocks while the buffer is full
+
+    def __iter__(self) -> Iterator[Dict]:
+        for batch in self.batches(1):
+            yield batch[0]
+
+    def batches(self, max_size: int) -> Iterator[List[Dict]]:
+        """
+        Yield perceptions as soon as they arrive: wait for one, then take
+        whatever else is already buffered, up to max_size. A busy stream
+        gets full batches; a slow one is never held back waiting to fill one.
+        """
+        get = self._queue.get
+        while True:
+            item = get()
+            if item is _END:
+                break
+            batch = [item]
+            while len(batch) < max_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _END:
+                    break
+                batch.append(item)
+            yield batch
+            if item is _END:
+                break
+        if self.error is not None:
+            raise self.error
+
+    @property
+    def buffered(self) -> int:
+        return self._queue.qsize()
+
+
+class ThroughputMeter:
+    """Sustained and interval cycles-per-second, reported to stderr."""
+
+    def __init__(self, report_every: float, stream: TextIO = None):
+        self.report_every = report_every
+        self.stream = stream or sys.stderr
+        self.started = time.perf_counter()
+        self._last_report = self.started
+        self._last_cycles = 0
+
+    def tick(self, cycles: int, buffered: int):
+        if self.report_every <= 0:
+            return
+        now = time.perf_counter()
+        if now - self._last_report < self.report_every:
+            return
+        interval_rate = (cycles - self._last_cycles) / (now - self._last_report)
+        print(f"ingest: {cycles:,} cycles | {interval_rate:,.0f}/s now | "
+              f"{self.sustained_rate(cycles, now):,.0f}/s sustained | buffer {buffered}",
+              file=self.stream)
+        self._last_report = now
+        self._last_cycles = cycles
+
+    def sustained_rate(self, cycles: int, now: float = None) -> float:
+        elapsed = (now or time.perf_counter()) - self.started
+        return cycles / elapsed if elapsed > 0 else 0.0
+
+
+def _write(record: Dict, out: TextIO):
+    out.write(json.dumps(record, default=str) + "\n")
+
+
+def ingest(engine: StrangeLoopEngine, reader: PerceptionReader, output: str = "metrics",
+           metrics_every: int = 0, batch_size: int = 64, report_every: float = 5.0,
+           out: TextIO = None) -> Dict:
+    """
+    Drive engine from reader until the sources are exhausted; return a run
+    summary. Perceptions run as soon as they are read, at most batch_size
+    per engine batch, and output is flushed after every batch.
+    """
+    out = out or sys.stdout
+    meter = ThroughputMeter(report_every)
+    start_cycle = engine.cycle_count
+
+    last_emitted = engine.cycle_count
+    for batch in reader.batches(max(1, batch_size)):
+        if output == "traces":
+            for cycle_trace in engine.run(batch, batch_size=len(batch)):
+                _write(cycle_trace, out)
+        else:
+            for _ in engine.run(batch, batch_size=len(batch), traces=False):
+                pass
+            if (output == "metrics" and metrics_every
+                    and engine.cycle_count - last_emitted >= metrics_every):
+                _write(dict(engine.get_consciousness_metrics(), cycle=engine.cycle_count), out)
+                last_emitted = engine.cycle_count
+        out.flush()
+        meter.tick(engine.cycle_count - start_cycle, reader.buffered)
+
+    cycles = engine.cycle_count - start_cycle
+    summary = {
+        "cycles": cycles,
+        "lines_read": reader.lines_read,
+        "rejected": reader.rejected,
+        "seconds": time.perf_counter() - meter.started,
+        "cycles_per_second": meter.sustained_rate(cycles)
+    }
+    if output == "metrics":
+        _write(dict(engine.get_consciousness_metrics(), cycle=engine.cycle_count), out)
+    out.flush()
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m core.ingest",
+        description="Stream JSONL perceptions through the Strange Loop Engine."
+    )
+    parser.add_argument("sources", nargs="*", default=["-"],
+                        help="JSONL files or named pipes; '-' or nothing reads stdin")
+    parser.add_argument("--output", choices=("traces", "metrics", "none"), default="metrics",
+                        help="what to write to stdout (default: final metrics)")
+    parser.add_argument("--metrics-every", type=int, default=0,
+                        help="with --output metrics, also emit metrics every N cycles")
+    parser.add_argument("--trace-level", choices=TRACE_LEVELS, default="full",
+                        help="trace detail for --output traces")
+    parser.add_argument("--trace-sample-every", type=int, default=None)
+    parser.add_argument("--buffer", type=int, default=1024,
+                        help="max perceptions buffered ahead of the engine")
+    parser.add_argument("--batch-size", type=int, default=64,
+                        help="max perceptions per engine batch; smaller batches never wait")
+    parser.add_argument("--history", type=int, default=10000,
+                        help="entries each engine history keeps in memory (traces included)")
+    parser.add_argument("--report-every", type=float, default=5.0,
+                        help="seconds between throughput reports on stderr (0 = off)")
+    args = parser.parse_args(argv)
+
+    # Traces are streamed out, so the engine only needs a bounded window of its histories
+    engine = StrangeLoopEngine({
+        "trace_level": args.trace_level,
+        "trace_sample_every": args.trace_sample_every,
+        "retention": {"max_in_memory": max(1, args.history)}
+    })
+    reader = PerceptionReader(args.sources, args.buffer).start()
+    try:
+        summary = ingest(engine, reader, args.output, args.metrics_every,
+                         args.batch_size, args.report_every)
+    except KeyboardInterrupt:
+        print("ingest: interrupted", file=sys.stderr)
+        return 130
+    except (OSError, UnicodeError) as e:
+        print(f"ingest: {e}", file=sys.stderr)
+        return 1
+    print(f"ingest: {summary['cycles']:,} cycles in {summary['seconds']:.2f}s "
+          f"({summary['cycles_per_second']:,.0f} cycles/s sustained), "
+          f"{summary['rejected']} rejected lines", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
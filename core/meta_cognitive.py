@@ -1,8 +1,9 @@
 """meta_cognitive.py — Level 2: The Watcher"""
 
 from typing import Dict, List
+from .retention import RetentionPolicy, make_history
 from .structures import BlindSpot, CognitiveEvent, CognitiveEventType, LevelCrossing
-import time
+from . import clock
 import math
 
 class MetaPattern:
@@ -19,11 +20,13 @@ class MetaPattern:
         self.confidence = min(0.95, 1 - math.exp(-self.occurrences * 0.3))
 
 class MetaCognitiveLoop:
-    def __init__(self):
+    def __init__(self, retention: RetentionPolicy = None,
+                 calibration_gap_threshold: float = 0.15):
+        self.calibration_gap_threshold = calibration_gap_threshold
         self.detected_patterns: Dict[str, MetaPattern] = {}
         self.blind_spots: Dict[str, BlindSpot] = {}
-        self.performance_history: List[Dict] = []
-        self.restructure_log: List[Dict] = []
+        self.performance_history: List[Dict] = make_history(retention, "performance_history")
+        self.restructure_log: List[Dict] = make_history(retention, "restructure_log")
         self.cycle_count = 0
         self._intervention_count = 0
         self._init_fundamental_blind_spots()
@@ -47,7 +50,7 @@ class MetaCognitiveLoop:
         
         evaluation = {
             "cycle": self.cycle_count,
-            "timestamp": time.time(),
+            "timestamp": clock.now(),
             "assessments": [],
             "detected_patterns": [],
             "blind_spots_active": [
@@ -63,7 +66,7 @@ class MetaCognitiveLoop:
         stated_confidence = self_state["confidence"].get("prediction", 0.5)
         gap = abs(stated_confidence - prediction_accuracy)
         
-        if gap > 0.15:
+        if gap > self.calibration_gap_threshold:
             evaluation["recommended_interventions"].append({
                 "type": "calibrate_confidence",
                 "target_level": 1,
@@ -104,15 +107,15 @@ class MetaCognitiveLoop:
             if domain in self_model.confidence_states:
                 old = self_model.confidence_states[domain]
                 if "reduce" in action:
-                    self_model.confidence_states[domain] = max(0.0, old - magnitude)
+                    self_model.set_confidence(domain, max(0.0, old - magnitude))
                 else:
-                    self_model.confidence_states[domain] = min(1.0, old + magnitude)
+                    self_model.set_confidence(domain, min(1.0, old + magnitude))
                 crossing.causal_chain.append(f"confidence[{domain}] adjusted by {magnitude}")
         
         self.restructure_log.append({
             "cycle": self.cycle_count,
             "intervention": intervention,
-            "timestamp": time.time()
+            "timestamp": clock.now()
         })
         
         return crossing
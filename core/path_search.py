@@ -0,0 +1,220 @@
+"""
+path_search.py — Shortest-path search over the relation graph
+
+Relations are treated as undirected edges, as they always have been in
+WorldModel.find_path. Every search keeps parent pointers instead of
+copying partial paths, so memory stays O(visited nodes).
+
+Weighted searches score an edge by -log(strength × confidence): the
+cheapest path is the most reliable chain of relations. Ties on cost are
+broken by hop count, so unit-reliability graphs still yield the
+shortest hop path.
+"""
+
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from .relation_store import RelationStore
+from .structures import Relation
+import heapq
+import math
+
+
+def relation_cost(rel: Relation) -> float:
+    """Edge cost for weighted search. Non-positive reliability means unusable."""
+    reliability = rel.strength * rel.confidence
+    if reliability <= 0:
+        return math.inf
+    return -math.log(min(1.0, reliability))
+
+
+def _hop_cost(rel: Relation) -> float:
+    return 0.0
+
+
+# ================================================================
+# UNWEIGHTED — bidirectional BFS
+# ================================================================
+
+def bidirectional_bfs(store: RelationStore, source_id: str, target_id: str,
+                      max_depth: int = 5) -> List[str]:
+    """Shortest hop path with at most max_depth relations, or [] if none."""
+    if source_id == target_id:
+        return [source_id]
+
+    forward: Dict[str, Optional[str]] = {source_id: None}
+    backward: Dict[str, Optional[str]] = {target_id: None}
+    forward_frontier = [source_id]
+    backward_frontier = [target_id]
+    hops = 0
+
+    while forward_frontier and backward_frontier and hops < max_depth:
+        # Grow whichever side is cheaper to expand
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meet = _expand_level(store, forward_frontier, forward, backward)
+        else:
+            backward_frontier, meet = _expand_level(store, backward_frontier, backward, forward)
+        hops += 1
+        if meet is not None:
+            return _join(meet, forward, backward)
+
+    return []
+
+
+def _expand_level(store: RelationStore, frontier: List[str],
+                  parents: Dict[str, Optional[str]],
+                  other_parents: Dict[str, Optional[str]]) -> Tuple[List[str], Optional[str]]:
+    """Expand one BFS level. The first node seen by both sides is on a shortest path."""
+    next_frontier = []
+    for current in frontier:
+        for next_id, _ in store.neighbors(current):
+            if next_id in parents:
+                continue
+            parents[next_id] = current
+            if next_id in other_parents:
+                return next_frontier, next_id
+            next_frontier.append(next_id)
+    return next_frontier, None
+
+
+def _join(meet: str, forward: Dict[str, Optional[str]],
+          backward: Dict[str, Optional[str]]) -> List[str]:
+    path = []
+    node = meet
+    while node is not None:
+        path.append(node)
+        node = forward[node]
+    path.reverse()
+    node = backward[meet]
+    while node is not None:
+        path.append(node)
+        node = backward[node]
+    return path
+
+
+# ================================================================
+# WEIGHTED — Dijkstra / A*
+# ================================================================
+
+class _Path:
+    """A found path with the cumulative (cost, hops) label at every node."""
+    __slots__ = ("nodes", "costs")
+
+    def __init__(self, nodes: List[str], costs: List[float]):
+        self.nodes = nodes
+        self.costs = costs
+
+    @property
+    def key(self) -> Tuple[float, int]:
+        return (self.costs[-1], len(self.nodes) - 1)
+
+
+def shortest_weighted(store: RelationStore, source_id: str, target_id: str,
+                      cost: Callable[[Relation], float] = relation_cost,
+                      heuristic: Callable[[str, str], float] = None,
+                      banned_nodes: Set[str] = frozenset(),
+                      banned_edges: Set[Tuple[str, str]] = frozenset(),
+                      max_hops: int = None) -> Optional[_Path]:
+    """
+    Dijkstra's algorithm, or A* when a consistent heuristic is supplied.
+
+    heuristic(node_id, target_id) must be consistent: for every edge u -> v,
+    h(u) <= cost(u, v) + h(v), and h(target) == 0. Settled nodes are never
+    reopened, so a heuristic that is only admissible (never overestimates)
+    can return a longer path than the shortest.
+    max_hops prunes longer paths; it is exact for hop-count search and a
+    search bound (not a constraint solver) for weighted search.
+    """
+    best: Dict[str, Tuple[float, int]] = {source_id: (0.0, 0)}
+    parents: Dict[str, Optional[str]] = {source_id: None}
+    settled: Set[str] = set()
+    h0 = heuristic(source_id, target_id) if heuristic else 0.0
+    heap = [(h0, 0, 0.0, source_id)]
+
+    while heap:
+        _, hops, g, current = heapq.heappop(heap)
+        if current in settled:
+            continue
+        if current == target_id:
+            return _trace(current, parents, best)
+        settled.add(current)
+        if max_hops is not None and hops >= max_hops:
+            continue
+
+        for next_id, rel in store.neighbors(current):
+            if next_id in settled or next_id in banned_nodes:
+                continue
+            if (current, next_id) in banned_edges:
+                continue
+            step = cost(rel)
+            if step == math.inf:
+                continue
+            label = (g + step, hops + 1)
+            if next_id in best and best[next_id] <= label:
+                continue
+            best[next_id] = label
+            parents[next_id] = current
+            f = label[0] + (heuristic(next_id, target_id) if heuristic else 0.0)
+            heapq.heappush(heap, (f, label[1], label[0], next_id))
+
+    return None
+
+
+def _trace(node: str, parents: Dict[str, Optional[str]],
+           best: Dict[str, Tuple[float, int]]) -> _Path:
+    nodes = []
+    while node is not None:
+        nodes.append(node)
+        node = parents[node]
+    nodes.reverse()
+    return _Path(nodes, [best[n][0] for n in nodes])
+
+
+# ================================================================
+# K SHORTEST — Yen's algorithm
+# ================================================================
+
+def k_shortest(store: RelationStore, source_id: str, target_id: str, k: int,
+               cost: Callable[[Relation], float] = relation_cost,
+               max_depth: int = None) -> List[List[str]]:
+    """Up to k loopless paths in increasing (cost, hops) order."""
+    first = shortest_weighted(store, source_id, target_id, cost, max_hops=max_depth)
+    if first is None:
+        return []
+
+    found: List[_Path] = [first]
+    candidates: List[tuple] = []
+    seen = {tuple(first.nodes)}
+    counter = 0
+
+    while len(found) < k:
+        previous = found[-1]
+        for i in range(len(previous.nodes) - 1):
+            spur = previous.nodes[i]
+            root = previous.nodes[:i + 1]
+            banned_edges = {(p.nodes[i], p.nodes[i + 1]) for p in found
+                            if len(p.nodes) > i + 1 and p.nodes[:i + 1] == root}
+            spur_path = shortest_weighted(store, spur, target_id, cost,
+                                          banned_nodes=set(root[:-1]),
+                                          banned_edges=banned_edges,
+                                          max_hops=None if max_depth is None else max_depth - i)
+            if spur_path is None:
+                continue
+            offset = previous.costs[i]
+            candidate = _Path(root[:-1] + spur_path.nodes,
+                              previous.costs[:i] + [offset + c for c in spur_path.costs])
+            nodes = tuple(candidate.nodes)
+            if nodes not in seen:
+                seen.add(nodes)
+                counter += 1
+                heapq.heappush(candidates, (candidate.key, counter, candidate))
+
+        if not candidates:
+            break
+        found.append(heapq.heappop(candidates)[2])
+
+    return [p.nodes for p in found]
+
+
+def k_shortest_hops(store: RelationStore, source_id: str, target_id: str, k: int,
+                    max_depth: int = None) -> List[List[str]]:
+    """Up to k loopless paths in increasing hop order, ignoring edge weights."""
+    return k_shortest(store, source_id, target_id, k, cost=_hop_cost, max_depth=max_depth)
@@ -0,0 +1,109 @@
+"""
+prediction_ledger.py — Id-keyed prediction store with running scores
+
+Predictions stay the plain dicts WorldModel has always produced. The
+ledger adds an id index and keeps resolved/correct counters plus Brier
+and log-loss sums up to date on every resolution, so accuracy queries
+are O(1) no matter how many predictions have been made.
+"""
+
+from typing import Dict, Iterator, List, Optional
+import math
+
+# Probabilities are clipped away from 0 and 1 so log-loss stays finite
+_EPSILON = 1e-15
+
+
+class PredictionLedger:
+    """List-compatible prediction history with O(1) lookup and scoring."""
+
+    def __init__(self):
+        self._order: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
+        self.resolved_count = 0
+        self.correct_count = 0
+        self._brier_sum = 0.0
+        self._log_loss_sum = 0.0
+
+    # ================================================================
+    # LIST-LIKE INTERFACE
+    # ================================================================
+
+    def append(self, prediction: Dict):
+        self._order.append(prediction)
+        self._by_id[prediction["id"]] = prediction
+        if prediction.get("resolved"):
+            self._score(prediction, +1)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._order)
+
+    def __getitem__(self, index):
+        return self._order[index]
+
+    def get(self, prediction_id: str) -> Optional[Dict]:
+        return self._by_id.get(prediction_id)
+
+    # ================================================================
+    # RESOLUTION
+    # ================================================================
+
+    def resolve(self, prediction_id: str, was_correct: bool, resolved_at: float) -> Optional[Dict]:
+        """Mark a prediction resolved. Re-resolving replaces the earlier outcome."""
+        prediction = self._by_id.get(prediction_id)
+        if prediction is None:
+            return None
+        if prediction["resolved"]:
+            self._score(prediction, -1)
+        prediction["resolved"] = True
+        prediction["was_correct"] = was_correct
+        prediction["resolved_at"] = resolved_at
+        self._score(prediction, +1)
+        return prediction
+
+    def _score(self, prediction: Dict, sign: int):
+        outcome = 1.0 if prediction["was_correct"] else 0.0
+        p = min(1.0 - _EPSILON, max(_EPSILON, prediction["confidence"]))
+        self.resolved_count += sign
+        self.correct_count += sign * int(outcome)
+        self._brier_sum += sign * (prediction["confidence"] - outcome) ** 2
+        self._log_loss_sum += sign * -math.log(p if outcome else 1.0 - p)
+
+    # ================================================================
+    # SCORES
+    # ================================================================
+
+    @property
+    def outstanding_count(self) -> int:
+        return len(self._order) - self.resolved_count
+
+    def accuracy(self) -> float:
+        if not self.resolved_count:
+            return 0.5  # No data
+        return self.correct_count / self.resolved_count
+
+    def brier_score(self) -> Optional[float]:
+        """Mean squared error of stated confidence against outcomes (lower is better)."""
+        if not self.resolved_count:
+            return None
+        return self._brier_sum / self.resolved_count
+
+    def log_loss(self) -> Optional[float]:
+        """Mean negative log-likelihood of outcomes (lower is better)."""
+        if not self.resolved_count:
+            return None
+        return self._log_loss_sum / self.resolved_count
+
+    def get_stats(self) -> Dict:
+        return {
+            "total": len(self._order),
+            "resolved": self.resolved_count,
+            "correct": self.correct_count,
+            "outstanding": self.outstanding_count,
+            "accuracy": self.accuracy(),
+            "brier_score": self.brier_score(),
+            "log_loss": self.log_loss()
+        }
@@ -0,0 +1,155 @@
+"""
+priority_queue.py — Double-ended priority queue for bounded competition
+
+A min-max heap: even levels hold subtree minima, odd levels subtree
+maxima, so both the best and the worst entry are reachable in O(1) and
+removable in O(log n). A bounded queue evicts from the low end while
+consumers pop from the high end.
+"""
+
+from typing import Any, Iterator, List
+
+
+def _is_min_level(i: int) -> bool:
+    return (i + 1).bit_length() % 2 == 1
+
+
+class MinMaxHeap:
+    """
+    Entries are compared directly, so they should be tuples whose leading
+    fields are unique (e.g. end with a sequence number before any payload).
+    """
+
+    __slots__ = ("_heap",)
+
+    def __init__(self):
+        self._heap: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Entries in heap order (not sorted)."""
+        return iter(self._heap)
+
+    def clear(self):
+        self._heap.clear()
+
+    def heapify(self, entries: List[Any]):
+        """Replace the contents with entries in O(n), bottom-up."""
+        self._heap = list(entries)
+        for i in reversed(range(len(self._heap) // 2)):
+            self._trickle_down(i)
+
+    # ================================================================
+    # ACCESS
+    # ================================================================
+
+    def push(self, entry: Any):
+        heap = self._heap
+        heap.append(entry)
+        self._bubble_up(len(heap) - 1)
+
+    def pushpop_min(self, entry: Any) -> Any:
+        """Push entry, then pop and return the minimum, in one O(log n) pass."""
+        heap = self._heap
+        if not heap or entry <= heap[0]:
+            return entry
+        evicted = heap[0]
+        heap[0] = entry
+        self._trickle_down(0)
+        return evicted
+
+    def peek_min(self) -> Any:
+        return self._heap[0]
+
+    def peek_max(self) -> Any:
+        return self._heap[self._max_index()]
+
+    def pop_min(self) -> Any:
+        return self._remove(0)
+
+    def pop_max(self) -> Any:
+        return self._remove(self._max_index())
+
+    def _max_index(self) -> int:
+        heap = self._heap
+        n = len(heap)
+        if n == 0:
+            raise IndexError("pop from an empty heap")
+        if n == 1:
+            return 0
+        if n == 2 or heap[1] >= heap[2]:
+            return 1
+        return 2
+
+    def _remove(self, i: int) -> Any:
+        heap = self._heap
+        if not heap:
+            raise IndexError("pop from an empty heap")
+        last = heap.pop()
+        if i == len(heap):
+            return last
+        entry = heap[i]
+        heap[i] = last
+        self._trickle_down(i)
+        return entry
+
+    # ================================================================
+    # HEAP MAINTENANCE
+    # ================================================================
+
+    def _bubble_up(self, i: int):
+        if i == 0:
+            return
+        heap = self._heap
+        parent = (i - 1) >> 1
+        if _is_min_level(i):
+            if heap[i] > heap[parent]:
+                heap[i], heap[parent] = heap[parent], heap[i]
+                self._bubble_up_grand(parent, maximum=True)
+            else:
+                self._bubble_up_grand(i, maximum=False)
+        else:
+            if heap[i] < heap[parent]:
+                heap[i], heap[parent] = heap[parent], heap[i]
+                self._bubble_up_grand(parent, maximum=False)
+            else:
+                self._bubble_up_grand(i, maximum=True)
+
+    def _bubble_up_grand(self, i: int, maximum: bool):
+        heap = self._heap
+        while i > 2:
+            grand = (((i - 1) >> 1) - 1) >> 1
+            if (heap[i] > heap[grand]) if maximum else (heap[i] < heap[grand]):
+                heap[i], heap[grand] = heap[grand], heap[i]
+                i = grand
+            else:
+                return
+
+    def _trickle_down(self, i: int):
+        heap = self._heap
+        n = len(heap)
+        maximum = not _is_min_level(i)
+        while True:
+            first_child = 2 * i + 1
+            if first_child >= n:
+                return
+            # Best among children and grandchildren
+            best = first_child
+            candidates = (first_child + 1, 4 * i + 3, 4 * i + 4, 4 * i + 5, 4 * i + 6)
+            for c in candidates:
+                if c < n and ((heap[c] > heap[best]) if maximum else (heap[c] < heap[best])):
+                    best = c
+            if not ((heap[best] > heap[i]) if maximum else (heap[best] < heap[i])):
+                return
+            heap[i], heap[best] = heap[best], heap[i]
+            if best <= first_child + 1:
+                return  # A child: it sits on the opposite level, nothing below to fix
+            parent = (best - 1) >> 1
+            if (heap[best] < heap[parent]) if maximum else (heap[best] > heap[parent]):
+                heap[best], heap[parent] = heap[parent], heap[best]
+            i = best
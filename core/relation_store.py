@@ -0,0 +1,162 @@
+"""
+relation_store.py — Indexed storage for world-model relations
+
+Relations are kept in insertion order (so the store still reads like the
+list it replaced) and indexed by endpoint and relation type in both
+directions. Neighbor lookups cost O(degree) instead of a scan over
+every relation in the graph.
+"""
+
+from typing import Dict, Iterator, List, Optional
+from .structures import Relation
+
+
+class RelationStore:
+    """
+    Insertion-ordered relation collection with adjacency indexes.
+
+    _outgoing[source_id][relation_type] and _incoming[target_id][relation_type]
+    each map relation id -> Relation.
+    """
+
+    def __init__(self, relations: Optional[List[Relation]] = None):
+        self._relations: Dict[str, Relation] = {}
+        self._outgoing: Dict[str, Dict[str, Dict[str, Relation]]] = {}
+        self._incoming: Dict[str, Dict[str, Dict[str, Relation]]] = {}
+        for relation in relations or []:
+            self.append(relation)
+
+    # ================================================================
+    # LIST-LIKE INTERFACE
+    # ================================================================
+
+    def append(self, relation: Relation):
+        if relation.id in self._relations:
+            self._unlink(self._relations[relation.id])
+        self._relations[relation.id] = relation
+        self._link(self._outgoing, relation.source_id, relation)
+        self._link(self._incoming, relation.target_id, relation)
+
+    def extend(self, relations):
+        """append() for many relations, with the index updates inlined."""
+        by_id, outgoing, incoming = self._relations, self._outgoing, self._incoming
+        for relation in relations:
+            relation_id, relation_type = relation.id, relation.relation_type
+            if relation_id in by_id:
+                self._unlink(by_id[relation_id])
+            by_id[relation_id] = relation
+            for index, entity_id in ((outgoing, relation.source_id),
+                                     (incoming, relation.target_id)):
+                by_type = index.get(entity_id)
+                if by_type is None:
+                    by_type = index[entity_id] = {}
+                bucket = by_type.get(relation_type)
+                if bucket is None:
+                    bucket = by_type[relation_type] = {}
+                bucket[relation_id] = relation
+
+    def __len__(self) -> int:
+        return len(self._relations)
+
+    def __iter__(self) -> Iterator[Relation]:
+        return iter(self._relations.values())
+
+    def __contains__(self, relation: Relation) -> bool:
+        return self._relations.get(relation.id) is relation
+
+    def __getitem__(self, index):
+        return list(self._relations.values())[index]
+
+    def get(self, relation_id: str) -> Optional[Relation]:
+        return self._relations.get(relation_id)
+
+    # ================================================================
+    # INDEXED QUERIES
+    # ================================================================
+
+    def outgoing(self, entity_id: str, relation_type: str = None) -> List[Relation]:
+        return self._collect(self._outgoing, entity_id, relation_type)
+
+    def incoming(self, entity_id: str, relation_type: str = None) -> List[Relation]:
+        return self._collect(self._incoming, entity_id, relation_type)
+
+    def involving(self, entity_id: str, relation_type: str = None) -> List[Relation]:
+        """Relations with entity_id at either end (self-loops appear once)."""
+        results = self.outgoing(entity_id, relation_type)
+        for rel in self.incoming(entity_id, relation_type):
+            if rel.source_id != entity_id:
+                results.append(rel)
+        return results
+
+    def neighbors(self, entity_id: str, relation_type: str = None) -> Iterator[tuple]:
+        """Yield (neighbor_id, relation) pairs, treating every relation as undirected."""
+        for rel in self.involving(entity_id, relation_type):
+            yield (rel.target_id if rel.source_id == entity_id else rel.source_id), rel
+
+    def neighbor_ids(self, entity_id: str, relation_type: str) -> List[str]:
+        """neighbors() ids for one relation type, read straight off the type
+        buckets without building an intermediate relation list."""
+        ids = []
+        by_type = self._outgoing.get(entity_id)
+        if by_type:
+            ids.extend(rel.target_id for rel in by_type.get(relation_type, {}).values())
+        by_type = self._incoming.get(entity_id)
+        if by_type:
+            ids.extend(rel.source_id for rel in by_type.get(relation_type, {}).values()
+                       if rel.source_id != entity_id)
+        return ids
+
+    def degree(self, entity_id: str) -> int:
+        return len(self.involving(entity_id))
+
+    # ================================================================
+    # REMOVAL
+    # ================================================================
+
+    def remove(self, relation_id: str) -> Optional[Relation]:
+        relation = self._relations.pop(relation_id, None)
+        if relation is not None:
+            self._unlink(relation)
+        return relation
+
+    def remove_entity(self, entity_id: str) -> List[Relation]:
+        """Drop every relation touching entity_id. Costs O(degree)."""
+        removed = self.involving(entity_id)
+        for rel in removed:
+            self.remove(rel.id)
+        return removed
+
+    # ================================================================
+    # INDEX MAINTENANCE
+    # ================================================================
+
+    @staticmethod
+    def _link(index: Dict, entity_id: str, relation: Relation):
+        by_type = index.setdefault(entity_id, {})
+        by_type.setdefault(relation.relation_type, {})[relation.id] = relation
+
+    def _unlink(self, relation: Relation):
+        for index, entity_id in ((self._outgoing, relation.source_id),
+                                 (self._incoming, relation.target_id)):
+            by_type = index.get(entity_id)
+            if not by_type:
+                continue
+            bucket = by_type.get(relation.relation_type)
+            if bucket is not None:
+                bucket.pop(relation.id, None)
+                if not bucket:
+                    del by_type[relation.relation_type]
+            if not by_type:
+                del index[entity_id]
+
+    @staticmethod
+    def _collect(index: Dict, entity_id: str, relation_type: str = None) -> List[Relation]:
+        by_type = index.get(entity_id)
+        if not by_type:
+            return []
+        if relation_type:
+            return list(by_type.get(relation_type, {}).values())
+        results = []
+        for bucket in by_type.values():
+            results.extend(bucket.values())
+        return results
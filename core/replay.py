@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+replay.py — Deterministic record and replay of engine runs
+
+A Recorder drives an engine while capturing everything that makes a run
+differ from the next one: the perceptions, the seed of the RNG that
+produced them, the starting id counter, and every clock reading (grouped
+per cycle). It also keeps an 8-byte digest of every cycle trace and the
+final metrics. replay() rebuilds the engine with the recorded clock and
+ids, re-executes the run at full speed, and reports the first cycle
+whose trace differs — so an optimized code path can be checked against
+a recording of the original, and `git bisect run` can find where
+behavior or speed changed.
+
+    python -m core.replay record run.rec --synthetic 10000 --seed 7
+    python -m core.replay record run.rec perceptions.jsonl
+    python -m core.replay verify run.rec
+"""
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+from .engine import StrangeLoopEngine
+from .structures import advance_id_sequence, peek_id_sequence, reset_id_sequence
+from . import clock
+import argparse
+import hashlib
+import json
+import pickle
+import random
+import struct
+import sys
+import time
+import zlib
+
+MAGIC = b"BRADREC\x00"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sH")
+DIGEST_SIZE = 8
+
+
+class RecordingError(ValueError):
+    """The file is not a recording this version can read."""
+
+
+def _digest(trace: Optional[Dict]) -> bytes:
+    return hashlib.blake2b(pickle.dumps(trace, protocol=pickle.HIGHEST_PROTOCOL),
+                           digest_size=DIGEST_SIZE).digest()
+
+
+# ================================================================
+# RECORDING
+# ================================================================
+
+@dataclass
+class Recording:
+    """
+    One recorded run. boundaries[0] is where engine construction's clock
+    readings start, boundaries[i] where cycle i's start, and the last
+    entry is the total number of readings.
+    """
+    config: Dict
+    seed: int
+    start_id: int
+    perceptions: List[bytes] = field(default_factory=list)  # Pickled, as passed to step()
+    clock: array = field(default_factory=lambda: array('d'))
+    boundaries: array = field(default_factory=lambda: array('Q'))
+    digests: bytes = b""
+    metrics: Dict = field(default_factory=dict)
+
+    @property
+    def cycles(self) -> int:
+        return len(self.perceptions)
+
+    def save(self, path: str) -> int:
+        payload = zlib.compress(pickle.dumps(self.__dict__, protocol=pickle.HIGHEST_PROTOCOL))
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+            f.write(payload)
+            return f.tell()
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise RecordingError(f"{path}: truncated recording header")
+            magic, version = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise RecordingError(f"{path}: not an engine recording")
+            if version != FORMAT_VERSION:
+                raise RecordingError(f"{path}: unsupported recording version {version}")
+            return cls(**pickle.loads(zlib.decompress(f.read())))
+
+
+class Recorder:
+    """
+    Builds an engine and records a run of it.
+
+    While the recorder is open its clock is installed process-wide, so
+    record one run at a time. Only cycles driven through step() are
+    recorded; calls made on the engine between them are not. Use rng to
+    generate perceptions so the seed reproduces them.
+    """
+
+    def __init__(self, config: Dict = None, seed: int = None,
+                 engine_class=StrangeLoopEngine):
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self._clock = clock.RecordingClock()
+        self._previous_clock = clock.set_source(self._clock)
+        self._boundaries = array('Q', [0])
+        self._perceptions: List[bytes] = []
+        self._digests = bytearray()
+        self.start_id = peek_id_sequence()
+        self.engine = engine_class(config)
+        self.recording: Optional[Recording] = None
+
+    def step(self, perception: Dict = None) -> Optional[Dict]:
+        # Pickled up front: the engine may share (and later mutate) parts of it
+        self._perceptions.append(pickle.dumps(perception, protocol=pickle.HIGHEST_PROTOCOL))
+        self._boundaries.append(len(self._clock))
+        trace = self.engine.step(perception)
+        self._digests += _digest(trace)
+        return trace
+
+    def run(self, perceptions: Iterable[Optional[Dict]]):
+        for perception in perceptions:
+            self.step(perception)
+
+    def close(self) -> Recording:
+        """Stop recording, restore the clock and return the recording."""
+        if self.recording is None:
+            clock.set_source(self._previous_clock)
+            self._boundaries.append(len(self._clock))
+            self.recording = Recording(
+                config=self.engine.config,
+                seed=self.seed,
+                start_id=self.start_id,
+                perceptions=self._perceptions,
+                clock=self._clock.readings,
+                boundaries=self._boundaries,
+                digests=bytes(self._digests),
+                metrics=self.engine.get_consciousness_metrics()
+            )
+        return self.recording
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ================================================================
+# REPLAY
+# ================================================================
+
+def replay(recording: Recording, engine_class=StrangeLoopEngine, verify: bool = True) -> Dict:
+    """
+    Re-execute recording and compare it with the original.
+
+    Returns the cycle count, wall time and rate, the first cycle (1-based)
+    whose trace differs or None, whether the final metrics match, and how
+    many clock reads ran past what the recording held for their cycle (a
+    sign the code path changed). verify=False skips trace digests.
+    """
+    next_id = peek_id_sequence()
+    replay_clock = clock.ReplayClock(recording.clock, recording.boundaries)
+    replay_clock.seek(0)
+    reset_id_sequence(recording.start_id)
+    first_divergence = None
+    try:
+        with clock.use(replay_clock):
+            engine = engine_class(recording.config)
+            digests = recording.digests
+            start = time.perf_counter()
+            for cycle, perception in enumerate(recording.perceptions, 1):
+                replay_clock.seek(cycle)
+                trace = engine.step(pickle.loads(perception))
+                if verify and first_divergence is None:
+                    offset = (cycle - 1) * DIGEST_SIZE
+                    if _digest(trace) != digests[offset:offset + DIGEST_SIZE]:
+                        first_divergence = cycle
+            seconds = time.perf_counter() - start
+            metrics = engine.get_consciousness_metrics()
+    finally:
+        # Never reissue ids the rest of the process already handed out
+        advance_id_sequence(next_id)
+
+    metrics_match = metrics == recording.metrics
+    return {
+        "cycles": recording.cycles,
+        "seconds": round(seconds, 4),
+        "cycles_per_second": round(recording.cycles / seconds, 1) if seconds > 0 else None,
+        "first_divergence": first_divergence,
+        "metrics_match": metrics_match,
+        "clock_overruns": replay_clock.overruns,
+        "identical": metrics_match and first_divergence is None and replay_clock.overruns == 0
+    }
+
+
+# ================================================================
+# COMMAND LINE
+# ================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m core.replay",
+        description="Record an engine run, or replay a recording and verify it."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_cmd = commands.add_parser("record", help="record a run")
+    record_cmd.add_argument("output", help="recording file to write")
+    record_cmd.add_argument("sources", nargs="*",
+                            help="JSONL perception files or pipes ('-' for stdin)")
+    record_cmd.add_argument("--synthetic", type=int, default=0, metavar="CYCLES",
+                            help="record CYCLES seeded synthetic perceptions instead")
+    record_cmd.add_argument("--seed", type=int, default=None)
+    record_cmd.add_argument("--config", type=json.loads, default={},
+                            help="engine config as JSON")
+
+    verify_cmd = commands.add_parser("verify", help="replay a recording and compare")
+    verify_cmd.add_argument("recording")
+    verify_cmd.add_argument("--no-verify", action="store_true",
+                            help="only time the replay, skip trace comparison")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        with Recorder(args.config, args.seed) as recorder:
+            if args.synthetic:
+                from .sweep import synthetic_perceptions
+                recorder.run(synthetic_perceptions(args.synthetic, recorder.seed))
+            else:
+                from .ingest import PerceptionReader
+                recorder.run(PerceptionReader(args.sources or ["-"]).start())
+        recording = recorder.close()
+        size = recording.save(args.output)
+        print(f"replay: recorded {recording.cycles:,} cycles, {len(recording.clock):,} clock "
+              f"readings, seed {recording.seed} ({size:,} bytes)", file=sys.stderr)
+        return 0
+
+    result = replay(Recording.load(args.recording), verify=not args.no_verify)
+    print(json.dumps(result))
+    return 0 if result["identical"] or args.no_verify else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
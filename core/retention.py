@@ -0,0 +1,196 @@
+"""
+retention.py — Bounded, spill-to-disk history for long-running engines
+
+Histories such as cognitive_trace or broadcast_history keep their most
+recent entries in a ring buffer. Older entries are either dropped or
+appended, in compressed batches, to an on-disk segment file where they
+stay readable through iteration. len() always counts every entry ever
+appended, so aggregates derived from history lengths stay exact.
+
+Segment files are named after their history, so an engine restored from
+a snapshot with the same spill_dir picks up the segments written before
+it instead of leaving them behind.
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+import gzip
+import itertools
+import os
+import pickle
+
+
+class BoundedHistory:
+    """
+    A list-like append-only history with a bounded in-memory window.
+
+    Indexing and slicing use positions in the full history; positions
+    that have been spilled are read back from disk. Slices are clipped to
+    the positions still retained, as if the dropped ones (no spill file)
+    had been deleted from the front of a list; an integer index into them
+    raises IndexError.
+    """
+
+    def __init__(self, max_in_memory: int, spill_path: Optional[str] = None,
+                 spill_batch: int = 1000):
+        self._recent: deque = deque()
+        self.max_in_memory = max_in_memory
+        self.spill_path = spill_path
+        self.spill_batch = spill_batch
+        self._pending: List[Any] = []
+        self._total = 0
+        self._on_disk = 0
+        self._dropped = 0
+        # Byte length of the segment this history owns; 0 until its first
+        # flush, which overwrites whatever an earlier run left there
+        self._segment_bytes = 0
+
+    def append(self, entry: Any):
+        self._recent.append(entry)
+        self._total += 1
+        if len(self._recent) > self.max_in_memory:
+            evicted = self._recent.popleft()
+            if self.spill_path:
+                self._pending.append(evicted)
+                if len(self._pending) >= self.spill_batch:
+                    self.flush()
+            else:
+                self._dropped += 1
+
+    def flush(self):
+        """Write pending evicted entries to the segment file as one gzip member."""
+        if not self._pending:
+            return
+        with gzip.open(self.spill_path, "ab" if self._segment_bytes else "wb") as f:
+            for entry in self._pending:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._on_disk += len(self._pending)
+        self._pending = []
+        self._segment_bytes = os.path.getsize(self.spill_path)
+
+    def segment(self) -> tuple:
+        """(entries, bytes) written to the segment file so far."""
+        return self._on_disk, self._segment_bytes
+
+    # ================================================================
+    # READ ACCESS
+    # ================================================================
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __bool__(self) -> bool:
+        return self._total > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        """Every retained entry, oldest first: disk, pending, then memory."""
+        return itertools.chain(self.iter_spilled(), list(self._pending), list(self._recent))
+
+    def iter_spilled(self) -> Iterator[Any]:
+        if not self.spill_path or not self._on_disk:
+            return
+        with gzip.open(self.spill_path, "rb") as f:
+            for _ in range(self._on_disk):
+                yield pickle.load(f)
+
+    def recent(self) -> List[Any]:
+        """Entries still held in memory, oldest first."""
+        return list(self._recent)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            positions = _retained(range(*index.indices(self._total)), self._dropped)
+            if positions and positions.step > 0 and positions[0] >= self._memory_start:
+                start = positions[0] - self._memory_start
+                return list(itertools.islice(self._recent, start,
+                                             positions[-1] - self._memory_start + 1,
+                                             positions.step))
+            return [self[i] for i in positions]
+        if index < 0:
+            index += self._total
+        if not 0 <= index < self._total:
+            raise IndexError("history index out of range")
+        if index >= self._memory_start:
+            return self._recent[index - self._memory_start]
+        if index < self._dropped:
+            raise IndexError("history entry was dropped by the retention policy")
+        offset = index - self._dropped
+        if offset >= self._on_disk:
+            return self._pending[offset - self._on_disk]
+        return next(itertools.islice(self.iter_spilled(), offset, None))
+
+    def restore(self, entries: List[Any], total: int, segment: tuple = (0, 0)):
+        """Refill an empty history with its last entries and its full length.
+
+        segment is what segment() returned when the entries were saved
+        (after a flush). If the segment file still holds that much it is
+        reattached, cut back to that length; otherwise it is deleted.
+        Positions before the restored entries that are not on disk count
+        as dropped.
+        """
+        spilled, size = segment
+        if self.spill_path and os.path.exists(self.spill_path):
+            if spilled and os.path.getsize(self.spill_path) >= size:
+                with open(self.spill_path, "r+b") as f:
+                    f.truncate(size)
+                self._on_disk = self._total = spilled
+                self._segment_bytes = size
+            else:
+                os.remove(self.spill_path)
+        for entry in entries:
+            self.append(entry)
+        self._dropped += total - self._total
+        self._total = total
+
+    @property
+    def _memory_start(self) -> int:
+        return self._total - len(self._recent)
+
+    def get_stats(self) -> Dict:
+        return {
+            "total": self._total,
+            "in_memory": len(self._recent),
+            "on_disk": self._on_disk + len(self._pending),
+            "dropped": self._dropped
+        }
+
+
+def _retained(positions: range, dropped: int) -> range:
+    """positions without those below dropped."""
+    if positions.step > 0:
+        if positions.start < dropped:
+            skip = -(-(dropped - positions.start) // positions.step)
+            return range(positions.start + skip * positions.step, positions.stop, positions.step)
+        return positions
+    return range(positions.start, max(positions.stop, dropped - 1), positions.step)
+
+
+class RetentionPolicy:
+    """
+    How much history each component keeps in memory, and where the rest goes.
+
+    With spill_dir unset, entries beyond max_in_memory are dropped (only
+    counted); otherwise each history spills to <spill_dir>/<prefix><name>.seg.gz.
+    The names are stable across restarts, so give each engine sharing a
+    spill_dir its own prefix.
+    """
+
+    def __init__(self, max_in_memory: int = 10000, spill_dir: Optional[str] = None,
+                 spill_batch: int = 1000, prefix: str = ""):
+        self.max_in_memory = max_in_memory
+        self.spill_dir = spill_dir
+        self.spill_batch = spill_batch
+        self.prefix = prefix
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def history(self, name: str) -> BoundedHistory:
+        spill_path = None
+        if self.spill_dir:
+            spill_path = os.path.join(self.spill_dir, f"{self.prefix}{name}.seg.gz")
+        return BoundedHistory(self.max_in_memory, spill_path, self.spill_batch)
+
+
+def make_history(policy: Optional[RetentionPolicy], name: str):
+    """A bounded history under policy, or a plain unbounded list without one."""
+    return policy.history(name) if policy is not None else []
@@ -3,6 +3,7 @@ self_model.py — Level 1: The Self
 """
 
 from typing import Dict, List, Optional
+from .retention import RetentionPolicy, make_history
 from .structures import (
     Goal, GoalPriority, FailureRecord, Belief, ReasoningMode,
     CognitiveEvent, CognitiveEventType, LevelCrossing
@@ -10,13 +11,13 @@ from .structures import (
 import time
 
 class ReasoningPattern:
-    def __init__(self, name: str, description: str):
+    def __init__(self, name: str, description: str, contexts=None):
         self.name = name
         self.description = description
         self.usage_count = 0
         self.success_count = 0
         self.failure_count = 0
-        self.contexts = []
+        self.contexts = contexts if contexts is not None else []
     
     @property
     def effectiveness(self) -> float:
@@ -33,7 +34,10 @@ class ReasoningPattern:
             self.contexts.append(context)
 
 class SelfModel:
-    def __init__(self):
+    def __init__(self, retention: RetentionPolicy = None,
+                 system2_complexity_threshold: float = 0.7):
+        self._retention = retention
+        self.system2_complexity_threshold = system2_complexity_threshold
         self.goals: Dict[str, Goal] = {}
         self.reasoning_patterns: Dict[str, ReasoningPattern] = {}
         self.confidence_states: Dict[str, float] = {
@@ -43,11 +47,12 @@ class SelfModel:
             "self_knowledge": 0.3,
             "meta_cognition": 0.2
         }
-        self.failure_history: List[FailureRecord] = []
+        self.failure_history: List[FailureRecord] = make_history(retention, "failure_history")
         self.current_mode: ReasoningMode = ReasoningMode.SYSTEM_1
         self.current_strategy: str = "explore"
         self.identity_beliefs: Dict[str, Belief] = {}
-        self.level_crossings: List[LevelCrossing] = []
+        self.level_crossings: List[LevelCrossing] = make_history(retention, "level_crossings")
+        self._strange_crossing_count = 0
         self._cognitive_load: float = 0.0
         self._emotional_valence: float = 0.0
         self._curiosity_drive: float = 0.7
@@ -62,7 +67,9 @@ class SelfModel:
             ("self_referential", "Reasoning about own reasoning"),
         ]
         for name, desc in defaults:
-            self.reasoning_patterns[name] = ReasoningPattern(name, desc)
+            self.reasoning_patterns[name] = ReasoningPattern(
+                name, desc, make_history(self._retention, f"pattern_{name}_contexts")
+            )
     
     def _init_meta_goals(self):
         meta_goal = Goal(
@@ -89,7 +96,7 @@ class SelfModel:
         
         if self_referential:
             self.current_mode = ReasoningMode.STRANGE_LOOP
-        elif complexity > 0.7:
+        elif complexity > self.system2_complexity_threshold:
             self.current_mode = ReasoningMode.SYSTEM_2
         else:
             self.current_mode = ReasoningMode.SYSTEM_1
@@ -100,7 +107,11 @@ class SelfModel:
         self.failure_history.append(failure)
         if failure.failure_type in self.confidence_states:
             current = self.confidence_states[failure.failure_type]
-            self.confidence_states[failure.failure_type] = current * (1 - failure.severity * 0.3)
+            self.set_confidence(failure.failure_type, current * (1 - failure.severity * 0.3))
+    
+    def set_confidence(self, domain: str, value: float):
+        """The single write path for confidence_states, so every change can be journaled."""
+        self.confidence_states[domain] = value
     
     def intervene_on_world(self, world_model, intervention: Dict) -> LevelCrossing:
         crossing = LevelCrossing(
@@ -121,6 +132,8 @@ class SelfModel:
             crossing.causal_chain.append(f"self_update: {intervention['self_update']}")
         
         self.level_crossings.append(crossing)
+        if crossing.is_strange:
+            self._strange_crossing_count += 1
         return crossing
     
     def reflect_on_self(self) -> CognitiveEvent:
@@ -156,6 +169,6 @@ class SelfModel:
                 for name, p in self.reasoning_patterns.items()
             },
             "level_crossings": len(self.level_crossings),
-            "strange_crossings": sum(1 for lc in self.level_crossings if lc.is_strange),
+            "strange_crossings": self._strange_crossing_count,
             "cognitive_load": self._cognitive_load
         }
@@ -0,0 +1,312 @@
+"""
+snapshot.py — Binary save and restore of a whole engine
+
+A snapshot is an 8-byte magic, a format version, and one pickle of plain
+data. Large collections (entities, relations, beliefs) are stored as
+columns of primitives rather than one object per row, so a million
+entities pickle and unpickle as a handful of lists and float arrays.
+
+Listeners are not saved; the loading engine registers its own. Histories
+keep what the saving engine held in memory, and their full lengths, so
+metrics derived from them carry over. Spilled entries are not copied: a
+loading engine with the same spill_dir reattaches their segment files.
+"""
+
+from dataclasses import fields
+from typing import Dict, List, Optional
+from .structures import (
+    Belief, BlindSpot, Goal, Relation, ReasoningMode,
+    advance_id_sequence, peek_id_sequence
+)
+from .entity_store import export_columns, import_columns
+from .meta_cognitive import MetaPattern
+from .retention import BoundedHistory, make_history
+from .self_model import ReasoningPattern
+from array import array
+from contextlib import contextmanager
+import gc
+import itertools
+import os
+import pickle
+import struct
+
+MAGIC = b"BRADSNAP"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sH")
+
+
+class SnapshotError(ValueError):
+    """The file is not a snapshot this version can read."""
+
+
+# ================================================================
+# COLUMN ENCODING
+# ================================================================
+
+def _to_columns(cls, objects: List) -> tuple:
+    """Dataclass instances as one list per field, in field order."""
+    names = [f.name for f in fields(cls)]
+    return tuple([getattr(obj, name) for obj in objects] for name in names)
+
+
+def _from_columns(cls, columns: tuple) -> List:
+    return [cls(*row) for row in zip(*columns)]
+
+
+def _relation_columns(relations) -> Dict:
+    relations = list(relations)
+    return {
+        "ids": [r.id for r in relations],
+        "sources": [r.source_id for r in relations],
+        "targets": [r.target_id for r in relations],
+        "types": [r.relation_type for r in relations],
+        "strength": array('d', [r.strength for r in relations]),
+        "confidence": array('d', [r.confidence for r in relations]),
+        "bidirectional": bytes(bool(r.bidirectional) for r in relations),
+        "metadata": {r.id: r.metadata for r in relations if r.metadata}
+    }
+
+
+def _relations_from_columns(columns: Dict) -> List[Relation]:
+    metadata = columns["metadata"]
+    return [
+        Relation(relation_id, source, target, relation_type, strength, confidence,
+                 bool(bidirectional), metadata.get(relation_id) or {})
+        for relation_id, source, target, relation_type, strength, confidence, bidirectional
+        in zip(columns["ids"], columns["sources"], columns["targets"], columns["types"],
+               columns["strength"], columns["confidence"], columns["bidirectional"])
+    ]
+
+
+@contextmanager
+def _gc_paused():
+    """Snapshots allocate millions of objects that all survive; the cyclic
+    collector would rescan them repeatedly for nothing."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _history(history) -> tuple:
+    if isinstance(history, BoundedHistory):
+        history.flush()  # So the segment ends right where the saved entries start
+        return history.recent(), len(history), history.segment()
+    return list(history), len(history)
+
+
+def _restore_history(history, saved: tuple):
+    entries, total = saved[:2]
+    if isinstance(history, BoundedHistory):
+        history.restore(entries, total, *saved[2:])
+    else:
+        history[:] = entries
+
+
+# ================================================================
+# SAVE
+# ================================================================
+
+def save(engine, path: str, extra: Optional[Dict] = None) -> int:
+    """
+    Write engine to path (atomically, via a temporary file). Returns bytes
+    written. extra is stored alongside and returned by read_state().
+    """
+    with _gc_paused():
+        return _save(engine, path, extra)
+
+
+def _save(engine, path: str, extra: Optional[Dict]) -> int:
+    world, self_model = engine.world_model, engine.self_model
+    meta, workspace = engine.meta_cognitive, engine.workspace
+    state = {
+        "config": engine.config,
+        "extra": extra or {},
+        "next_id": peek_id_sequence(),
+        "engine": {
+            "cycle_count": engine.cycle_count,
+            "total_strange_loops": engine.total_strange_loops,
+            "crossing_count": engine._crossing_count,
+            "strange_crossing_count": engine._strange_crossing_count,
+            "mode_counts": dict(engine._mode_counts),
+            "trace_level": engine.trace_level,
+            "trace_sample_every": engine.trace_sample_every,
+            "cognitive_trace": _history(engine.cognitive_trace),
+            "level_crossing_history": _history(engine._level_crossing_history)
+        },
+        "world": {
+            "entities": export_columns(world.entities),
+            "relations": _relation_columns(world.relations),
+            "beliefs": _to_columns(Belief, list(world.beliefs.values())),
+            "predictions": list(world.predictions),
+            "attention": world.attention_weights.items(),
+            "cycle_count": world.cycle_count,
+            "version": world.version
+        },
+        "self": {
+            "goals": _to_columns(Goal, list(self_model.goals.values())),
+            "patterns": [
+                (p.name, p.description, p.usage_count, p.success_count, p.failure_count,
+                 _history(p.contexts))
+                for p in self_model.reasoning_patterns.values()
+            ],
+            "confidence_states": dict(self_model.confidence_states),
+            "identity_beliefs": _to_columns(Belief, list(self_model.identity_beliefs.values())),
+            "current_mode": self_model.current_mode.value,
+            "current_strategy": self_model.current_strategy,
+            "failure_history": _history(self_model.failure_history),
+            "level_crossings": _history(self_model.level_crossings),
+            "strange_crossing_count": self_model._strange_crossing_count,
+            "cognitive_load": self_model._cognitive_load,
+            "emotional_valence": self_model._emotional_valence,
+            "curiosity_drive": self_model._curiosity_drive
+        },
+        "meta": {
+            "detected_patterns": [
+                (p.name, p.description, p.pattern_type, p.confidence, p.occurrences,
+                 p.is_problematic)
+                for p in meta.detected_patterns.values()
+            ],
+            "blind_spots": _to_columns(BlindSpot, list(meta.blind_spots.values())),
+            "performance_history": _history(meta.performance_history),
+            "restructure_log": _history(meta.restructure_log),
+            "cycle_count": meta.cycle_count,
+            "intervention_count": meta._intervention_count
+        },
+        "workspace": {
+            "queue": list(workspace._competition_queue),
+            "next_seq": next(workspace._submit_seq),
+            "live": workspace._live,
+            "expiry": list(workspace._expiry),
+            "decay_epoch": workspace._decay_epoch,
+            "groups": workspace._groups,
+            "current_broadcast": workspace.current_broadcast,
+            "broadcast_history": _history(workspace.broadcast_history),
+            "counters": {
+                "total_events_submitted": workspace.total_events_submitted,
+                "total_broadcasts": workspace.total_broadcasts,
+                "total_expired": workspace.total_expired,
+                "total_coalesced": workspace.total_coalesced,
+                "self_referential_broadcasts": workspace.self_referential_broadcasts
+            }
+        }
+    }
+    # Reading the sequence consumed a number; put it back
+    workspace._submit_seq = itertools.count(state["workspace"]["next_seq"])
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+# ================================================================
+# LOAD
+# ================================================================
+
+def read_state(path: str) -> Dict:
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise SnapshotError(f"{path}: truncated snapshot header")
+        magic, version = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise SnapshotError(f"{path}: not an engine snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"{path}: unsupported snapshot version {version}")
+        return pickle.load(f)
+
+
+def load(path: str, engine_class, config: Optional[Dict] = None):
+    """Build an engine_class from a snapshot. config, if given, replaces the saved one."""
+    with _gc_paused():
+        state = read_state(path)
+        engine = engine_class(config if config is not None else state["config"])
+        restore(engine, state)
+    return engine
+
+
+def restore(engine, state: Dict):
+    """Overwrite a freshly constructed engine with saved state."""
+    advance_id_sequence(state["next_id"])
+
+    saved = state["engine"]
+    engine.cycle_count = saved["cycle_count"]
+    engine.total_strange_loops = saved["total_strange_loops"]
+    engine._crossing_count = saved["crossing_count"]
+    engine._strange_crossing_count = saved["strange_crossing_count"]
+    engine._mode_counts = dict(saved["mode_counts"])
+    engine.set_trace_level(saved["trace_level"], saved["trace_sample_every"])
+    _restore_history(engine.cognitive_trace, saved["cognitive_trace"])
+    _restore_history(engine._level_crossing_history, saved["level_crossing_history"])
+
+    world, saved = engine.world_model, state["world"]
+    import_columns(saved["entities"], world.entities)
+    world._self_entity = world.entities["SELF"]
+    world.relations.extend(_relations_from_columns(saved["relations"]))
+    world.beliefs = {b.id: b for b in _from_columns(Belief, saved["beliefs"])}
+    world._contested_count = sum(1 for b in world.beliefs.values() if b.is_contested)
+    for prediction in saved["predictions"]:
+        world.predictions.append(prediction)
+    world.attention_weights.update(dict(saved["attention"]))
+    world.cycle_count = saved["cycle_count"]
+    world.version = saved["version"]
+    world._summary = None
+
+    self_model, saved = engine.self_model, state["self"]
+    self_model.goals = {g.id: g for g in _from_columns(Goal, saved["goals"])}
+    defaults, self_model.reasoning_patterns = self_model.reasoning_patterns, {}
+    for name, description, usage, successes, failures, contexts in saved["patterns"]:
+        pattern = defaults.get(name) or ReasoningPattern(
+            name, description, make_history(self_model._retention, f"pattern_{name}_contexts")
+        )
+        pattern.usage_count, pattern.success_count, pattern.failure_count = (
+            usage, successes, failures
+        )
+        _restore_history(pattern.contexts, contexts)
+        self_model.reasoning_patterns[name] = pattern
+    self_model.confidence_states = dict(saved["confidence_states"])
+    self_model.identity_beliefs = {
+        b.id: b for b in _from_columns(Belief, saved["identity_beliefs"])
+    }
+    self_model.current_mode = ReasoningMode(saved["current_mode"])
+    self_model.current_strategy = saved["current_strategy"]
+    _restore_history(self_model.failure_history, saved["failure_history"])
+    _restore_history(self_model.level_crossings, saved["level_crossings"])
+    self_model._strange_crossing_count = saved["strange_crossing_count"]
+    self_model._cognitive_load = saved["cognitive_load"]
+    self_model._emotional_valence = saved["emotional_valence"]
+    self_model._curiosity_drive = saved["curiosity_drive"]
+
+    meta, saved = engine.meta_cognitive, state["meta"]
+    meta.detected_patterns = {}
+    for name, description, pattern_type, confidence, occurrences, problematic in (
+            saved["detected_patterns"]):
+        pattern = MetaPattern(name, description, pattern_type)
+        pattern.confidence, pattern.occurrences = confidence, occurrences
+        pattern.is_problematic = problematic
+        meta.detected_patterns[name] = pattern
+    meta.blind_spots = {b.id: b for b in _from_columns(BlindSpot, saved["blind_spots"])}
+    _restore_history(meta.performance_history, saved["performance_history"])
+    _restore_history(meta.restructure_log, saved["restructure_log"])
+    meta.cycle_count = saved["cycle_count"]
+    meta._intervention_count = saved["intervention_count"]
+
+    workspace, saved = engine.workspace, state["workspace"]
+    workspace._competition_queue.heapify(saved["queue"])
+    workspace._submit_seq = itertools.count(saved["next_seq"])
+    workspace._live = set(saved["live"])
+    workspace._expiry.clear()
+    workspace._expiry.extend(saved["expiry"])
+    workspace._decay_epoch = saved["decay_epoch"]
+    workspace._groups = saved["groups"]
+    workspace.current_broadcast = saved["current_broadcast"]
+    _restore_history(workspace.broadcast_history, saved["broadcast_history"])
+    for name, value in saved["counters"].items():
+        setattr(workspace, name, value)
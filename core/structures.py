@@ -5,11 +5,64 @@ These are the fundamental building blocks: entities, relations, goals, beliefs,
 and the cognitive records that flow through the tangled hierarchy.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
 from typing import Any, Optional
-import time
-import uuid
+from . import clock
+import itertools
+
+
+# ============================================================================
+# ALLOCATION HELPERS
+# ============================================================================
+
+_id_sequence = itertools.count(1)
+
+
+def new_id() -> str:
+    """Next object id from a process-wide monotonic counter.
+    
+    Same 8-hex-digit shape as the truncated uuid4 strings it replaces,
+    but collision-free for the first 4 billion objects (truncated uuid4
+    collides around 65k).
+    """
+    return format(next(_id_sequence), "08x")
+
+
+def peek_id_sequence() -> int:
+    """The number the next new_id() will use, without consuming it."""
+    global _id_sequence
+    value = next(_id_sequence)
+    _id_sequence = itertools.count(value)
+    return value
+
+
+def advance_id_sequence(value: int):
+    """Continue new_id() from at least value, so restored ids are never reissued."""
+    global _id_sequence
+    _id_sequence = itertools.count(max(value, peek_id_sequence()))
+
+
+def reset_id_sequence(value: int):
+    """Continue new_id() from exactly value, even backwards. Only for replaying
+    a recorded run, which must reissue the ids it was recorded with."""
+    global _id_sequence
+    _id_sequence = itertools.count(value)
+
+
+def _slotted(cls):
+    """Rebuild a dataclass with __slots__ so instances carry no __dict__.
+    (dataclass(slots=True) does the same but needs Python 3.10.)"""
+    names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
 
 
 # ============================================================================
@@ -58,34 +111,36 @@ class CognitiveEventType(Enum):
 # CORE STRUCTURES
 # ============================================================================
 
+@_slotted
 @dataclass
 class Entity:
     """A thing in the world model — object, agent, concept, or self-reference."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=new_id)
     name: str = ""
     entity_type: str = "object"  # object, agent, concept, self
     properties: dict = field(default_factory=dict)
     confidence: float = 1.0
-    created_at: float = field(default_factory=time.time)
-    last_updated: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=clock.now)
+    last_updated: float = field(default_factory=clock.now)
     provenance: str = ""  # Where did this knowledge come from?
     
     def update(self, properties: dict, confidence: float = None):
         self.properties.update(properties)
         if confidence is not None:
             self.confidence = confidence
-        self.last_updated = time.time()
+        self.last_updated = clock.now()
     
     def decay(self, rate: float = 0.01):
         """Confidence decays over time — memories fade."""
-        age = time.time() - self.last_updated
+        age = clock.now() - self.last_updated
         self.confidence = max(0.0, self.confidence - (rate * age))
 
 
-@dataclass 
+@_slotted
+@dataclass
 class Relation:
     """A relationship between entities in the world model."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=new_id)
     source_id: str = ""
     target_id: str = ""
     relation_type: str = ""  # "causes", "is_part_of", "contradicts", "enables"
@@ -95,17 +150,18 @@ class Relation:
     metadata: dict = field(default_factory=dict)
 
 
+@_slotted
 @dataclass
 class Belief:
     """An explicit belief held by the system — queryable and revisable."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=new_id)
     content: str = ""
     confidence: float = 0.5
     supporting_evidence: list = field(default_factory=list)
     contradicting_evidence: list = field(default_factory=list)
     derived_from: list = field(default_factory=list)  # Other belief IDs
     revision_count: int = 0
-    created_at: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=clock.now)
     
     @property
     def is_contested(self) -> bool:
@@ -117,45 +173,48 @@ class Belief:
         self.supporting_evidence.append(f"Revision #{self.revision_count}: {reason}")
 
 
+@_slotted
 @dataclass
 class Goal:
     """A goal with priority, progress tracking, and self-referential awareness."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=new_id)
     description: str = ""
     priority: GoalPriority = GoalPriority.MEDIUM
     progress: float = 0.0  # 0.0 to 1.0
     subgoals: list = field(default_factory=list)  # Goal IDs
     parent_goal: Optional[str] = None
     is_meta: bool = False  # Meta-goals are about the system's own cognition
-    created_at: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=clock.now)
     
     @property
     def is_complete(self) -> bool:
         return self.progress >= 1.0
 
 
+@_slotted
 @dataclass
 class FailureRecord:
     """A record of cognitive failure — fuel for self-improvement."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=new_id)
     description: str = ""
     failure_type: str = ""  # "reasoning_error", "prediction_miss", "overconfidence"
     context: dict = field(default_factory=dict)
     lesson_learned: str = ""
     severity: float = 0.5  # 0.0 to 1.0
-    timestamp: float = field(default_factory=time.time)
+    timestamp: float = field(default_factory=clock.now)
     has_been_integrated: bool = False  # Has the self-model adapted?
 
 
+@_slotted
 @dataclass
 class CognitiveEvent:
     """An event in the global workspace — competing for broadcast attention."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=new_id)
     event_type: CognitiveEventType = CognitiveEventType.PERCEPTION
     content: Any = None
     source_level: int = 0  # 0=perception, 1=world, 2=self, 3=meta
     salience: float = 0.5  # How important — drives competition for attention
-    timestamp: float = field(default_factory=time.time)
+    timestamp: float = field(default_factory=clock.now)
     metadata: dict = field(default_factory=dict)
     
     @property
@@ -169,6 +228,7 @@ class CognitiveEvent:
         )
 
 
+@_slotted
 @dataclass
 class BlindSpot:
     """A Gödelian blind spot — something the system can detect but can't resolve.
@@ -177,10 +237,10 @@ class BlindSpot:
     the system is powerful enough to formulate statements about itself
     that it cannot prove or disprove within its own framework.
     """
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=new_id)
     description: str = ""
     domain: str = ""  # What area of cognition is affected
-    detected_at: float = field(default_factory=time.time)
+    detected_at: float = field(default_factory=clock.now)
     detection_method: str = ""  # How was this blind spot found?
     attempts_to_resolve: int = 0
     is_fundamental: bool = False  # True = Gödelian, can never be resolved internally
@@ -193,6 +253,7 @@ class BlindSpot:
         return self.attempts_to_resolve > 3  # Heuristic: maybe we learn eventually
 
 
+@_slotted
 @dataclass
 class LevelCrossing:
     """Records when information crosses levels in the tangled hierarchy.
@@ -200,13 +261,13 @@ class LevelCrossing:
     This is THE strange loop — the moment when a higher level 
     reaches down and modifies a lower level that produced it.
     """
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=new_id)
     from_level: int = 0
     to_level: int = 0
     direction: str = "upward"  # "upward" = normal, "downward" = the strange part
     content: str = ""
     causal_chain: list = field(default_factory=list)
-    timestamp: float = field(default_factory=time.time)
+    timestamp: float = field(default_factory=clock.now)
     
     @property
     def is_strange(self) -> bool:
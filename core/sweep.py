@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+sweep.py — Parameter sweeps across a process pool
+
+Every grid point (times every seed) is an independent StrangeLoopEngine
+built from the base config plus that point's overrides. Workers run N
+cycles of seeded synthetic perceptions with tracing off and return one
+metrics row each; the rows are merged into a single table in grid order.
+
+    python -m core.sweep --param system2_complexity_threshold=0.5:0.9:10 \\
+        --param meta_every=1,3,5 --cycles 5000 --seeds 3 --format csv
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+from .engine import StrangeLoopEngine
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+
+def synthetic_perceptions(cycles: int, seed: int) -> Iterator[Dict]:
+    """A reproducible perception stream with mixed complexity and self-reference."""
+    rng = random.Random(seed)
+    for i in range(cycles):
+        yield {
+            "description": f"synthetic {i}",
+            "about_self": rng.random() < 0.2,
+            "complexity": rng.random(),
+            "novelty": rng.random(),
+            "salience": rng.uniform(0.2, 0.9)
+        }
+
+
+def _flatten(metrics: Dict) -> Dict:
+    row = {}
+    for key, value in metrics.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                row[f"{key}.{sub_key}"] = sub_value
+        else:
+            row[key] = value
+    return row
+
+
+def run_point(task: tuple) -> Dict:
+    """Worker: run one (point, seed) and return its metrics row."""
+    index, params, cycles, seed, base_config = task
+    config = dict(base_config)
+    config.update(params)
+    config["trace_level"] = "off"
+    engine = StrangeLoopEngine(config)
+    start = time.perf_counter()
+    metrics = engine.simulate(synthetic_perceptions(cycles, seed))
+    row = {"point": index, "seed": seed}
+    row.update(params)
+    row.update(_flatten(metrics))
+    row["seconds"] = round(time.perf_counter() - start, 4)
+    return row
+
+
+def grid(params: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of parameter values, in declaration order."""
+    names = list(params)
+    return [dict(zip(names, values)) for values in itertools.product(*params.values())]
+
+
+def sweep(points: List[Dict[str, Any]], cycles: int, seeds: int = 1,
+          workers: Optional[int] = None, base_config: Dict = None) -> List[Dict]:
+    """
+    Run every point under seeds 0..seeds-1 and return the merged rows.
+
+    workers=1 runs in-process; otherwise a ProcessPoolExecutor with
+    workers processes (default: every core) shares the tasks.
+    """
+    base_config = base_config or {}
+    tasks = [(index, point, cycles, seed, base_config)
+             for index, point in enumerate(points) for seed in range(seeds)]
+    if workers == 1 or len(tasks) <= 1:
+        return [run_point(task) for task in tasks]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() keeps task order, so rows come back in grid order
+        return list(pool.map(run_point, tasks, chunksize=chunksize))
+
+
+def write_table(rows: List[Dict], out: TextIO, fmt: str = "jsonl"):
+    if fmt == "csv":
+        fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+        writer = csv.DictWriter(out, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            out.write(json.dumps(row) + "\n")
+
+
+# ================================================================
+# COMMAND LINE
+# ================================================================
+
+def _parse_value(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def parse_param(spec: str) -> tuple:
+    """NAME=v1,v2,... or NAME=start:stop:count (count evenly spaced values)."""
+    name, sep, values = spec.partition("=")
+    if not sep or not name or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUES, got {spec!r}")
+    parts = values.split(":")
+    if len(parts) == 3:
+        start, stop, count = float(parts[0]), float(parts[1]), int(parts[2])
+        if count < 2:
+            return name, [start]
+        step = (stop - start) / (count - 1)
+        return name, [round(start + i * step, 10) for i in range(count)]
+    return name, [_parse_value(v) for v in values.split(",")]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m core.sweep",
+        description="Sweep StrangeLoopEngine config values across a process pool."
+    )
+    parser.add_argument("--param", type=parse_param, action="append", default=[],
+                        metavar="NAME=VALUES",
+                        help="config key and values: a,b,c or start:stop:count (repeatable)")
+    parser.add_argument("--cycles", type=int, default=1000, help="cycles per engine")
+    parser.add_argument("--seeds", type=int, default=1, help="perception seeds per point")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--config", type=json.loads, default={},
+                        help="base engine config as JSON")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--output", default="-", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    points = grid(dict(args.param))
+    start = time.perf_counter()
+    rows = sweep(points, args.cycles, args.seeds, args.workers, args.config)
+    elapsed = time.perf_counter() - start
+
+    if args.output == "-":
+        write_table(rows, sys.stdout, args.format)
+    else:
+        with open(args.output, "w", newline="") as f:
+            write_table(rows, f, args.format)
+    print(f"sweep: {len(points)} points x {args.seeds} seeds x {args.cycles:,} cycles "
+          f"in {elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
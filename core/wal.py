@@ -0,0 +1,409 @@
+"""
+wal.py — Write-ahead log and crash recovery for a running engine
+
+A Journal appends every WorldModel / SelfModel mutation, and every
+cognitive cycle, to <directory>/journal.wal as it happens. Each record
+carries a log sequence number (LSN), the id counter at the time of the
+call, and the call itself, so replaying it rebuilds the same state with
+the same ids.
+
+Every checkpoint_every records the journal writes a snapshot to
+<directory>/checkpoint.snap, tagged with the LSN it covers, and
+truncates the log. Recovery loads that checkpoint and replays only the
+tail written after it, so restart time is bounded by checkpoint_every
+rather than by uptime.
+
+A cycle is journaled as a begin and an end record. Calls the engine's
+own cycle code makes are covered by those; calls made in between — by
+workspace listeners during the broadcast, or by other coroutines and
+listener threads while an async step awaits them — are journaled as
+records of their own, in the order they ran, and replayed between the
+two.
+
+Only calls through the journaled methods are recorded. Code that edits
+model attributes directly (e.g. confidence_states[domain] = x) bypasses
+the log; use the setters.
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+from .engine import StrangeLoopEngine
+from .structures import advance_id_sequence, peek_id_sequence
+from . import clock, snapshot
+import io
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+LOG_NAME = "journal.wal"
+CHECKPOINT_NAME = "checkpoint.snap"
+
+# lsn, body length, crc32 of body
+_FRAME = struct.Struct("<QII")
+
+WORLD_MUTATORS = (
+    "add_entity", "update_entity", "remove_entity", "decay_all",
+    "add_relation", "add_belief", "add_beliefs", "revise_belief",
+    "make_prediction", "resolve_prediction", "update_self",
+    "set_attention", "set_attention_many", "decay_attention", "process_perception"
+)
+SELF_MUTATORS = (
+    "add_goal", "record_failure", "set_confidence", "intervene_on_world",
+    "select_reasoning_mode", "reflect_on_self"
+)
+
+# Record targets -> engine attribute
+_COMPONENTS = {
+    "engine": None,
+    "world": "world_model",
+    "self": "self_model",
+    "meta": "meta_cognitive",
+    "workspace": "workspace"
+}
+
+
+class WALError(ValueError):
+    """The log cannot be replayed against this engine."""
+
+
+# ================================================================
+# RECORD ENCODING
+# ================================================================
+
+def _component(engine, token: str):
+    attribute = _COMPONENTS.get(token, "")
+    if attribute == "":
+        raise WALError(f"unknown journal target: {token}")
+    return engine if attribute is None else getattr(engine, attribute)
+
+
+class _Pickler(pickle.Pickler):
+    """Engine components are written as references, not copied into every record."""
+
+    def __init__(self, file, tokens: Dict[int, str]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._tokens = tokens
+
+    def persistent_id(self, obj):
+        return self._tokens.get(id(obj))
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, engine):
+        super().__init__(file)
+        self._engine = engine
+
+    def persistent_load(self, token):
+        return _component(self._engine, token)
+
+
+def read_records(path: str) -> Tuple[list, int]:
+    """
+    Every intact (lsn, body) frame in the log, and the byte length they
+    cover. Reading stops at the first torn or corrupt frame — what a
+    crash mid-write leaves behind.
+    """
+    records, valid = [], 0
+    if not os.path.exists(path):
+        return records, valid
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(_FRAME.size)
+            if len(header) < _FRAME.size:
+                break
+            lsn, length, crc = _FRAME.unpack(header)
+            body = f.read(length)
+            if len(body) < length or zlib.crc32(body) != crc:
+                break
+            records.append((lsn, body))
+            valid = f.tell()
+    return records, valid
+
+
+def _pin(method: str, args: tuple, kwargs: Dict) -> Tuple[tuple, Dict]:
+    """Fix arguments that would otherwise differ on replay."""
+    if method == "decay_all":
+        if args and args[0] is None:
+            args = (clock.now(),) + args[1:]
+        elif not args and kwargs.get("now") is None:
+            kwargs = dict(kwargs, now=clock.now())
+    elif method == "add_beliefs":
+        args = (list(args[0]),) + args[1:]
+    return args, kwargs
+
+
+# ================================================================
+# JOURNAL
+# ================================================================
+
+class Journal:
+    """
+    Journals an engine's mutations to a directory.
+
+    Calls nested inside a journaled call (the entity added by
+    process_perception, the world update made by intervene_on_world, the
+    engine's own work in _begin_cycle and _end_cycle) are covered by the
+    outer record and not logged again. Nesting is tracked per thread, so
+    a listener running in a pool is journaled like any other caller.
+    fsync=True syncs every record to disk; otherwise each record is only
+    flushed to the OS, which survives a process crash but not a power
+    loss.
+    """
+
+    def __init__(self, engine, directory: str, checkpoint_every: int = 10000,
+                 fsync: bool = False, lsn: int = 0, checkpoint: bool = True):
+        self.engine = engine
+        self.directory = directory
+        self.log_path = os.path.join(directory, LOG_NAME)
+        self.checkpoint_path = os.path.join(directory, CHECKPOINT_NAME)
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.fsync = fsync
+        self.lsn = lsn
+        self.checkpoint_lsn = lsn
+        self.records_since_checkpoint = 0
+        self.total_records = 0
+        self.total_checkpoints = 0
+        self.replayed = 0
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._open_cycles = []
+        self._tokens = {id(_component(engine, token)): token for token in _COMPONENTS}
+        self._wrapped = []
+
+        os.makedirs(directory, exist_ok=True)
+        self._log = open(self.log_path, "ab")
+        self._wrap()
+        if checkpoint:
+            self.checkpoint()
+
+    # ================================================================
+    # WRAPPING
+    # ================================================================
+
+    def _wrap(self):
+        engine = self.engine
+        for target, component, names in (("world", engine.world_model, WORLD_MUTATORS),
+                                         ("self", engine.self_model, SELF_MUTATORS)):
+            for name in names:
+                self._install(component, name, self._journaled(target, name, getattr(component, name)))
+        self._install(engine, "_begin_cycle", self._journaled_begin(engine._begin_cycle))
+        self._install(engine, "_end_cycle", self._journaled_end(engine._end_cycle))
+
+    @property
+    def _depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    @_depth.setter
+    def _depth(self, depth: int):
+        self._local.depth = depth
+
+    def _install(self, obj, name: str, wrapper: Callable):
+        setattr(obj, name, wrapper)
+        self._wrapped.append((obj, name))
+
+    def _journaled(self, target: str, name: str, method: Callable) -> Callable:
+        def journaled(*args, **kwargs):
+            if self._depth:
+                return method(*args, **kwargs)
+            args, kwargs = _pin(name, args, kwargs)
+            # Encoded before the call: the arguments as they were passed
+            body = self._encode(target, name, args, kwargs)
+            self._depth += 1
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                self._depth -= 1
+            self._append(body)
+            return result
+        return journaled
+
+    def _journaled_begin(self, begin_cycle: Callable) -> Callable:
+        """Journaling is suspended only while the engine's own cycle code runs,
+        so whatever listeners do during the broadcast is journaled too."""
+        def journaled(perception: Dict = None):
+            if self._depth:
+                return begin_cycle(perception)
+            body = self._encode("engine", "begin_cycle", (perception,), {})
+            self._depth += 1
+            try:
+                cycle = begin_cycle(perception)
+            finally:
+                self._depth -= 1
+            with self._lock:
+                self._open_cycles.append((cycle, self.lsn + 1))
+                self._append(body)
+            return cycle
+        return journaled
+
+    def _journaled_end(self, end_cycle: Callable) -> Callable:
+        def journaled(cycle, broadcasts, update_self: bool = True):
+            begin_lsn = next((lsn for c, lsn in self._open_cycles if c is cycle), None)
+            if self._depth or begin_lsn is None:
+                return end_cycle(cycle, broadcasts, update_self)
+            body = self._encode("engine", "end_cycle", (begin_lsn,), {})
+            self._depth += 1
+            try:
+                cycle_trace = end_cycle(cycle, broadcasts, update_self=False)
+            finally:
+                self._depth -= 1
+                self._open_cycles = [entry for entry in self._open_cycles if entry[0] is not cycle]
+            self._append(body)
+            # Journaled on its own, so run()'s once-per-batch update replays as it ran
+            if update_self:
+                self.engine._update_self_representation(cycle.mode)
+            return cycle_trace
+        return journaled
+
+    def detach(self):
+        """Stop journaling: restore the original methods and close the log."""
+        for obj, name in reversed(self._wrapped):
+            delattr(obj, name)
+        self._wrapped = []
+        if not self._log.closed:
+            self._log.close()
+
+    # ================================================================
+    # WRITING
+    # ================================================================
+
+    def _encode(self, target: str, name: str, args: tuple, kwargs: Dict) -> bytes:
+        buffer = io.BytesIO()
+        _Pickler(buffer, self._tokens).dump((peek_id_sequence(), target, name, args, kwargs))
+        return buffer.getvalue()
+
+    def _append(self, body: bytes):
+        with self._lock:
+            self.lsn += 1
+            self._log.write(_FRAME.pack(self.lsn, len(body), zlib.crc32(body)))
+            self._log.write(body)
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+            self.total_records += 1
+            self.records_since_checkpoint += 1
+            # Never mid-cycle: the snapshot would hold half a cycle
+            if (self.records_since_checkpoint >= self.checkpoint_every
+                    and not self._depth and not self._open_cycles):
+                self.checkpoint()
+
+    def checkpoint(self) -> int:
+        """Snapshot the engine at the current LSN and truncate the log. Returns
+        the snapshot size in bytes.
+
+        The snapshot replaces the old one atomically before the log is cut,
+        so a crash in between leaves records the checkpoint already covers;
+        recovery skips them by LSN.
+        """
+        size = snapshot.save(self.engine, self.checkpoint_path, extra={"lsn": self.lsn})
+        if self.fsync:
+            _fsync_path(self.checkpoint_path)
+        self._log.close()
+        self._log = open(self.log_path, "wb")
+        self.checkpoint_lsn = self.lsn
+        self.records_since_checkpoint = 0
+        self.total_checkpoints += 1
+        return size
+
+    def get_stats(self) -> Dict:
+        return {
+            "lsn": self.lsn,
+            "checkpoint_lsn": self.checkpoint_lsn,
+            "records_since_checkpoint": self.records_since_checkpoint,
+            "total_records": self.total_records,
+            "total_checkpoints": self.total_checkpoints,
+            "log_bytes": self._log.tell() if not self._log.closed else 0
+        }
+
+
+def _fsync_path(path: str):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# ================================================================
+# RECOVERY
+# ================================================================
+
+def _apply(engine, lsn: int, body: bytes, open_cycles: Dict):
+    next_id, target, name, args, kwargs = _Unpickler(io.BytesIO(body), engine).load()
+    advance_id_sequence(next_id)
+    if target != "engine":
+        getattr(_component(engine, target), name)(*args, **kwargs)
+    elif name == "begin_cycle":
+        # Winners are chosen as soon as a cycle begins; listener records follow
+        cycle = engine._begin_cycle(*args)
+        open_cycles[lsn] = (cycle, engine._broadcast())
+    elif name == "end_cycle":
+        if args[0] not in open_cycles:
+            raise WALError(f"end of a cycle that never began (LSN {args[0]})")
+        engine._end_cycle(*open_cycles.pop(args[0]), update_self=False)
+    else:
+        raise WALError(f"unknown journal record: {name}")
+
+
+def replay(engine, path: str, after: int = 0) -> Tuple[int, int]:
+    """
+    Apply every intact record with an LSN above after and cut any torn
+    tail off the log. Returns (last LSN seen, records applied). A cycle
+    the crash cut short is ended, so recovery starts between cycles.
+    """
+    records, valid = read_records(path)
+    lsn, applied = after, 0
+    open_cycles: Dict[int, tuple] = {}
+    for record_lsn, body in records:
+        if record_lsn > after:
+            _apply(engine, record_lsn, body, open_cycles)
+            lsn, applied = record_lsn, applied + 1
+    for cycle, broadcasts in open_cycles.values():
+        engine._end_cycle(cycle, broadcasts, update_self=False)
+    if os.path.exists(path) and os.path.getsize(path) > valid:
+        with open(path, "r+b") as f:
+            f.truncate(valid)
+    return lsn, applied
+
+
+def attach(engine, directory: str, **options) -> Journal:
+    """
+    Start journaling engine into directory, discarding any earlier log
+    there. Writes an initial checkpoint so state built before attaching
+    is recoverable. options are passed to Journal.
+    """
+    os.makedirs(directory, exist_ok=True)
+    open(os.path.join(directory, LOG_NAME), "wb").close()
+    engine.journal = Journal(engine, directory, **options)
+    return engine.journal
+
+
+def recover(directory: str, config: Optional[Dict] = None,
+            engine_class=StrangeLoopEngine, **options):
+    """
+    Rebuild the engine journaled in directory and keep journaling it.
+
+    Loads the last checkpoint (config, if given, replaces the saved one),
+    replays the log tail after it, and drops any torn final record. With
+    nothing in directory this is a fresh engine_class(config). Journal
+    options (checkpoint_every, fsync) apply to the resumed journal, which
+    is available as engine.journal.
+    """
+    checkpoint_path = os.path.join(directory, CHECKPOINT_NAME)
+    log_path = os.path.join(directory, LOG_NAME)
+
+    if os.path.exists(checkpoint_path):
+        with snapshot._gc_paused():
+            state = snapshot.read_state(checkpoint_path)
+            engine = engine_class(config if config is not None else state["config"])
+            snapshot.restore(engine, state)
+        lsn = state.get("extra", {}).get("lsn", 0)
+    else:
+        engine, lsn = engine_class(config), 0
+
+    lsn, replayed = replay(engine, log_path, after=lsn)
+
+    # Fold whatever was replayed into a new checkpoint so the next restart starts there
+    engine.journal = Journal(engine, directory, lsn=lsn, checkpoint=replayed > 0, **options)
+    engine.journal.replayed = replayed
+    return engine
@@ -10,12 +10,16 @@ The critical property: the world model contains a representation
 of the AGENT ITSELF as an entity. This is the seed of self-reference.
 """
 
-from typing import List, Optional, Dict, Tuple
+from typing import Callable, Iterable, List, Optional, Dict, Tuple
 from .structures import (
     Entity, Relation, Belief, CognitiveEvent, 
     CognitiveEventType, ConfidenceLevel
 )
-import time
+from .relation_store import RelationStore
+from .prediction_ledger import PredictionLedger
+from .attention import AttentionIndex
+from . import clock, entity_store
+from . import path_search
 
 
 class WorldModel:
@@ -25,19 +29,33 @@ class WorldModel:
     Maintains a knowledge graph of entities and relations,
     makes predictions, and critically — contains a representation
     of the agent itself as an entity within the world.
+    
+    storage="columnar" keeps entities in a ColumnarEntityStore; lookups
+    then return EntityView handles instead of the Entity objects added.
     """
     
-    def __init__(self):
-        self.entities: Dict[str, Entity] = {}
-        self.relations: List[Relation] = []
+    def __init__(self, storage: str = "dict"):
+        if storage == "columnar":
+            self.entities = entity_store.ColumnarEntityStore()
+        elif storage == "dict":
+            self.entities: Dict[str, Entity] = {}
+        else:
+            raise ValueError(f"Unknown entity storage: {storage}")
+        self.relations: RelationStore = RelationStore()
         self.beliefs: Dict[str, Belief] = {}
-        self.predictions: List[Dict] = []
-        self.attention_weights: Dict[str, float] = {}  # What to focus on
+        self.predictions: PredictionLedger = PredictionLedger()
+        self.attention_weights: AttentionIndex = AttentionIndex()  # What to focus on
         self.cycle_count: int = 0
         
+        # Bumped on every mutation the summary snapshot reflects; get_state_summary caches against it
+        self.version: int = 0
+        self._contested_count: int = 0
+        self._summary: Optional[Dict] = None
+        self._summary_version: int = -1
+        
         # THE SEED OF SELF-REFERENCE
         # The agent exists as an entity in its own world model
-        self._self_entity = Entity(
+        self.entities["SELF"] = Entity(
             id="SELF",
             name="self",
             entity_type="self",
@@ -51,7 +69,7 @@ class WorldModel:
             confidence=1.0,
             provenance="intrinsic"
         )
-        self.entities["SELF"] = self._self_entity
+        self._self_entity = self.entities["SELF"]
     
     # ================================================================
     # ENTITY OPERATIONS
@@ -61,6 +79,7 @@ class WorldModel:
         """Add an entity to the world model."""
         self.entities[entity.id] = entity
         self.attention_weights[entity.id] = entity.confidence
+        self.version += 1
         return entity.id
     
     def get_entity(self, entity_id: str) -> Optional[Entity]:
@@ -70,12 +89,47 @@ class WorldModel:
         """Update an entity's properties."""
         if entity_id in self.entities:
             self.entities[entity_id].update(properties, confidence)
+            self.version += 1
     
     def remove_entity(self, entity_id: str):
         if entity_id != "SELF":  # Can't remove yourself
             self.entities.pop(entity_id, None)
-            self.relations = [r for r in self.relations 
-                            if r.source_id != entity_id and r.target_id != entity_id]
+            self.attention_weights.pop(entity_id, None)
+            self.relations.remove_entity(entity_id)
+            self.version += 1
+    
+    def decay_all(self, now: float = None, rate: float = 0.01,
+                  threshold: float = None, prune: bool = False) -> List[str]:
+        """Fade every entity's confidence at once — Entity.decay as column arithmetic.
+        
+        Returns the ids that fell below threshold (SELF is never reported);
+        with prune=True those entities are also removed.
+        """
+        if now is None:
+            now = clock.now()
+        if isinstance(self.entities, entity_store.ColumnarEntityStore):
+            ids = list(self.entities.ids())
+            confidence = self.entities.decay(now, rate)
+        else:
+            ids = list(self.entities)
+            entities = list(self.entities.values())
+            confidence = entity_store.decay_columns(
+                [e.confidence for e in entities],
+                [e.last_updated for e in entities],
+                now, rate
+            )
+            for entity, value in zip(entities, entity_store.to_list(confidence)):
+                entity.confidence = value
+        self.version += 1
+        
+        if threshold is None:
+            return []
+        faded = [ids[i] for i in entity_store.rows_below(confidence, threshold)
+                 if ids[i] != "SELF"]
+        if prune:
+            for entity_id in faded:
+                self.remove_entity(entity_id)
+        return faded
     
     # ================================================================
     # RELATION OPERATIONS
@@ -83,35 +137,34 @@ class WorldModel:
     
     def add_relation(self, relation: Relation) -> str:
         self.relations.append(relation)
+        self.version += 1
         return relation.id
     
     def get_relations(self, entity_id: str, relation_type: str = None) -> List[Relation]:
         """Get all relations involving an entity."""
-        results = [r for r in self.relations 
-                   if r.source_id == entity_id or r.target_id == entity_id]
-        if relation_type:
-            results = [r for r in results if r.relation_type == relation_type]
-        return results
+        return self.relations.involving(entity_id, relation_type)
     
     def find_path(self, source_id: str, target_id: str, max_depth: int = 5) -> List[str]:
-        """Find a path between two entities through the relation graph."""
-        visited = set()
-        queue = [(source_id, [source_id])]
-        
-        while queue:
-            current, path = queue.pop(0)
-            if current == target_id:
-                return path
-            if current in visited or len(path) > max_depth:
-                continue
-            visited.add(current)
-            
-            for rel in self.get_relations(current):
-                next_id = rel.target_id if rel.source_id == current else rel.source_id
-                if next_id not in visited:
-                    queue.append((next_id, path + [next_id]))
-        
-        return []  # No path found
+        """Find a shortest path between two entities through the relation graph."""
+        return path_search.bidirectional_bfs(self.relations, source_id, target_id, max_depth)
+    
+    def find_weighted_path(self, source_id: str, target_id: str,
+                           heuristic: Callable[[str, str], float] = None) -> List[str]:
+        """Find the most reliable path, weighting relations by strength × confidence.
+        Runs A* when a consistent heuristic is given, Dijkstra otherwise."""
+        path = path_search.shortest_weighted(
+            self.relations, source_id, target_id, heuristic=heuristic
+        )
+        return path.nodes if path else []
+    
+    def find_k_paths(self, source_id: str, target_id: str, k: int = 3,
+                     weighted: bool = True, max_depth: int = None) -> List[List[str]]:
+        """Find up to k alternative loopless paths, best first."""
+        if weighted:
+            return path_search.k_shortest(self.relations, source_id, target_id, k,
+                                          max_depth=max_depth)
+        return path_search.k_shortest_hops(self.relations, source_id, target_id, k,
+                                           max_depth=max_depth)
     
     # ================================================================
     # BELIEF OPERATIONS  
@@ -119,33 +172,69 @@ class WorldModel:
     
     def add_belief(self, belief: Belief) -> str:
         # Check for contradictions with existing beliefs
-        contradictions = self._find_contradictions(belief)
-        if contradictions:
-            belief.contradicting_evidence.extend(
-                [f"Contradicts belief: {b.id}" for b in contradictions]
-            )
-        self.beliefs[belief.id] = belief
+        self._mark_contradictions(belief)
+        self._store_belief(belief)
         return belief.id
     
+    def add_beliefs(self, beliefs: Iterable[Belief]) -> List[str]:
+        """Bulk-load beliefs in one pass. Each belief is checked against the
+        beliefs already held and those earlier in the batch, as add_belief would,
+        but contradictions are read straight off the relation index and the
+        contested counter and version are updated once for the whole batch."""
+        held = self.beliefs
+        neighbor_ids = self.relations.neighbor_ids
+        contested = 0
+        ids = []
+        for belief in beliefs:
+            belief_id = belief.id
+            others = [other_id for other_id in neighbor_ids(belief_id, "contradicts")
+                      if other_id in held]
+            if others:
+                belief.contradicting_evidence.extend(
+                    [f"Contradicts belief: {other_id}" for other_id in others]
+                )
+            previous = held.get(belief_id)
+            if previous is not None and previous.is_contested:
+                contested -= 1
+            if belief.is_contested:
+                contested += 1
+            held[belief_id] = belief
+            ids.append(belief_id)
+        if ids:
+            self._contested_count += contested
+            self.version += 1
+        return ids
+    
     def revise_belief(self, belief_id: str, new_confidence: float, reason: str):
         if belief_id in self.beliefs:
             self.beliefs[belief_id].revise(new_confidence, reason)
+            self.version += 1
     
     def get_contested_beliefs(self) -> List[Belief]:
         """Return beliefs that have contradicting evidence."""
         return [b for b in self.beliefs.values() if b.is_contested]
     
+    def _store_belief(self, belief: Belief):
+        previous = self.beliefs.get(belief.id)
+        if previous is not None and previous.is_contested:
+            self._contested_count -= 1
+        if belief.is_contested:
+            self._contested_count += 1
+        self.beliefs[belief.id] = belief
+        self.version += 1
+    
     def _find_contradictions(self, new_belief: Belief) -> List[Belief]:
-        """Simple contradiction detection — can be made more sophisticated."""
-        contradictions = []
-        for existing in self.beliefs.values():
-            # Check if any relations mark these as contradictory
-            for rel in self.relations:
-                if (rel.relation_type == "contradicts" and
-                    ((rel.source_id == new_belief.id and rel.target_id == existing.id) or
-                     (rel.source_id == existing.id and rel.target_id == new_belief.id))):
-                    contradictions.append(existing)
-        return contradictions
+        """Contradiction detection through the "contradicts" relation index — O(degree)."""
+        return [self.beliefs[other_id]
+                for other_id, _ in self.relations.neighbors(new_belief.id, "contradicts")
+                if other_id in self.beliefs]
+    
+    def _mark_contradictions(self, belief: Belief):
+        contradictions = self._find_contradictions(belief)
+        if contradictions:
+            belief.contradicting_evidence.extend(
+                [f"Contradicts belief: {b.id}" for b in contradictions]
+            )
     
     # ================================================================
     # PREDICTION
@@ -159,29 +248,26 @@ class WorldModel:
             "description": description,
             "basis": basis,  # Entity/belief IDs that support this
             "confidence": confidence,
-            "made_at": time.time(),
+            "made_at": clock.now(),
             "resolved": False,
             "was_correct": None
         }
         self.predictions.append(prediction)
+        self.version += 1
         return prediction
     
     def resolve_prediction(self, prediction_id: str, was_correct: bool):
         """Resolve a prediction — this feeds back into self-model."""
-        for pred in self.predictions:
-            if pred["id"] == prediction_id:
-                pred["resolved"] = True
-                pred["was_correct"] = was_correct
-                pred["resolved_at"] = time.time()
-                break
+        if self.predictions.resolve(prediction_id, was_correct, clock.now()) is not None:
+            self.version += 1
     
     def get_prediction_accuracy(self) -> float:
         """How accurate have predictions been?"""
-        resolved = [p for p in self.predictions if p["resolved"]]
-        if not resolved:
-            return 0.5  # No data
-        correct = sum(1 for p in resolved if p["was_correct"])
-        return correct / len(resolved)
+        return self.predictions.accuracy()
+    
+    def get_prediction_stats(self) -> Dict:
+        """Counts plus Brier score and log-loss of resolved predictions."""
+        return self.predictions.get_stats()
     
     # ================================================================
     # SELF-REFERENCE — The seed of the strange loop
@@ -196,6 +282,7 @@ class WorldModel:
         THIS IS WHERE LEVEL-CROSSING HAPPENS.
         When the self-model or meta-cognitive loop calls this,
         a higher level is modifying a lower level's representation."""
+        # No version bump: the summary holds the live properties dict
         self._self_entity.update(properties)
     
     def get_self_relations(self) -> List[Relation]:
@@ -209,16 +296,34 @@ class WorldModel:
     def set_attention(self, entity_id: str, weight: float):
         """Set attention weight for an entity. 
         Can be called by self-model (downward causation!)."""
-        self.attention_weights[entity_id] = max(0.0, min(1.0, weight))
+        weight = max(0.0, min(1.0, weight))
+        # Rewriting the same weight (the strange loop does, every cycle) keeps the summary
+        if self.attention_weights.get(entity_id) != weight:
+            self.attention_weights[entity_id] = weight
+            self.version += 1
+    
+    def set_attention_many(self, weights: Dict[str, float]):
+        """Set many attention weights at once."""
+        current = self.attention_weights
+        changed = {}
+        for entity_id, w in weights.items():
+            w = max(0.0, min(1.0, w))
+            if current.get(entity_id) != w:
+                changed[entity_id] = w
+        if changed:
+            current.update(changed)
+            self.version += 1
+    
+    def decay_attention(self, factor: float):
+        """Scale every attention weight by factor — attention fades uniformly."""
+        factor = max(0.0, min(1.0, factor))
+        if factor != 1.0 and len(self.attention_weights):
+            self.attention_weights.decay(factor)
+            self.version += 1
     
     def get_focus(self, top_n: int = 5) -> List[Tuple[str, float]]:
         """What is the world model currently attending to?"""
-        sorted_attention = sorted(
-            self.attention_weights.items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )
-        return sorted_attention[:top_n]
+        return self.attention_weights.top(top_n)
     
     # ================================================================
     # PERCEPTION PROCESSING
@@ -226,6 +331,8 @@ class WorldModel:
     
     def process_perception(self, perception: Dict) -> CognitiveEvent:
         """Process incoming perception and update world model."""
+        # The cycle count is overlaid on the summary, so counting doesn't
+        # bump the version; only the entity writes below do
         self.cycle_count += 1
         
         # Create or update entities based on perception
@@ -258,14 +365,23 @@ class WorldModel:
     # ================================================================
     
     def get_state_summary(self) -> Dict:
-        """Summarize current world model state — used by higher levels."""
-        return {
-            "entity_count": len(self.entities),
-            "relation_count": len(self.relations),
-            "belief_count": len(self.beliefs),
-            "contested_beliefs": len(self.get_contested_beliefs()),
-            "prediction_accuracy": self.get_prediction_accuracy(),
-            "focus": self.get_focus(3),
-            "self_state": self._self_entity.properties,
-            "cycle": self.cycle_count
-        }
+        """Summarize current world model state — used by higher levels.
+        
+        Every field is read from a running counter or the top of the
+        attention heap, and the snapshot is reused until the next
+        mutation bumps the version. The cycle count changes every cycle,
+        so it is kept out of the snapshot and overlaid on each call.
+        """
+        if self._summary_version != self.version:
+            self._summary = {
+                "entity_count": len(self.entities),
+                "relation_count": len(self.relations),
+                "belief_count": len(self.beliefs),
+                "contested_beliefs": self._contested_count,
+                "prediction_accuracy": self.get_prediction_accuracy(),
+                "focus": self.get_focus(3),
+                "self_state": self._self_entity.properties,
+                "version": self.version
+            }
+            self._summary_version = self.version
+        return {**self._summary, "cycle": self.cycle_count}
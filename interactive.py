@@ -41,6 +41,8 @@ class StrangeLoopREPL:
             'l': self.cmd_loops,
             'reset': self.cmd_reset,
             'save': self.cmd_save,
+            'snapshot': self.cmd_snapshot,
+            'restore': self.cmd_restore,
             'quit': self.cmd_quit,
             'q': self.cmd_quit,
             'exit': self.cmd_quit,
@@ -74,6 +76,8 @@ MODIFICATION:
 UTILITY:
   reset                 Reset engine to initial state
   save <file>           Save state to JSON file
+  snapshot <file>       Save the full engine (binary, restorable)
+  restore <file>        Load an engine from a snapshot
   help                  Show this help (h)
 
 EXAMPLES:
@@ -137,13 +141,14 @@ TIP: Most commands have short aliases (shown in parentheses)
         
         print(f"\nRunning {n} cycles...")
         
-        for i in range(n):
-            about_self = (i % 3 == 0)
-            self.engine.step({
+        self.engine.simulate(
+            {
                 "description": f"Auto cycle {i+1}",
-                "about_self": about_self,
+                "about_self": (i % 3 == 0),
                 "salience": 0.5
-            })
+            }
+            for i in range(n)
+        )
         
         print(f"✓ Completed {n} cycles")
         self.cmd_status([])
@@ -379,6 +384,22 @@ TIP: Most commands have short aliases (shown in parentheses)
         
         print(f"✓ State saved to {filename}")
     
+    def cmd_snapshot(self, args):
+        """Save a restorable binary snapshot"""
+        filename = args[0] if args else "/tmp/strange_loop.snap"
+        size = self.engine.save(filename)
+        print(f"✓ Snapshot saved to {filename} ({size:,} bytes)")
+    
+    def cmd_restore(self, args):
+        """Replace the engine with a saved snapshot"""
+        filename = args[0] if args else "/tmp/strange_loop.snap"
+        try:
+            self.engine = StrangeLoopEngine.load(filename)
+        except (OSError, ValueError) as e:
+            print(f"Error: could not restore {filename}: {e}")
+            return
+        print(f"✓ Engine restored from {filename} (cycle {self.engine.cycle_count})")
+    
     def cmd_quit(self, args):
         """Exit REPL"""
         print("\nExiting Strange Loop REPL...")
@@ -401,6 +401,959 @@ def test_meta_evaluation(t):
                   "Meta-cognitive should have evaluated")
 
 
+@suite.test("Relation index")
+def test_relation_index(t):
+    """Test that indexed relation lookups stay consistent with removals"""
+    from core.structures import Relation
+    engine = StrangeLoopEngine()
+    wm = engine.world_model
+    
+    wm.add_relation(Relation(id="r1", source_id="a", target_id="b", relation_type="causes"))
+    wm.add_relation(Relation(id="r2", source_id="b", target_id="c", relation_type="enables"))
+    wm.add_relation(Relation(id="r3", source_id="SELF", target_id="a", relation_type="observes"))
+    
+    t.assert_equal(len(wm.relations), 3, "Store should hold three relations")
+    t.assert_equal({r.id for r in wm.get_relations("b")}, {"r1", "r2"}, "b touches r1 and r2")
+    t.assert_equal([r.id for r in wm.get_relations("b", "enables")], ["r2"], "Type filter")
+    t.assert_equal([r.id for r in wm.get_self_relations()], ["r3"], "SELF relations")
+    t.assert_equal(wm.find_path("SELF", "c"), ["SELF", "a", "b", "c"], "Path through index")
+    
+    wm.remove_entity("b")
+    t.assert_equal([r.id for r in wm.relations], ["r3"], "Relations on b should be gone")
+    t.assert_equal(wm.get_relations("a", "causes"), [], "Incoming index should be cleaned")
+    t.assert_equal(wm.find_path("SELF", "c"), [], "Path should be broken")
+
+
+@suite.test("Weighted and k-shortest paths")
+def test_weighted_paths(t):
+    """Test that weighted search prefers reliable relations"""
+    from core.structures import Relation
+    engine = StrangeLoopEngine()
+    wm = engine.world_model
+    
+    # Short but unreliable route a-b-d, longer reliable route a-c-e-d
+    wm.add_relation(Relation(source_id="a", target_id="b", strength=0.1))
+    wm.add_relation(Relation(source_id="b", target_id="d", strength=0.1))
+    wm.add_relation(Relation(source_id="a", target_id="c", strength=0.9))
+    wm.add_relation(Relation(source_id="c", target_id="e", strength=0.9))
+    wm.add_relation(Relation(source_id="e", target_id="d", strength=0.9))
+    
+    t.assert_equal(wm.find_path("a", "d"), ["a", "b", "d"], "BFS takes fewest hops")
+    t.assert_equal(wm.find_weighted_path("a", "d"), ["a", "c", "e", "d"],
+                   "Dijkstra takes most reliable route")
+    t.assert_equal(wm.find_k_paths("a", "d", k=2),
+                   [["a", "c", "e", "d"], ["a", "b", "d"]], "Two alternatives, best first")
+    t.assert_equal(wm.find_k_paths("a", "d", k=2, weighted=False, max_depth=2),
+                   [["a", "b", "d"]], "Hop limit should drop the longer route")
+
+
+@suite.test("Contradiction index")
+def test_contradiction_index(t):
+    """Test contradiction detection for single and bulk belief loading"""
+    from core.structures import Belief, Relation
+    engine = StrangeLoopEngine()
+    wm = engine.world_model
+    
+    wm.add_relation(Relation(source_id="b1", target_id="b2", relation_type="contradicts"))
+    wm.add_relation(Relation(source_id="b3", target_id="b1", relation_type="contradicts"))
+    wm.add_relation(Relation(source_id="b1", target_id="b4", relation_type="supports"))
+    
+    wm.add_belief(Belief(id="b1", content="loops are strange"))
+    ids = wm.add_beliefs([
+        Belief(id="b2", content="loops are ordinary"),
+        Belief(id="b3", content="loops do not exist"),
+        Belief(id="b4", content="loops are everywhere"),
+    ])
+    
+    t.assert_equal(ids, ["b2", "b3", "b4"], "Bulk add should return ids in order")
+    t.assert_equal(wm.beliefs["b2"].contradicting_evidence, ["Contradicts belief: b1"],
+                   "b2 contradicts b1")
+    t.assert_true(wm.beliefs["b3"].is_contested, "b3 contradicts b1")
+    t.assert_true(not wm.beliefs["b4"].is_contested, "Supports is not a contradiction")
+    t.assert_true(not wm.beliefs["b1"].is_contested, "Earlier belief is not re-annotated")
+    t.assert_equal(len(wm.get_contested_beliefs()), 2, "Two contested beliefs")
+    
+    # One version bump per batch, and the counter matches one-at-a-time loading
+    version = wm.version
+    wm.add_beliefs([Belief(id="b5"), Belief(id="b3", content="loops do exist"), Belief(id="b6")])
+    t.assert_equal(wm.version, version + 1, "A batch is one mutation")
+    t.assert_equal(wm.get_state_summary()["contested_beliefs"], len(wm.get_contested_beliefs()),
+                   "Contested counter kept exact across a batch")
+    version = wm.version
+    wm.add_beliefs([])
+    t.assert_equal(wm.version, version, "An empty batch changes nothing")
+
+
+@suite.test("Prediction ledger")
+def test_prediction_ledger(t):
+    """Test O(1) prediction resolution and running scores"""
+    engine = StrangeLoopEngine()
+    wm = engine.world_model
+    
+    p0 = wm.make_prediction("loop closes", ["SELF"], confidence=0.8)
+    p1 = wm.make_prediction("loop opens", ["SELF"], confidence=0.8)
+    wm.make_prediction("unresolved", [], confidence=0.5)
+    
+    t.assert_equal(wm.get_prediction_accuracy(), 0.5, "No data should give 0.5")
+    wm.resolve_prediction(p0["id"], True)
+    wm.resolve_prediction(p1["id"], False)
+    wm.resolve_prediction("pred_missing", True)
+    
+    stats = wm.get_prediction_stats()
+    t.assert_equal((stats["resolved"], stats["correct"], stats["outstanding"]), (1 + 1, 1, 1),
+                   "Counters should track resolutions")
+    t.assert_equal(wm.get_prediction_accuracy(), 0.5, "One of two correct")
+    t.assert_true(abs(stats["brier_score"] - (0.04 + 0.64) / 2) < 1e-9, "Brier score")
+    
+    # Re-resolving replaces the earlier outcome
+    wm.resolve_prediction(p1["id"], True)
+    t.assert_equal(wm.get_prediction_accuracy(), 1.0, "Both correct after re-resolution")
+    t.assert_true(abs(wm.get_prediction_stats()["brier_score"] - 0.04) < 1e-9, "Brier updated")
+
+
+@suite.test("Incremental world state summary")
+def test_incremental_summary(t):
+    """Test that the summary is cached until the world model changes"""
+    from core.structures import Belief, Relation
+    engine = StrangeLoopEngine()
+    wm = engine.world_model
+    
+    wm.get_state_summary()
+    first = wm._summary
+    wm.get_state_summary()
+    t.assert_true(wm._summary is first, "Unchanged model returns cached snapshot")
+    
+    wm.add_relation(Relation(source_id="x", target_id="y", relation_type="contradicts"))
+    wm.add_belief(Belief(id="x"))
+    wm.add_belief(Belief(id="y"))
+    engine.add_knowledge("focus_target", "concept", {})
+    wm.set_attention("SELF", 0.2)
+    
+    summary = wm.get_state_summary()
+    t.assert_true(wm._summary is not first, "Mutations invalidate the snapshot")
+    t.assert_equal(summary["contested_beliefs"], len(wm.get_contested_beliefs()),
+                   "Contested counter matches a full scan")
+    t.assert_equal(summary["relation_count"], 1, "Relation count")
+    t.assert_equal(summary["focus"][0][1], 1.0, "Focus reflects new entity")
+    
+    # Re-adding beliefs replaces them without double counting
+    wm.add_belief(Belief(id="y"))
+    wm.add_belief(Belief(id="x"))
+    t.assert_equal(wm.get_state_summary()["contested_beliefs"], 2, "Counter after replacement")
+    t.assert_equal(len(wm.get_contested_beliefs()), 2, "Full scan agrees")
+    
+    # A cycle that only counts and rewrites SELF keeps the snapshot
+    cached = wm._summary
+    engine.step({"description": "nothing new", "salience": 0.4})
+    summary = wm.get_state_summary()
+    t.assert_true(wm._summary is cached, "Cache hit across engine.step()")
+    t.assert_equal(summary["cycle"], engine.world_model.cycle_count, "Cycle overlaid on the snapshot")
+    t.assert_equal(summary["self_state"]["cycle"], engine.cycle_count, "SELF state is live")
+    
+    engine.step({"description": "new thing", "entities": [{"name": "lamp"}]})
+    entities = summary["entity_count"]
+    t.assert_equal(wm.get_state_summary()["entity_count"], entities + 1, "Entity writes invalidate it")
+    
+    # Rewriting attention with the weights it already holds is not a mutation
+    wm.set_attention("SELF", 0.95)
+    wm.get_state_summary()
+    cached = wm._summary
+    for _ in range(3):
+        wm.set_attention("SELF", 0.95)
+        wm.set_attention_many({"SELF": 0.95})
+        wm.decay_attention(1.0)
+        wm.get_state_summary()
+    t.assert_true(wm._summary is cached, "Identical attention writes keep the cached summary")
+    wm.set_attention("SELF", 1.7)
+    t.assert_true(("SELF", 1.0) in wm.get_state_summary()["focus"] and wm._summary is not cached,
+                  "A changed (clamped) weight rebuilds it")
+    cached = wm._summary
+    wm.set_attention("SELF", 3.0)
+    wm.get_state_summary()
+    t.assert_true(wm._summary is cached, "Clamping to the stored weight is no change")
+
+
+@suite.test("Top-k attention index")
+def test_attention_index(t):
+    """Test focus reads, updates and uniform decay"""
+    engine = StrangeLoopEngine()
+    wm = engine.world_model
+    
+    wm.set_attention_many({"a": 0.3, "b": 0.9, "c": 0.6, "d": 0.6})
+    t.assert_equal([e for e, _ in wm.get_focus(4)], ["b", "c", "d", "a"],
+                   "Highest first, ties in insertion order")
+    
+    wm.set_attention("SELF", 0.1)
+    wm.set_attention("a", 2.0)
+    t.assert_equal(wm.get_focus(2), [("a", 1.0), ("b", 0.9)], "Updates reorder, weights clamp")
+    
+    wm.decay_attention(0.5)
+    t.assert_equal([e for e, _ in wm.get_focus(5)], ["a", "b", "c", "d", "SELF"],
+                   "Uniform decay keeps order")
+    t.assert_true(abs(wm.attention_weights["b"] - 0.45) < 1e-12, "Decay scales weights")
+    t.assert_equal(len(wm.get_focus(100)), 5, "Focus never exceeds entity count")
+
+
+@suite.test("Bulk confidence decay")
+def test_decay_all(t):
+    """Test column-wise decay and pruning of faded entities"""
+    from core.structures import Entity
+    engine = StrangeLoopEngine()
+    wm = engine.world_model
+    
+    wm.add_entity(Entity(id="old", confidence=0.5, last_updated=100.0))
+    wm.add_entity(Entity(id="recent", confidence=0.5, last_updated=140.0))
+    wm.add_entity(Entity(id="fresh", confidence=0.9, last_updated=150.0))
+    
+    faded = wm.decay_all(now=150.0, rate=0.01, threshold=0.2)
+    t.assert_equal(faded, ["old"], "Only the old entity falls below threshold")
+    t.assert_equal(wm.entities["old"].confidence, 0.0, "Confidence floors at zero")
+    t.assert_true(abs(wm.entities["recent"].confidence - 0.4) < 1e-9, "Linear fade by age")
+    t.assert_equal(wm.entities["fresh"].confidence, 0.9, "No age, no decay")
+    
+    wm.decay_all(now=150.0, rate=0.01, threshold=0.2, prune=True)
+    t.assert_true("old" not in wm.entities, "Pruned entity removed")
+    t.assert_true("old" not in wm.attention_weights, "Pruned entity leaves focus")
+    t.assert_true("SELF" in wm.entities, "SELF is never pruned")
+
+
+@suite.test("Columnar entity storage")
+def test_columnar_storage(t):
+    """Test that the struct-of-arrays backend behaves like the dict backend"""
+    from core.structures import Entity
+    engine = StrangeLoopEngine({"entity_storage": "columnar"})
+    wm = engine.world_model
+    
+    for i in range(5):
+        wm.add_entity(Entity(id=f"e{i}", name=f"thing{i}", entity_type="concept" if i % 2 else "object",
+                             confidence=0.2 * i, last_updated=100.0))
+    wm.update_entity("e3", {"color": "red"}, confidence=0.95)
+    wm.remove_entity("e1")
+    
+    t.assert_equal(len(wm.entities), 5, "SELF plus four entities")
+    t.assert_equal(wm.get_entity("e3").properties, {"color": "red"}, "Properties round-trip")
+    t.assert_equal(wm.get_entity("e3").confidence, 0.95, "Confidence column updated")
+    t.assert_equal(wm.get_entity("e4").name, "thing4", "Swapped row still addressable")
+    t.assert_equal(sorted(wm.entities.select(entity_type="concept")), ["e3"], "Type scan")
+    
+    engine.step({"description": "columnar cycle", "about_self": True,
+                 "entities": [{"name": "perceived", "type": "object"}]})
+    t.assert_equal(wm.get_self().properties["cycle"], 1, "SELF view writes through")
+    
+    faded = wm.decay_all(now=110.0, rate=0.01, threshold=0.1)
+    t.assert_equal(faded, ["e0"], "Decay runs on the confidence column")
+
+
+@suite.test("Slotted structures and id allocation")
+def test_slotted_structures(t):
+    """Test that core structures carry no __dict__ and get unique ids"""
+    from core.structures import Entity, CognitiveEvent, LevelCrossing, new_id
+    
+    for obj in (Entity(), CognitiveEvent(), LevelCrossing()):
+        t.assert_true(not hasattr(obj, "__dict__"), f"{type(obj).__name__} should be slotted")
+    
+    ids = {new_id() for _ in range(100000)}
+    t.assert_equal(len(ids), 100000, "Ids must not collide")
+    t.assert_equal(len(Entity().id), 8, "Ids keep their 8-character shape")
+
+
+@suite.test("Running consciousness metrics")
+def test_running_metrics(t):
+    """Test that running counters agree with a rescan of the histories"""
+    engine = StrangeLoopEngine()
+    for i in range(30):
+        engine.step({"about_self": i % 3 == 0, "complexity": 0.9 if i % 4 == 0 else 0.2})
+    
+    metrics = engine.get_consciousness_metrics()
+    crossings = engine._level_crossing_history
+    strange = sum(1 for lc in crossings if lc.is_strange)
+    t.assert_equal(metrics["strangeness_ratio"], strange / max(1, len(crossings)),
+                   "Strangeness ratio from counters")
+    
+    modes = {"fast": 0, "slow": 0, "loop": 0}
+    for trace in engine.cognitive_trace:
+        modes[trace["mode"]] += 1
+    t.assert_equal(metrics["kahneman_mode_distribution"],
+                   {k: v / 30 for k, v in modes.items()}, "Mode distribution from counters")
+    t.assert_equal(engine.self_model.get_state_summary()["strange_crossings"],
+                   sum(1 for lc in engine.self_model.level_crossings if lc.is_strange),
+                   "Self-model strange crossing counter")
+
+
+@suite.test("Bounded history retention")
+def test_history_retention(t):
+    """Test ring-buffer histories that spill older entries to disk"""
+    import tempfile
+    with tempfile.TemporaryDirectory() as spill_dir:
+        engine = StrangeLoopEngine({"retention": {
+            "max_in_memory": 10, "spill_dir": spill_dir, "spill_batch": 4
+        }})
+        for i in range(50):
+            engine.step({"description": f"cycle {i}", "about_self": i % 2 == 0})
+        
+        trace = engine.cognitive_trace
+        t.assert_equal(len(trace), 50, "Length counts every cycle")
+        t.assert_equal(len(trace.recent()), 10, "Only the window stays in memory")
+        t.assert_equal([c["cycle"] for c in trace], list(range(1, 51)),
+                       "Iteration reads spilled entries back in order")
+        t.assert_equal(trace[0]["cycle"], 1, "Spilled entries are indexable")
+        t.assert_equal([c["cycle"] for c in trace[-3:]], [48, 49, 50], "Recent slice")
+        
+        metrics = engine.get_consciousness_metrics()
+        t.assert_equal(metrics["strange_loop_count"], engine.total_strange_loops, "Aggregates exact")
+        t.assert_equal(engine.self_model.reflect_on_self().content["loop_depth"],
+                       len(list(engine.self_model.level_crossings)), "Loop depth counts all crossings")
+    
+    dropping = StrangeLoopEngine({"retention": {"max_in_memory": 5}})
+    for _ in range(20):
+        dropping.step({"description": "x"})
+    t.assert_equal(len(dropping.workspace.broadcast_history), 20, "Dropped entries still counted")
+    t.assert_equal(len(list(dropping.workspace.broadcast_history)), 5, "Only the window iterates")
+    
+    # Slices across the drop boundary clip to what is still held, like a list
+    history = dropping.workspace.broadcast_history
+    t.assert_equal(len(history[-12:]), 5, "Negative slice clipped to the window")
+    t.assert_equal(history[10:], history.recent(), "Forward slice clipped")
+    t.assert_equal(history[::-1], history.recent()[::-1], "Reverse slice clipped")
+    t.assert_equal(history[:12], [], "Slice wholly in dropped positions is empty")
+    try:
+        history[0]
+        t.assert_true(False, "Dropped index should raise")
+    except IndexError:
+        t.assert_true(True, "Dropped index raises")
+    from core.structures import FailureRecord
+    for _ in range(12):
+        dropping.self_model.record_failure(FailureRecord(failure_type="reasoning_error"))
+    t.assert_equal(dropping.self_model._calculate_recent_failure_rate(), 0.5,
+                   "Failure rate reads the retained window")
+    
+    # A second engine on the same spill_dir reattaches the first one's segments
+    import os
+    with tempfile.TemporaryDirectory() as spill_dir:
+        config = {"retention": {"max_in_memory": 10, "spill_dir": spill_dir, "spill_batch": 4}}
+        first = StrangeLoopEngine(config)
+        for i in range(50):
+            first.step({"description": f"cycle {i}"})
+        path = os.path.join(spill_dir, "engine.snap")
+        first.save(path)
+        segments = sorted(os.listdir(spill_dir))
+        
+        second = StrangeLoopEngine.load(path)
+        t.assert_equal([c["cycle"] for c in second.cognitive_trace], list(range(1, 51)),
+                       "Spilled history readable after restart")
+        for i in range(30):
+            second.step({"description": f"again {i}"})
+        t.assert_equal([c["cycle"] for c in second.cognitive_trace], list(range(1, 81)),
+                       "New entries continue the reattached segment")
+        t.assert_equal(sorted(os.listdir(spill_dir)), segments, "No orphaned segments")
+        
+        third = StrangeLoopEngine(config)
+        for i in range(20):
+            third.step({"description": f"fresh {i}"})
+        t.assert_equal([c["cycle"] for c in third.cognitive_trace], list(range(1, 21)),
+                       "A fresh engine overwrites old segments")
+
+
+@suite.test("Trace levels")
+def test_trace_levels(t):
+    """Test off, summary, full and sampled tracing"""
+    perception = {"description": "I am thinking", "about_self": True, "salience": 0.9}
+    
+    off = StrangeLoopEngine({"trace_level": "off"})
+    t.assert_equal(off.step(perception), None, "Off returns no trace")
+    t.assert_equal(len(off.cognitive_trace), 0, "Off stores no trace")
+    t.assert_true(off.total_strange_loops > 0, "Cognition still runs with tracing off")
+    
+    summary = StrangeLoopEngine({"trace_level": "summary"}).step(perception)
+    t.assert_equal(summary["mode"], "loop", "Summary keeps the mode")
+    t.assert_true(summary["level_crossing_count"] > 0, "Summary counts crossings")
+    t.assert_true("events" not in summary, "Summary has no nested lists")
+    
+    sampled = StrangeLoopEngine({"trace_level": "sampled", "trace_sample_every": 3})
+    traces = [sampled.step(perception) for _ in range(9)]
+    t.assert_equal([tr["cycle"] for tr in traces if tr], [3, 6, 9], "Every third cycle traced")
+    t.assert_true("level_crossings" in traces[2], "Sampled traces are full traces")
+    
+    full = StrangeLoopEngine()
+    full.step(perception)
+    t.assert_equal(off.get_consciousness_metrics(), full.get_consciousness_metrics(),
+                   "Metrics do not depend on tracing")
+
+
+@suite.test("Batched run and simulate")
+def test_batched_run(t):
+    """Test that run() streams traces and matches step-by-step metrics"""
+    def perceptions(n):
+        return ({"description": f"p{i}", "about_self": i % 3 == 0,
+                 "complexity": 0.8 if i % 5 == 0 else 0.4} for i in range(n))
+    
+    stepped = StrangeLoopEngine()
+    for p in perceptions(50):
+        stepped.step(p)
+    
+    streamed = StrangeLoopEngine()
+    traces = streamed.run(perceptions(50), batch_size=8)
+    first = next(traces)
+    t.assert_equal(first["cycle"], 1, "Traces are yielded lazily, in order")
+    t.assert_equal(streamed.cycle_count, 8, "Only the first batch has run")
+    t.assert_equal(len(list(traces)), 49, "Remaining traces follow")
+    t.assert_equal(streamed.get_consciousness_metrics(), stepped.get_consciousness_metrics(),
+                   "Batching does not change cognition")
+    t.assert_equal(streamed.world_model.get_self().properties["cycle"], 50, "SELF caught up")
+    
+    simulated = StrangeLoopEngine()
+    metrics = simulated.simulate(perceptions(50), batch_size=16)
+    t.assert_equal(metrics, stepped.get_consciousness_metrics(), "simulate returns final metrics")
+    t.assert_equal(len(simulated.cognitive_trace), 0, "simulate builds no traces")
+    t.assert_equal(simulated.trace_level, "full", "Trace level restored afterwards")
+
+
+@suite.test("Streaming JSONL ingestion")
+def test_streaming_ingest(t):
+    """Test that ingest parses JSONL through a bounded buffer and reports metrics"""
+    import io
+    import json
+    from core.ingest import PerceptionReader, ingest
+    
+    lines = [json.dumps({"description": f"p{i}", "complexity": 0.8 if i % 4 == 0 else 0.3})
+             for i in range(40)]
+    lines[5:5] = ["not json", "[1, 2]", ""]
+    reader = PerceptionReader(["-"], buffer_size=4, stdin=io.StringIO("\n".join(lines))).start()
+    engine = StrangeLoopEngine()
+    out = io.StringIO()
+    summary = ingest(engine, reader, output="traces", batch_size=8, report_every=0, out=out)
+    
+    t.assert_equal(summary["cycles"], 40, "Every valid line runs a cycle")
+    t.assert_equal(summary["rejected"], 2, "Malformed lines are skipped and counted")
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    t.assert_equal([r["cycle"] for r in records], list(range(1, 41)), "One JSONL trace per cycle")
+    
+    reader = PerceptionReader(["-"], buffer_size=2, stdin=io.StringIO("\n".join(lines))).start()
+    out = io.StringIO()
+    ingest(StrangeLoopEngine(), reader, output="metrics", metrics_every=16,
+           batch_size=8, report_every=0, out=out)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    t.assert_equal(records[-1]["cycle"], 40, "Final metrics close the stream")
+    t.assert_equal(records[-1]["strange_loop_count"],
+                   engine.get_consciousness_metrics()["strange_loop_count"],
+                   "Metrics match a traced run")
+    
+    # A slow live stream is not held back waiting for a full batch
+    import os
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd) as pipe_in, os.fdopen(write_fd, "w") as pipe_out:
+        pipe_out.write(lines[0] + "\n")
+        pipe_out.flush()
+        batches = PerceptionReader(["-"], stdin=pipe_in).start().batches(64)
+        t.assert_equal(len(next(batches)), 1, "A lone perception runs before the stream ends")
+    
+    # An unreadable source is an error, not an empty run
+    reader = PerceptionReader(["/nonexistent/perceptions.jsonl"]).start()
+    try:
+        ingest(StrangeLoopEngine(), reader, report_every=0, out=io.StringIO())
+        t.assert_true(False, "Missing source raises")
+    except OSError:
+        t.assert_true(reader.error is not None, "Reader keeps the source error")
+
+
+@suite.test("Configurable thresholds and parameter sweep")
+def test_parameter_sweep(t):
+    """Test that config thresholds reach the components and sweeps merge in grid order"""
+    from core.sweep import grid, sweep
+    
+    engine = StrangeLoopEngine({"system2_complexity_threshold": 0.9, "meta_every": 1})
+    t.assert_equal(engine.step({"complexity": 0.8})["mode"], "fast", "Raised System 2 cutoff")
+    t.assert_equal(engine.meta_cognitive.cycle_count, 1, "meta_every=1 evaluates every cycle")
+    t.assert_equal(StrangeLoopEngine().self_model.system2_complexity_threshold, 0.7, "Default kept")
+    
+    points = grid({"system2_complexity_threshold": [0.2, 0.95], "meta_every": [1, 4]})
+    t.assert_equal(len(points), 4, "Grid is the cartesian product")
+    pooled = sweep(points, cycles=60, seeds=2, workers=2)
+    serial = sweep(points, cycles=60, seeds=2, workers=1)
+    t.assert_equal([(r["point"], r["seed"]) for r in pooled],
+                   [(p, s) for p in range(4) for s in range(2)], "Rows merge in grid order")
+    strip = lambda rows: [{k: v for k, v in r.items() if k != "seconds"} for r in rows]
+    t.assert_equal(strip(pooled), strip(serial), "Process pool matches in-process runs")
+    t.assert_greater(pooled[0]["kahneman_mode_distribution.slow"],
+                     pooled[4]["kahneman_mode_distribution.slow"], "Threshold shifts the mode mix")
+
+
+@suite.test("Async engine listener dispatch")
+def test_async_engine(t):
+    """Test concurrent listener dispatch with timeouts, error reporting and stats"""
+    import asyncio
+    import time
+    from core.async_engine import AsyncStrangeLoopEngine
+    
+    received = []
+    
+    async def slow(event):
+        await asyncio.sleep(0.2)
+    
+    async def fast(event):
+        received.append(event.id)
+    
+    def blocking(event):
+        time.sleep(0.02)
+    
+    def broken(event):
+        raise ValueError("listener bug")
+    
+    async def run_cycles():
+        engine = AsyncStrangeLoopEngine({"listener_timeout": 0.05, "listener_threads": 4})
+        for name, callback in [("slow", slow), ("fast", fast),
+                               ("blocking", blocking), ("broken", broken)]:
+            engine.workspace.register_listener(name, callback)
+        start = time.perf_counter()
+        traces = [trace async for trace in engine.run_async({"description": f"p{i}"}
+                                                             for i in range(3))]
+        engine.close()
+        return engine, traces, time.perf_counter() - start
+    
+    engine, traces, elapsed = asyncio.run(run_cycles())
+    t.assert_equal(len(traces), 3, "Async steps produce traces")
+    t.assert_true(elapsed < 0.5, f"Slow listener is cut off by its timeout ({elapsed:.2f}s)")
+    t.assert_equal(len(received), 3, "Coroutine listeners see every broadcast")
+    stats = engine.get_listener_stats()
+    t.assert_equal(stats["slow"]["timeouts"], 3, "Timeouts are counted")
+    t.assert_equal(stats["broken"]["errors"], 3, "Errors are counted, not swallowed")
+    t.assert_equal(stats["blocking"]["errors"], 0, "Sync listeners run in the pool")
+    t.assert_true(stats["blocking"]["max_latency"] >= 0.02, "Latency is measured")
+    t.assert_true(any("listener bug" in e["error"] for e in engine.workspace.listener_errors),
+                  "Error details are kept")
+    
+    # A timed-out thread can't be stopped: queued calls are skipped, running ones reported
+    def stuck(event):
+        time.sleep(0.3)
+    
+    async def run_stuck():
+        engine = AsyncStrangeLoopEngine({"listener_timeout": 0.05, "listener_threads": 1})
+        engine.workspace.register_listener("stuck", stuck)
+        for i in range(2):
+            await engine.step({"description": f"s{i}"})
+        during = engine.get_listener_stats()["stuck"]
+        engine.close()
+        return during, engine.get_listener_stats()["stuck"]
+    
+    during, after = asyncio.run(run_stuck())
+    t.assert_equal(during["timeouts"], 2, "Both pool calls time out")
+    t.assert_equal(during["running_late"], 1, "The started call is reported as still running")
+    t.assert_equal(during["skipped"], 1, "The queued call never runs")
+    t.assert_equal(after["running_late"], 0, "Late call is cleared once it returns")
+    
+    sync_engine = StrangeLoopEngine()
+    sync_engine.workspace.register_listener("broken", broken)
+    sync_engine.step({"description": "x"})
+    t.assert_equal(sync_engine.workspace.get_listener_stats()["broken"]["errors"], 1,
+                   "Sync compete records listener errors too")
+
+
+@suite.test("Bounded competition queue eviction")
+def test_competition_eviction(t):
+    """Test that overflow evicts the least salient event and compete pops the most salient"""
+    from core.global_workspace import GlobalWorkspace
+    from core.structures import CognitiveEvent, CognitiveEventType
+    
+    workspace = GlobalWorkspace(capacity=5)
+    saliences = [0.3, 0.9, 0.1, 0.5, 0.7, 0.2, 0.8, 0.05, 0.6]
+    for i, salience in enumerate(saliences):
+        workspace.submit(CognitiveEvent(event_type=CognitiveEventType.PERCEPTION, content=i,
+                                        source_level=0, salience=salience, timestamp=1.0))
+    t.assert_equal(len(workspace._competition_queue), 5, "Queue stays at capacity")
+    order = []
+    while True:
+        winner = workspace.compete()
+        if winner is None:
+            break
+        order.append(winner.salience)
+    t.assert_equal(order, [0.9, 0.8, 0.7, 0.6, 0.5], "Most salient survive, best first")
+    
+    for i in range(3):
+        workspace.submit(CognitiveEvent(event_type=CognitiveEventType.PERCEPTION, content=i,
+                                        source_level=0, salience=0.4, timestamp=1.0))
+    t.assert_equal(workspace.compete().content, 0, "Ties go to the earliest submission")
+
+
+@suite.test("Lazy salience aging and expiry")
+def test_salience_aging(t):
+    """Test that waiting events lose salience and old events expire"""
+    import time
+    from core.global_workspace import GlobalWorkspace
+    from core.structures import CognitiveEvent, CognitiveEventType
+    
+    def event(content, salience):
+        return CognitiveEvent(event_type=CognitiveEventType.PERCEPTION, content=content,
+                              source_level=0, salience=salience)
+    
+    aging = GlobalWorkspace(salience_decay_rate=10.0)
+    aging.submit(event("stale", 0.9))
+    time.sleep(0.05)
+    aging.submit(event("fresh", 0.6))
+    t.assert_equal(aging.compete().content, "fresh", "A fresh event outranks a stale, aged one")
+    
+    expiring = GlobalWorkspace(capacity=3, max_event_age=0.03)
+    for i in range(3):
+        expiring.submit(event(f"old{i}", 0.9))
+    time.sleep(0.05)
+    expiring.submit(event("new", 0.1))
+    t.assert_equal(expiring.queue_size, 1, "Full queue of expired events accepts a new one")
+    t.assert_equal(expiring.compete().content, "new", "Expired events never win")
+    t.assert_equal(expiring.compete(), None, "Nothing else remains")
+    t.assert_equal(expiring.total_expired, 3, "Expiries are counted")
+
+
+@suite.test("Top-k broadcast and coalescing")
+def test_compete_k(t):
+    """Test multi-event broadcasts, batch listeners and event coalescing"""
+    from core.global_workspace import GlobalWorkspace
+    from core.structures import CognitiveEvent, CognitiveEventType
+    
+    def event(content, salience, event_type=CognitiveEventType.PERCEPTION, level=0):
+        return CognitiveEvent(event_type=event_type, content=content,
+                              source_level=level, salience=salience)
+    
+    workspace = GlobalWorkspace()
+    batches, singles = [], []
+    workspace.register_listener("batch", batches.append, batch=True)
+    workspace.register_listener("single", singles.append)
+    for i, salience in enumerate([0.2, 0.8, 0.5, 0.9]):
+        workspace.submit(event(i, salience))
+    winners = workspace.compete_k(3)
+    t.assert_equal([w.content for w in winners], [3, 1, 2], "Top 3, best first")
+    t.assert_equal(len(batches), 1, "Batch listener is called once")
+    t.assert_equal([e.content for e in batches[0]], [3, 1, 2], "...with the whole batch")
+    t.assert_equal(len(singles), 3, "Plain listeners see each event")
+    t.assert_equal(workspace.total_broadcasts, 3, "Each event counts as a broadcast")
+    
+    coalescing = GlobalWorkspace(capacity=3, coalesce=True)
+    for i in range(10):
+        coalescing.submit(event(i, 0.1 * i))
+    coalescing.submit(event("meta", 0.3, CognitiveEventType.META_COGNITION, 3))
+    t.assert_equal(coalescing.queue_size, 2, "Same type and level share one slot")
+    merged = coalescing.compete_k(5)
+    t.assert_equal(merged[0].content, list(range(10)), "Aggregate carries every member")
+    t.assert_equal(merged[0].metadata["coalesced"], 10, "Member count is recorded")
+    t.assert_equal(merged[1].content, "meta", "Other groups stay separate")
+    
+    engine = StrangeLoopEngine({"broadcast_k": 3})
+    trace = engine.step({"description": "x", "about_self": True})
+    t.assert_true(len(trace["broadcasts"]) > 1, "Engine broadcasts k events per cycle")
+
+
+@suite.test("Filtered listener subscriptions")
+def test_filtered_subscriptions(t):
+    """Test that broadcasts only reach listeners whose filters match"""
+    from core.global_workspace import GlobalWorkspace
+    from core.structures import CognitiveEvent, CognitiveEventType
+    
+    workspace = GlobalWorkspace()
+    seen = {"meta": [], "perception_l0": [], "salient": [], "all": []}
+    workspace.register_listener("meta", seen["meta"].append,
+                                event_types=[CognitiveEventType.META_COGNITION])
+    workspace.register_listener("perception_l0", seen["perception_l0"].append,
+                                event_types=[CognitiveEventType.PERCEPTION], source_levels=[0])
+    workspace.register_listener("salient", seen["salient"].append, min_salience=0.6)
+    workspace.register_listener("all", seen["all"].append)
+    events = [
+        CognitiveEvent(event_type=CognitiveEventType.PERCEPTION, source_level=0, salience=0.5),
+        CognitiveEvent(event_type=CognitiveEventType.PERCEPTION, source_level=1, salience=0.7),
+        CognitiveEvent(event_type=CognitiveEventType.META_COGNITION, source_level=3, salience=0.4),
+    ]
+    for event in events:
+        workspace.submit(event)
+    workspace.compete_k(3)
+    ids = {name: [e.id for e in received] for name, received in seen.items()}
+    t.assert_equal(ids["meta"], [events[2].id], "Event type filter")
+    t.assert_equal(ids["perception_l0"], [events[0].id], "Type and source level filter")
+    t.assert_equal(ids["salient"], [events[1].id], "Salience threshold")
+    t.assert_equal(len(ids["all"]), 3, "Unfiltered listener sees everything")
+    
+    workspace.unregister_listener("all")
+    workspace.submit(events[0])
+    workspace.compete()
+    t.assert_equal(len(seen["all"]), 3, "Unregistered listener is no longer called")
+    t.assert_equal(workspace.get_listener_stats()["perception_l0"]["calls"], 2, "Stats per listener")
+    
+    t.assert_equal(StrangeLoopEngine().workspace.get_listener_stats(), {},
+                   "Empty engine hooks are not subscribed")
+    
+    class Observed(StrangeLoopEngine):
+        def __init__(self):
+            self.reflections = 0
+            super().__init__()
+        
+        def _self_model_listener(self, event):
+            self.reflections += 1
+    
+    observed = Observed()
+    for i in range(5):
+        observed.step({"description": f"p{i}", "about_self": True})
+    t.assert_equal(list(observed.workspace.get_listener_stats()), ["self_model"],
+                   "Overridden hooks are subscribed")
+    t.assert_equal(observed.reflections, observed.workspace.self_referential_broadcasts,
+                   "Self-model hook sees exactly the self-referential broadcasts")
+
+
+@suite.test("Snapshot save and load")
+def test_snapshot(t):
+    """Test that save/load round-trips engine state exactly"""
+    import os
+    import tempfile
+    from core import structures
+    from core.structures import Relation
+    
+    for storage in ("dict", "columnar"):
+        engine = StrangeLoopEngine({"entity_storage": storage, "broadcast_k": 2})
+        a = engine.add_knowledge("fire", "concept", {"hot": True})
+        b = engine.add_knowledge("smoke", "concept", {})
+        engine.world_model.add_relation(Relation(source_id=a, target_id=b, relation_type="causes",
+                                                 strength=0.8, metadata={"seen": 3}))
+        engine.add_belief("Fire causes smoke", 0.9)
+        engine.set_goal("Understand fire", "high")
+        prediction = engine.world_model.make_prediction("smoke follows fire", [], confidence=0.7)
+        engine.world_model.resolve_prediction(prediction["id"], True)
+        engine.world_model.set_attention(a, 0.9)
+        engine.simulate({"description": f"p{i}", "about_self": i % 2 == 0,
+                         "complexity": 0.9 if i % 3 == 0 else 0.2} for i in range(30))
+        engine.workspace.submit(engine.world_model.process_perception({"description": "queued"}))
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "engine.snap")
+            t.assert_greater(engine.save(path), 0, "Snapshot written")
+            restored = StrangeLoopEngine.load(path)
+        
+        t.assert_equal(restored.get_consciousness_metrics(), engine.get_consciousness_metrics(),
+                       f"{storage}: metrics survive")
+        t.assert_equal(restored.get_full_state(), engine.get_full_state(), f"{storage}: full state")
+        t.assert_equal(restored.world_model.find_path(a, b), [a, b], f"{storage}: relation index")
+        t.assert_equal(restored.world_model.entities[a].properties, {"hot": True},
+                       f"{storage}: entity properties")
+        t.assert_equal(restored.world_model.get_prediction_stats(),
+                       engine.world_model.get_prediction_stats(), f"{storage}: predictions")
+        restored_prediction = restored.world_model.predictions.get(prediction["id"])
+        t.assert_equal((restored_prediction["confidence"], restored_prediction["basis"]), (0.7, []),
+                       f"{storage}: prediction confidence and basis")
+        t.assert_equal(restored.world_model.get_focus(1), engine.world_model.get_focus(1),
+                       f"{storage}: attention")
+        t.assert_equal(restored.workspace.queue_size, engine.workspace.queue_size,
+                       f"{storage}: workspace queue")
+        t.assert_equal(restored.step({"description": "next"})["broadcasts"],
+                       engine.step({"description": "next"})["broadcasts"],
+                       f"{storage}: restored engine continues identically")
+        t.assert_true(int(structures.new_id(), 16) > int(max(engine.world_model.beliefs), 16),
+                      "New ids never collide with restored ones")
+
+
+@suite.test("Write-ahead log recovery")
+def test_wal_recovery(t):
+    """Test that a crashed engine is rebuilt from its checkpoint plus the log tail"""
+    import os
+    import tempfile
+    from core import wal
+    from core.structures import FailureRecord, Relation
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = StrangeLoopEngine({"broadcast_k": 2})
+        journal = wal.attach(engine, tmp, checkpoint_every=25)
+        a = engine.add_knowledge("fire", "concept", {"hot": True})
+        b = engine.add_knowledge("smoke", "concept", {})
+        engine.world_model.add_relation(Relation(source_id=a, target_id=b, relation_type="causes"))
+        engine.add_belief("Fire causes smoke", 0.9)
+        for i in range(40):
+            engine.step({"description": f"p{i}", "about_self": i % 2 == 0,
+                         "complexity": 0.9 if i % 3 == 0 else 0.2})
+        engine.simulate({"description": f"q{i}"} for i in range(7))
+        engine.self_model.record_failure(FailureRecord(failure_type="reasoning_error", severity=0.5))
+        engine.world_model.decay_all(rate=0.001)
+        
+        stats = journal.get_stats()
+        t.assert_greater(stats["total_checkpoints"], 1, "Log was compacted by checkpoints")
+        t.assert_true(stats["records_since_checkpoint"] < 25, "Only a bounded tail is left")
+        
+        # Crash: the process dies without closing anything, mid-way through a record
+        with open(journal.log_path, "ab") as f:
+            f.write(b"\x07torn")
+        recovered = wal.recover(tmp, checkpoint_every=25)
+        
+        t.assert_equal(recovered.journal.replayed, stats["records_since_checkpoint"],
+                       "Only the tail after the checkpoint is replayed")
+        t.assert_equal(recovered.get_consciousness_metrics(), engine.get_consciousness_metrics(),
+                       "Metrics recovered")
+        t.assert_equal(recovered.world_model.get_state_summary(),
+                       engine.world_model.get_state_summary(), "World model recovered")
+        t.assert_equal(recovered.self_model.confidence_states, engine.self_model.confidence_states,
+                       "Self-model confidence recovered")
+        t.assert_equal(sorted(recovered.world_model.entities), sorted(engine.world_model.entities),
+                       "Entity ids match the original run")
+        
+        # The recovered engine keeps journaling
+        journal.detach()
+        recovered.step({"description": "after"})
+        again = wal.recover(tmp)
+        t.assert_equal(again.cycle_count, engine.cycle_count + 1, "Recovered engine is journaled")
+        again.journal.detach()
+        recovered.journal.detach()
+    
+    # Listener mutations during the broadcast are journaled, sync and async
+    import asyncio
+    from core.async_engine import AsyncStrangeLoopEngine
+    for engine_class in (StrangeLoopEngine, AsyncStrangeLoopEngine):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = engine_class()
+            journal = wal.attach(engine, tmp, checkpoint_every=1000)
+            engine.workspace.register_listener(
+                "note", lambda event: engine.add_knowledge(f"heard {event.id}", "memory", {})
+            )
+            perceptions = [{"description": f"p{i}"} for i in range(10)]
+            if engine_class is StrangeLoopEngine:
+                engine.simulate(perceptions)
+            else:
+                async def drive():
+                    for perception in perceptions:
+                        await engine.step(perception)
+                asyncio.run(drive())
+                engine.close()
+            journal.detach()  # Crash: no final checkpoint
+            
+            recovered = wal.recover(tmp)
+            t.assert_equal(sorted(e.name for e in recovered.world_model.entities.values()),
+                           sorted(e.name for e in engine.world_model.entities.values()),
+                           f"Listener mutations recovered ({engine_class.__name__})")
+            t.assert_equal(recovered.cycle_count, engine.cycle_count, "Every cycle replayed")
+            recovered.journal.detach()
+
+
+@suite.test("Deterministic record and replay")
+def test_record_replay(t):
+    """Test that a recorded run replays bit-for-bit and divergence is located"""
+    import os
+    import tempfile
+    from core.replay import Recorder, Recording, replay
+    
+    with Recorder({"broadcast_k": 2, "salience_decay_rate": 0.05}, seed=11) as recorder:
+        for i in range(60):
+            recorder.step({"description": f"p{i}", "about_self": recorder.rng.random() < 0.3,
+                           "complexity": recorder.rng.random(),
+                           "entities": [{"name": f"thing{i % 7}"}]})
+    recording = recorder.close()
+    t.assert_equal(recording.cycles, 60, "Every cycle recorded")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "run.rec")
+        recording.save(path)
+        loaded = Recording.load(path)
+    
+    result = replay(loaded)
+    t.assert_true(result["identical"], f"Replay is bit-for-bit identical: {result}")
+    
+    class Changed(StrangeLoopEngine):
+        def _should_self_intervene(self, reflection):
+            return None if self.cycle_count >= 20 else super()._should_self_intervene(reflection)
+    
+    changed = replay(loaded, engine_class=Changed)
+    t.assert_true(changed["first_divergence"] is not None and changed["first_divergence"] >= 20,
+                  "A behavior change is located at the first differing cycle")
+
+
+@suite.test("Benchmark suite and regression compare")
+def test_benchmark_suite(t):
+    """Test that every hot-path benchmark runs and compare flags slowdowns"""
+    import io
+    from benchmarks import suite as bench
+    
+    results = bench.run(sizes=[100], min_time=0.001, repeats=1, out=io.StringIO())
+    t.assert_equal(sorted(results["results"]), sorted(f"{name}@100" for name in bench.BENCHMARKS),
+                   "Every benchmark ran")
+    t.assert_true(all(r["ns_per_op"] > 0 for r in results["results"].values()), "Timings recorded")
+    
+    slower = {"results": {key: dict(r, ns_per_op=r["ns_per_op"] * 1.5)
+                          for key, r in results["results"].items()}}
+    rows = bench.compare(results, slower, threshold=0.2)
+    t.assert_true(all(row["regressed"] for row in rows), "50% slowdown is flagged")
+    t.assert_true(not any(row["regressed"] for row in bench.compare(results, results)),
+                  "Identical results pass")
+
+
+@suite.test("Load generator scenarios and latency percentiles")
+def test_loadgen(t):
+    """Test that every load scenario runs and reports windowed percentiles"""
+    import io
+    import json
+    from benchmarks import loadgen
+    
+    for name in loadgen.SCENARIOS:
+        out = io.StringIO()
+        summary = loadgen.run(name, cycles=300, window=100, out=out, log=io.StringIO())
+        windows = [json.loads(line) for line in out.getvalue().splitlines()]
+        t.assert_equal([w["cycles"] for w in windows], [100, 200, 300], f"{name}: one row per window")
+        t.assert_equal(summary["cycles"], 300, f"{name}: every cycle ran")
+        t.assert_true(0 < summary["p50_us"] <= summary["p99_us"] <= summary["p999_us"],
+                      f"{name}: percentiles are ordered")
+    
+    import random
+    for name in ("bulk_seed", "long_uptime"):
+        engine = StrangeLoopEngine(loadgen.BASE_CONFIG)
+        for perception in loadgen.SCENARIOS[name][1](engine, random.Random(0), 2000):
+            engine.step(perception)
+        entities = engine.world_model.entities
+        t.assert_equal(len({e.name for e in entities.values()}), len(entities),
+                       f"{name}: perceptions revisit entities instead of duplicating them")
+    
+    out = io.StringIO()
+    summary = loadgen.run("bot_mix", cycles=250, window=100, out=out, log=io.StringIO())
+    t.assert_equal([json.loads(line)["cycles"] for line in out.getvalue().splitlines()],
+                   [100, 200, 250], "A partial last window is reported")
+    summary = loadgen.run("bot_mix", cycles=0, out=io.StringIO(), log=io.StringIO())
+    t.assert_equal(summary["cycles"], 0, "A run with no cycles returns an empty summary")
+    try:
+        loadgen.main(["--cycles", "0"])
+        t.assert_true(False, "--cycles 0 should be rejected")
+    except SystemExit as e:
+        t.assert_equal(e.code, 2, "--cycles 0 is a usage error")
+    
+    histogram = loadgen.LatencyHistogram()
+    samples = list(range(1, 100_001))
+    histogram.extend(samples)
+    for p in (50, 99, 99.9):
+        exact = loadgen.percentile(samples, p)
+        t.assert_true(abs(histogram.percentile(p) - exact) <= exact * 0.04,
+                      f"Histogram p{p} within 4% of exact")
+
+
+@suite.test("Coalesced groups stay bounded under sustained overflow")
+def test_coalesce_bounded(t):
+    """Test that a group that keeps losing never grows submit cost or memory"""
+    import time
+    from core.global_workspace import GlobalWorkspace
+    from core.structures import CognitiveEvent, CognitiveEventType
+    
+    workspace = GlobalWorkspace(capacity=4, coalesce=True, coalesce_limit=500)
+    
+    def burst(n):
+        start = time.perf_counter()
+        for i in range(n):
+            workspace.submit(CognitiveEvent(event_type=CognitiveEventType.PERCEPTION,
+                                            content=i, salience=0.1))
+            # A self-referential event always wins, so the perception group never does
+            workspace.submit(CognitiveEvent(event_type=CognitiveEventType.SELF_REFLECTION,
+                                            content=i, source_level=1, salience=0.9))
+            workspace.compete()
+        return time.perf_counter() - start
+    
+    first = burst(2000)
+    for _ in range(5):
+        burst(2000)
+    last = burst(2000)
+    t.assert_true(last < first * 3, f"Submit cost does not grow with uptime ({first:.3f}s -> {last:.3f}s)")
+    groups = workspace._groups.values()
+    t.assert_true(all(g.count <= 500 for g in groups), "Groups are capped at coalesce_limit")
+    t.assert_true(all(len(g.contents) <= GlobalWorkspace.COALESCE_KEEP for g in groups),
+                  "Only recent member contents are kept")
+    t.assert_true(workspace.queue_size <= 4, "Queue stays within capacity")
+    t.assert_true(len(workspace._competition_queue) <= 2 * workspace.queue_size + 16,
+                  "Stale heap entries are compacted")
+
+
 def main():
     """Run test suite"""
     success = suite.run()